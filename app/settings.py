@@ -29,9 +29,12 @@ if os.path.isfile(dotenv_file):
 SECRET_KEY = os.environ["SECRET_KEY"]
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Debug also keeps every SQL query run in `connection.queries`
+DEBUG = os.environ.get("DEBUG", "true").lower() == "true"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
 
 
 # Application definition
@@ -49,6 +52,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "game.middleware.MetricsMiddleware",
+    "game.middleware.ProfilingMiddleware",
+    "game.middleware.AllocationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -132,3 +138,88 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 SWAGGER_SETTINGS = {"DEFAULT_MODEL_RENDERING": "example"}
+
+# Bot player and hints
+# Size of the per worker transposition table and the search budget used on
+# boards bigger than 3x3
+
+GAME_AI_CACHE_SIZE = int(os.environ.get("GAME_AI_CACHE_SIZE", 200000))
+
+GAME_AI_MAX_DEPTH = int(os.environ.get("GAME_AI_MAX_DEPTH", 6))
+
+GAME_AI_TIME_BUDGET = float(os.environ.get("GAME_AI_TIME_BUDGET", 0.2))
+
+# Solved 3x3 table written by `manage.py build_solved_table`. Searching is
+# used instead while the file does not exist
+
+GAME_SOLVED_TABLE_PATH = os.environ.get(
+    "GAME_SOLVED_TABLE_PATH", BASE_DIR / "solved_3x3.bin"
+)
+
+GAMES_PAGE_SIZE = int(os.environ.get("GAMES_PAGE_SIZE", 50))
+
+# Number of waiting games loaded into the matchmaking queue when it runs dry
+
+MATCHMAKING_REFILL_SIZE = int(os.environ.get("MATCHMAKING_REFILL_SIZE", 100))
+
+# Game events stream: states kept per slow subscriber and seconds between
+# keep-alive comments
+
+GAME_EVENTS_QUEUE_SIZE = int(os.environ.get("GAME_EVENTS_QUEUE_SIZE", 16))
+
+GAME_EVENTS_KEEPALIVE = float(os.environ.get("GAME_EVENTS_KEEPALIVE", 15))
+
+# Conditional requests: seconds a game ETag stays in the cache and limits of
+# the long polling `wait` query param
+
+GAME_VERSION_CACHE_TIMEOUT = float(os.environ.get("GAME_VERSION_CACHE_TIMEOUT", 1))
+
+GAME_LONG_POLL_MAX_WAIT = float(os.environ.get("GAME_LONG_POLL_MAX_WAIT", 30))
+
+GAME_LONG_POLL_INTERVAL = float(os.environ.get("GAME_LONG_POLL_INTERVAL", 0.25))
+
+# Rows fetched per database round trip by the NDJSON export of games
+
+GAME_EXPORT_CHUNK_SIZE = int(os.environ.get("GAME_EXPORT_CHUNK_SIZE", 2000))
+
+# Games inserted per bulk_create by `manage.py import_games`
+
+GAME_IMPORT_BATCH_SIZE = int(os.environ.get("GAME_IMPORT_BATCH_SIZE", 2000))
+
+# Request metrics served at `/metrics`. Each worker process writes its
+# counters to its own file in GAME_METRICS_DIR (a temporary directory by
+# default) at most every GAME_METRICS_FLUSH_INTERVAL seconds
+
+GAME_METRICS_ENABLED = os.environ.get("GAME_METRICS_ENABLED", "true").lower() == "true"
+
+GAME_METRICS_DIR = os.environ.get("GAME_METRICS_DIR")
+
+GAME_METRICS_FLUSH_INTERVAL = float(os.environ.get("GAME_METRICS_FLUSH_INTERVAL", 1))
+
+# CPU profiles of single requests, listed at `profiles/` for staff users.
+# When enabled, requests sending the GAME_PROFILING_HEADER header and a
+# GAME_PROFILING_SAMPLE_RATE share of the others are profiled. The last
+# GAME_PROFILING_MAX_FILES profiles are kept in GAME_PROFILING_DIR
+
+GAME_PROFILING_ENABLED = (
+    os.environ.get("GAME_PROFILING_ENABLED", "false").lower() == "true"
+)
+
+GAME_PROFILING_HEADER = os.environ.get("GAME_PROFILING_HEADER", "X-Profile")
+
+GAME_PROFILING_SAMPLE_RATE = float(os.environ.get("GAME_PROFILING_SAMPLE_RATE", 0))
+
+GAME_PROFILING_DIR = os.environ.get("GAME_PROFILING_DIR")
+
+GAME_PROFILING_MAX_FILES = int(os.environ.get("GAME_PROFILING_MAX_FILES", 50))
+
+# Memory allocations traced with tracemalloc, reported at `memory/` for
+# staff users with GAME_TRACEMALLOC_FRAMES frames per allocation. With
+# GAME_ALLOCATIONS_ENABLED tracing starts with the worker and the memory
+# allocated by each request is counted
+
+GAME_TRACEMALLOC_FRAMES = int(os.environ.get("GAME_TRACEMALLOC_FRAMES", 25))
+
+GAME_ALLOCATIONS_ENABLED = (
+    os.environ.get("GAME_ALLOCATIONS_ENABLED", "false").lower() == "true"
+)
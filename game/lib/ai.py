@@ -0,0 +1,291 @@
+"""
+Negamax search with alpha-beta pruning used by the bot player and hints.
+
+Searched positions are stored in a transposition table keyed by the
+canonical form of the board under the 8 symmetries of the square. The table
+is shared by every request served by the worker and bounded with LRU
+eviction. The classic 3x3 game is answered from the solved table when it is
+loaded. Other small boards are searched to the end and larger boards use
+iterative deepening under a depth and time budget.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+import threading
+import time
+from typing import Hashable, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+from game.lib import engine, solved
+
+WIN_SCORE = 1000
+EXACT = 0
+LOWER = 1
+UPPER = 2
+FULL_SEARCH_CELLS = 9
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class LRUCache:
+    """
+    Thread safe mapping that evicts the least recently used key once it
+    holds more than ``maxsize`` items.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+transposition_table = LRUCache(settings.GAME_AI_CACHE_SIZE)
+
+
+@lru_cache(maxsize=None)
+def _symmetry_tables(size: int) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """
+    For each of the 8 symmetries, one table per byte of the bitboard that
+    maps the byte value to its transformed bits.
+    """
+    last = size - 1
+    transforms = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    )
+    cells = size * size
+    chunks = (cells + 7) // 8
+    tables = []
+    for transform in transforms:
+        target = []
+        for cell in range(cells):
+            row, col = transform(*divmod(cell, size))
+            target.append(row * size + col)
+        symmetry = []
+        for chunk in range(chunks):
+            table = []
+            for value in range(256):
+                bits = 0
+                for offset in range(8):
+                    cell = chunk * 8 + offset
+                    if value & (1 << offset) and cell < cells:
+                        bits |= 1 << target[cell]
+                table.append(bits)
+            symmetry.append(tuple(table))
+        tables.append(tuple(symmetry))
+    return tuple(tables)
+
+
+def _transform(bits: int, symmetry: Tuple[Tuple[int, ...], ...]) -> int:
+    result = 0
+    for table in symmetry:
+        result |= table[bits & 0xFF]
+        bits >>= 8
+    return result
+
+
+def canonical_key(rules: engine.Rules, me: int, opp: int) -> int:
+    """
+    Smallest packed ``(me, opp)`` value among the 8 symmetric boards.
+    """
+    cells = rules.cells
+    return min(
+        _transform(me, symmetry) | (_transform(opp, symmetry) << cells)
+        for symmetry in _symmetry_tables(rules.size)
+    )
+
+
+@lru_cache(maxsize=None)
+def _move_order(size: int, win_length: int) -> Tuple[int, ...]:
+    rules = engine.get_rules(size, win_length)
+    return tuple(
+        sorted(range(rules.cells), key=lambda cell: -len(rules.cell_masks[cell]))
+    )
+
+
+def _evaluate(rules: engine.Rules, me: int, opp: int) -> int:
+    score = 0
+    for mask in rules.win_masks:
+        if not mask & opp and mask & me:
+            score += 1
+        elif not mask & me and mask & opp:
+            score -= 1
+    return score
+
+
+def _moves(rules: engine.Rules, empties: int) -> Iterator[int]:
+    for cell in _move_order(rules.size, rules.win_length):
+        if empties & (1 << cell):
+            yield cell
+
+
+def _probe(
+    key: tuple, depth: int, alpha: int, beta: int
+) -> Tuple[Optional[int], int, int]:
+    """
+    Value stored for ``key`` when it ends the search, and the window
+    narrowed by the stored bound.
+    """
+    entry = transposition_table.get(key)
+    if entry is None or entry[0] < depth:
+        return None, alpha, beta
+    _, flag, value = entry
+    if flag == EXACT:
+        return value, alpha, beta
+    if flag == LOWER:
+        alpha = max(alpha, value)
+    elif flag == UPPER:
+        beta = min(beta, value)
+    return (value if alpha >= beta else None), alpha, beta
+
+
+def _store(key: tuple, depth: int, value: int, alpha: int, beta: int) -> None:
+    """
+    Store ``value`` with the bound it is for the original ``alpha, beta``
+    window.
+    """
+    if value <= alpha:
+        flag = UPPER
+    elif value >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    transposition_table.set(key, (depth, flag, value))
+
+
+def _negamax(
+    rules: engine.Rules,
+    me: int,
+    opp: int,
+    depth: int,
+    alpha: int,
+    beta: int,
+    deadline: Optional[float],
+) -> int:
+    empties = rules.full_mask & ~(me | opp)
+    if not empties:
+        return 0
+    remaining = bin(empties).count("1")
+    depth = min(depth, remaining)
+    if depth == 0:
+        return _evaluate(rules, me, opp)
+    if deadline is not None and time.monotonic() > deadline:
+        raise SearchTimeout
+
+    key = (rules.size, rules.win_length, canonical_key(rules, me, opp))
+    value, alpha, beta = _probe(key, depth, alpha, beta)
+    if value is not None:
+        return value
+
+    original_alpha = alpha
+    best = -WIN_SCORE * 2
+    for cell in _moves(rules, empties):
+        bit = 1 << cell
+        if rules.has_won(me | bit, cell):
+            score = WIN_SCORE + remaining
+        else:
+            score = -_negamax(rules, opp, me | bit, depth - 1, -beta, -alpha, deadline)
+        best = max(best, score)
+        alpha = max(alpha, best)
+        if alpha >= beta:
+            break
+
+    _store(key, depth, best, original_alpha, beta)
+    return best
+
+
+def _search_root(
+    rules: engine.Rules, me: int, opp: int, depth: int, deadline: Optional[float]
+) -> Optional[int]:
+    empties = rules.full_mask & ~(me | opp)
+    alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+    best_cell = None
+    for cell in _moves(rules, empties):
+        bit = 1 << cell
+        if rules.has_won(me | bit, cell):
+            return cell
+        score = -_negamax(rules, opp, me | bit, depth - 1, -beta, -alpha, deadline)
+        if best_cell is None or score > alpha:
+            alpha = score
+            best_cell = cell
+    return best_cell
+
+
+def _deepen(
+    rules: engine.Rules, me: int, opp: int, max_depth: int, deadline: float
+) -> Optional[int]:
+    """
+    Iterative deepening: best cell of the deepest search finished before
+    ``deadline``.
+    """
+    best_cell = None
+    for depth in range(1, max_depth + 1):
+        try:
+            best_cell = _search_root(rules, me, opp, depth, deadline)
+        except SearchTimeout:
+            break
+    return best_cell
+
+
+def best_move(
+    rules: engine.Rules,
+    me: int,
+    opp: int,
+    max_depth: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> Optional[int]:
+    """
+    Best cell for the side owning ``me`` to play, or ``None`` when the board
+    is full.
+    """
+    empties = rules.full_mask & ~(me | opp)
+    if not empties:
+        return None
+    if rules.size == solved.SIZE and rules.win_length == solved.SIZE:
+        entry = solved.lookup(me, opp)
+        if entry is not None:
+            return entry[1]
+
+    remaining = bin(empties).count("1")
+    if rules.cells <= FULL_SEARCH_CELLS:
+        return _search_root(rules, me, opp, remaining, None)
+
+    if max_depth is None:
+        max_depth = settings.GAME_AI_MAX_DEPTH
+    if time_budget is None:
+        time_budget = settings.GAME_AI_TIME_BUDGET
+    best_cell = _deepen(
+        rules, me, opp, min(max_depth, remaining), time.monotonic() + time_budget
+    )
+    if best_cell is None:
+        best_cell = next(_moves(rules, empties))
+    return best_cell
@@ -0,0 +1,16 @@
+"""
+Tell requests served by the ASGI application in ``app/asgi.py`` apart
+from the ones served by WSGI.
+"""
+from django.core.handlers.asgi import ASGIRequest
+
+
+def is_asgi(request) -> bool:
+    """
+    Whether ``request`` comes from the ASGI handler. REST framework requests
+    proxy the attributes of the Django request they wrap, so its ASGI
+    ``scope`` is checked instead of the class of the request.
+    """
+    return isinstance(request, ASGIRequest) or isinstance(
+        getattr(request, "scope", None), dict
+    )
@@ -0,0 +1,67 @@
+"""
+In-process publish/subscribe of game states for the events stream.
+
+Subscribers are the event streams served by the ASGI event loop of this
+worker. Publishers can run in any thread, for example a sync view executed
+by the ASGI handler, and hand each payload over to the subscriber loop.
+Subscribers of other workers are not reached.
+"""
+import asyncio
+import threading
+from typing import Dict
+
+from django.conf import settings
+
+
+class GameBroadcaster:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Dict[asyncio.Queue, asyncio.AbstractEventLoop]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, name: str) -> asyncio.Queue:
+        """
+        Register a queue that receives every payload published for the game.
+        Must be called from the event loop that reads the queue.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(name, {})[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, name: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(name, {})
+            subscribers.pop(queue, None)
+            if not subscribers:
+                self._subscribers.pop(name, None)
+
+    def has_subscribers(self, name: str) -> bool:
+        return name in self._subscribers
+
+    def publish(self, name: str, payload: str) -> int:
+        """
+        Deliver ``payload`` to every subscriber of the game. Returns the number
+        of subscribers reached.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(name, {}).items())
+
+        delivered = 0
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, payload)
+                delivered += 1
+            except RuntimeError:
+                self.unsubscribe(name, queue)
+        return delivered
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, payload: str) -> None:
+        # A slow client only needs the latest states, drop the oldest one
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+
+broadcaster = GameBroadcaster(settings.GAME_EVENTS_QUEUE_SIZE)
@@ -2,14 +2,20 @@ class GameConstants:
     STATUS_WAITING = "WAITING"
     STATUS_IN_GAME = "IN_GAME"
     STATUS_FINISHED = "FINISHED"
+    STATUS_DRAW = "DRAW"
 
     STATUS_CHOICES = (
         (STATUS_WAITING, "Waiting"),
         (STATUS_IN_GAME, "In Game"),
         (STATUS_FINISHED, "Finished"),
+        (STATUS_DRAW, "Draw"),
     )
 
-    VALID_POSITIONS = [0, 1, 2]
+    DEFAULT_BOARD_SIZE = 3
+    MIN_BOARD_SIZE = 3
+    MAX_BOARD_SIZE = 7
+    DEFAULT_WIN_LENGTH = 3
+    MIN_WIN_LENGTH = 3
 
     MARK_X = "X"
     MARK_O = "O"
@@ -17,3 +23,7 @@ class GameConstants:
         (MARK_X, "X"),
         (MARK_O, "O"),
     )
+
+    MAX_PLAYERS = 2
+
+    BOT_USERNAME = "TicTacToeBot"
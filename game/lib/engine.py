@@ -0,0 +1,184 @@
+"""
+Bitboard rules engine.
+
+The board is kept as two integers, one per mark, where the bit
+``row * size + col`` is set when that cell holds the mark. Legality,
+placement and win detection are plain bitwise operations against line
+tables that ``get_rules`` builds once per ``(size, win_length)``.
+"""
+from functools import lru_cache
+import re
+from typing import Optional, Tuple
+
+from game.lib.constants import GameConstants
+
+_CELL_PATTERN = re.compile(r'"([^"]*)"')
+# A logged move is one byte: the cell index, with the high bit set for `O`
+_O_MOVE = 0x80
+
+
+class Rules:
+    """
+    Precomputed line tables for a ``size`` x ``size`` board where
+    ``win_length`` marks in a row win.
+    """
+
+    __slots__ = (
+        "size",
+        "win_length",
+        "cells",
+        "full_mask",
+        "win_masks",
+        "cell_masks",
+    )
+
+    def __init__(self, size: int, win_length: int):
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.win_masks = self._build_win_masks()
+        self.cell_masks = tuple(
+            tuple(mask for mask in self.win_masks if mask & (1 << cell))
+            for cell in range(self.cells)
+        )
+
+    def _build_win_masks(self) -> Tuple[int, ...]:
+        size, length = self.size, self.win_length
+        directions = ((0, 1), (1, 0), (1, 1), (1, -1))
+        masks = []
+        for row in range(size):
+            for col in range(size):
+                for step_row, step_col in directions:
+                    end_row = row + step_row * (length - 1)
+                    end_col = col + step_col * (length - 1)
+                    if not (0 <= end_row < size and 0 <= end_col < size):
+                        continue
+                    masks.append(
+                        sum(
+                            1 << ((row + step_row * i) * size + col + step_col * i)
+                            for i in range(length)
+                        )
+                    )
+        return tuple(masks)
+
+    def is_valid_position(self, movement_x: int, movement_y: int) -> bool:
+        return 0 <= movement_x < self.size and 0 <= movement_y < self.size
+
+    def cell_index(self, movement_x: int, movement_y: int) -> int:
+        return movement_x * self.size + movement_y
+
+    def has_won(self, bits: int, cell: Optional[int] = None) -> bool:
+        """
+        Check every line, or only the lines through ``cell`` when the last
+        placed cell is known.
+        """
+        masks = self.win_masks if cell is None else self.cell_masks[cell]
+        for mask in masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def is_full(self, x_bits: int, o_bits: int) -> bool:
+        return (x_bits | o_bits) == self.full_mask
+
+    def is_draw(self, x_bits: int, o_bits: int, x_to_move: bool) -> bool:
+        """
+        Check that neither mark can still complete a line: every line holds
+        the opponent mark or needs more cells than the movements left.
+        """
+        empty = self.cells - bin(x_bits | o_bits).count("1")
+        x_moves = (empty + 1) // 2 if x_to_move else empty // 2
+        o_moves = empty - x_moves
+        for mask in self.win_masks:
+            if not mask & o_bits and bin(mask & ~x_bits).count("1") <= x_moves:
+                return False
+            if not mask & x_bits and bin(mask & ~o_bits).count("1") <= o_moves:
+                return False
+        return True
+
+    def empty_board(self) -> str:
+        return encode_board(0, 0, self.size)
+
+
+@lru_cache(maxsize=None)
+def get_rules(
+    size: int = GameConstants.DEFAULT_BOARD_SIZE,
+    win_length: int = GameConstants.DEFAULT_WIN_LENGTH,
+) -> Rules:
+    return Rules(size, win_length)
+
+
+def is_empty(x_bits: int, o_bits: int, cell: int) -> bool:
+    return not (x_bits | o_bits) & (1 << cell)
+
+
+def place(bits: int, cell: int) -> int:
+    return bits | (1 << cell)
+
+
+@lru_cache(maxsize=4096)
+def decode_board(board: str) -> Tuple[int, int]:
+    """
+    Read the stored JSON board into ``(x_bits, o_bits)`` without building
+    the nested lists.
+    """
+    x_bits = o_bits = 0
+    for index, match in enumerate(_CELL_PATTERN.finditer(board)):
+        cell = match.group(1)
+        if cell == GameConstants.MARK_X:
+            x_bits |= 1 << index
+        elif cell == GameConstants.MARK_O:
+            o_bits |= 1 << index
+    return x_bits, o_bits
+
+
+@lru_cache(maxsize=4096)
+def encode_board(
+    x_bits: int, o_bits: int, size: int = GameConstants.DEFAULT_BOARD_SIZE
+) -> str:
+    """
+    Render ``(x_bits, o_bits)`` in the same format ``json.dumps`` gives the
+    nested list board.
+    """
+    rows = []
+    for row in range(size):
+        cells = []
+        for col in range(size):
+            bit = 1 << (row * size + col)
+            if x_bits & bit:
+                cells.append('"%s"' % GameConstants.MARK_X)
+            elif o_bits & bit:
+                cells.append('"%s"' % GameConstants.MARK_O)
+            else:
+                cells.append('""')
+        rows.append("[" + ", ".join(cells) + "]")
+    return "[" + ", ".join(rows) + "]"
+
+
+def encode_move(cell: int, mark: str) -> int:
+    if mark == GameConstants.MARK_O:
+        return cell | _O_MOVE
+    return cell
+
+
+def decode_move(move: int) -> Tuple[int, str]:
+    if move & _O_MOVE:
+        return move & ~_O_MOVE, GameConstants.MARK_O
+    return move, GameConstants.MARK_X
+
+
+@lru_cache(maxsize=4096)
+def replay(moves: bytes) -> Tuple[int, int]:
+    """
+    ``(x_bits, o_bits)`` after playing the logged ``moves``. The position of
+    every prefix is cached, so a replay only applies the moves past the
+    longest prefix replayed before.
+    """
+    if not moves:
+        return 0, 0
+    x_bits, o_bits = replay(moves[:-1])
+    cell, mark = decode_move(moves[-1])
+    if mark == GameConstants.MARK_X:
+        return place(x_bits, cell), o_bits
+    return x_bits, place(o_bits, cell)
@@ -0,0 +1,299 @@
+"""
+Differential checks and microbenchmarks of the rules engine.
+
+Engines are compared through a small adapter interface on the same
+positions: every reachable 3x3 position and random positions on larger
+boards. ``ReferenceEngine`` is the nested list, nested loop logic the game
+model used before the bitboards, extended to any ``win_length``. Its draw
+check searches the game tree instead of counting the movements left, so
+it does not share the rule it checks. The search is only run on boards of
+up to ``DRAW_SEARCH_MAX_CELLS`` cells. ``BitboardEngine`` adapts
+``engine``. No database is used, so the timings
+only measure rule evaluation.
+"""
+import random
+import statistics
+import time
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+from game.lib import engine
+from game.lib.constants import GameConstants
+
+# (x_bits, o_bits, x_to_move)
+Position = Tuple[int, int, bool]
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# 5x5 is searched in about a millisecond per position, 6x6 with a long
+# win_length takes minutes
+DRAW_SEARCH_MAX_CELLS = 25
+
+
+def searches_draws(size: int) -> bool:
+    return size * size <= DRAW_SEARCH_MAX_CELLS
+
+
+class ReferenceEngine:
+    name = "reference"
+
+    def __init__(self, size: int, win_length: int):
+        self.size = size
+        self.win_length = win_length
+
+    def prepare(self, position: Position) -> List[List[str]]:
+        x_bits, o_bits, _ = position
+        board = []
+        for row in range(self.size):
+            cells = []
+            for col in range(self.size):
+                bit = 1 << (row * self.size + col)
+                if x_bits & bit:
+                    cells.append(GameConstants.MARK_X)
+                elif o_bits & bit:
+                    cells.append(GameConstants.MARK_O)
+                else:
+                    cells.append("")
+            board.append(cells)
+        return board
+
+    def is_valid(self, board: List[List[str]], movement_x: int, movement_y: int) -> bool:
+        return (
+            0 <= movement_x < self.size
+            and 0 <= movement_y < self.size
+            and board[movement_x][movement_y] == ""
+        )
+
+    def _lines(self) -> Iterator[List[Tuple[int, int]]]:
+        for row in range(self.size):
+            for col in range(self.size):
+                for step_row, step_col in DIRECTIONS:
+                    line = []
+                    for i in range(self.win_length):
+                        cell_row = row + step_row * i
+                        cell_col = col + step_col * i
+                        if not (0 <= cell_row < self.size and 0 <= cell_col < self.size):
+                            break
+                        line.append((cell_row, cell_col))
+                    if len(line) == self.win_length:
+                        yield line
+
+    def has_won(self, board: List[List[str]], mark: str) -> bool:
+        for line in self._lines():
+            winner = True
+            for row, col in line:
+                if board[row][col] != mark:
+                    winner = False
+                    break
+            if winner:
+                return True
+        return False
+
+    def is_draw(self, board: List[List[str]], x_to_move: bool) -> bool:
+        """
+        Search every continuation of the game, each player moving in turn
+        until a line is completed or the board is full. A draw is a position
+        where none completes a line.
+        """
+        if not searches_draws(self.size):
+            raise ValueError(f"Draws are only searched up to {DRAW_SEARCH_MAX_CELLS} cells.")
+        lines = [
+            sum(1 << (row * self.size + col) for row, col in line) for line in self._lines()
+        ]
+        full = (1 << (self.size * self.size)) - 1
+        x_bits = o_bits = 0
+        for row in range(self.size):
+            for col in range(self.size):
+                bit = 1 << (row * self.size + col)
+                if board[row][col] == GameConstants.MARK_X:
+                    x_bits |= bit
+                elif board[row][col] == GameConstants.MARK_O:
+                    o_bits |= bit
+        searched = {}
+
+        def can_complete(x_bits: int, o_bits: int, x_to_move: bool) -> bool:
+            key = (x_bits, o_bits)
+            if key not in searched:
+                if any(line & x_bits == line or line & o_bits == line for line in lines):
+                    searched[key] = True
+                else:
+                    free = full & ~(x_bits | o_bits)
+                    searched[key] = any(
+                        can_complete(x_bits | bit, o_bits, False)
+                        if x_to_move
+                        else can_complete(x_bits, o_bits | bit, True)
+                        for bit in (1 << cell for cell in range(full.bit_length()))
+                        if free & bit
+                    )
+            return searched[key]
+
+        return not can_complete(x_bits, o_bits, x_to_move)
+
+
+class BitboardEngine:
+    name = "bitboard"
+
+    def __init__(self, size: int, win_length: int):
+        self.size = size
+        self.rules = engine.get_rules(size, win_length)
+
+    def prepare(self, position: Position) -> Position:
+        return position
+
+    def is_valid(self, position: Position, movement_x: int, movement_y: int) -> bool:
+        return self.rules.is_valid_position(movement_x, movement_y) and engine.is_empty(
+            position[0], position[1], self.rules.cell_index(movement_x, movement_y)
+        )
+
+    def has_won(self, position: Position, mark: str) -> bool:
+        return self.rules.has_won(
+            position[0] if mark == GameConstants.MARK_X else position[1]
+        )
+
+    def is_draw(self, position: Position, x_to_move: bool) -> bool:
+        return self.rules.is_draw(position[0], position[1], x_to_move)
+
+
+ENGINES = (ReferenceEngine, BitboardEngine)
+
+
+def reachable_positions(size: int = 3, win_length: int = 3) -> List[Position]:
+    """
+    Every position reachable from the empty board, stopping at wins. Only
+    practical for 3x3.
+    """
+    rules = engine.get_rules(size, win_length)
+    seen = set()
+    positions = []
+    stack = [(0, 0, True)]
+    while stack:
+        position = stack.pop()
+        if position in seen:
+            continue
+        seen.add(position)
+        positions.append(position)
+        x_bits, o_bits, x_to_move = position
+        if rules.has_won(x_bits) or rules.has_won(o_bits):
+            continue
+        for cell in range(rules.cells):
+            if engine.is_empty(x_bits, o_bits, cell):
+                if x_to_move:
+                    stack.append((engine.place(x_bits, cell), o_bits, False))
+                else:
+                    stack.append((x_bits, engine.place(o_bits, cell), True))
+    return positions
+
+
+def random_positions(
+    size: int, win_length: int, count: int, seed: int = 0
+) -> List[Position]:
+    """
+    Positions of random playouts cut at a random ply, or at the first win.
+    """
+    rules = engine.get_rules(size, win_length)
+    generator = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        cells = list(range(rules.cells))
+        generator.shuffle(cells)
+        x_bits = o_bits = 0
+        for ply in range(generator.randint(0, rules.cells)):
+            if ply % 2 == 0:
+                x_bits = engine.place(x_bits, cells[ply])
+            else:
+                o_bits = engine.place(o_bits, cells[ply])
+            if rules.has_won(x_bits) or rules.has_won(o_bits):
+                break
+        x_to_move = bin(x_bits).count("1") == bin(o_bits).count("1")
+        positions.append((x_bits, o_bits, x_to_move))
+    return positions
+
+
+def operations(candidate, position: Position) -> Iterator[Tuple[str, object]]:
+    """
+    Results of every operation of ``candidate`` on ``position``, labelled.
+    """
+    state = candidate.prepare(position)
+    for mark in (GameConstants.MARK_X, GameConstants.MARK_O):
+        yield f"has_won {mark}", candidate.has_won(state, mark)
+    if searches_draws(candidate.size):
+        yield "is_draw", candidate.is_draw(state, position[2])
+    for movement_x in range(-1, candidate.size + 1):
+        for movement_y in range(-1, candidate.size + 1):
+            yield (
+                f"is_valid {movement_x},{movement_y}",
+                candidate.is_valid(state, movement_x, movement_y),
+            )
+
+
+def differences(
+    candidate, reference, positions: Sequence[Position]
+) -> List[Tuple[Position, str, object, object]]:
+    """
+    ``(position, operation, expected, got)`` for each disagreement.
+    """
+    found = []
+    for position in positions:
+        expected = operations(reference, position)
+        got = operations(candidate, position)
+        for (operation, value), (_, candidate_value) in zip(expected, got):
+            if value != candidate_value:
+                found.append((position, operation, value, candidate_value))
+    return found
+
+
+def benchmark(
+    func: Callable, arguments: Sequence[tuple], warmup: int = 1, repeat: int = 5
+) -> dict:
+    """
+    Time ``func`` over every argument tuple ``repeat`` times after ``warmup``
+    untimed rounds. Statistics are in nanoseconds per call.
+    """
+    for _ in range(warmup):
+        for args in arguments:
+            func(*args)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for args in arguments:
+            func(*args)
+        samples.append((time.perf_counter_ns() - start) / len(arguments))
+    return {
+        "calls": len(arguments),
+        "repeat": repeat,
+        "min_ns": min(samples),
+        "median_ns": statistics.median(samples),
+        "mean_ns": statistics.mean(samples),
+        "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def benchmark_engine(
+    candidate, positions: Sequence[Position], warmup: int = 1, repeat: int = 5
+) -> dict:
+    states = [(candidate.prepare(position), position) for position in positions]
+    moves = [
+        (state, movement_x, movement_y)
+        for state, _ in states
+        for movement_x in range(candidate.size)
+        for movement_y in range(candidate.size)
+    ]
+    timings = {
+        "prepare": benchmark(
+            candidate.prepare, [(position,) for position in positions], warmup, repeat
+        ),
+        "is_valid": benchmark(candidate.is_valid, moves, warmup, repeat),
+        "has_won": benchmark(
+            candidate.has_won,
+            [(state, GameConstants.MARK_X) for state, _ in states],
+            warmup,
+            repeat,
+        ),
+    }
+    if searches_draws(candidate.size):
+        timings["is_draw"] = benchmark(
+            candidate.is_draw,
+            [(state, position[2]) for state, position in states],
+            warmup,
+            repeat,
+        )
+    return timings
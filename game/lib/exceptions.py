@@ -21,6 +21,16 @@ class FullGameStatusException(APIException):
     default_detail = "The game is full. Please select other."
 
 
+class AlreadyInGameException(APIException):
+    status_code = 400
+    default_detail = "The user is already playing this game."
+
+
+class BotPlayerException(APIException):
+    status_code = 400
+    default_detail = "The server bot can not join games on its own. Please select other user."
+
+
 class NotUserTurnException(APIException):
     status_code = 400
     default_detail = "The turn to play is for the other player. Please wait until this turn finishes."
@@ -33,6 +43,24 @@ class NotValidPositionException(APIException):
     )
 
 
+class NotValidPlyException(APIException):
+    status_code = 400
+    default_detail = "The ply requested has not been played in this game."
+
+
+class ProfileNotFoundException(APIException):
+    status_code = 404
+    default_detail = "Profile Not Found."
+
+
+class ASGIRequiredException(APIException):
+    status_code = 501
+    default_detail = (
+        "Game events are only streamed by the ASGI application. "
+        "Please run the server with app.asgi:application."
+    )
+
+
 class SerializerException(APIException):
     status_code = 400
     default_detail = "Please complete all the required fields."
@@ -0,0 +1,111 @@
+"""
+Streaming export of games as NDJSON, one JSON object per line.
+
+Rows are read with a ``values()`` projection through ``iterator()``, so
+only one chunk of plain dicts is held in memory at a time, whatever the
+number of games exported. The HTTP endpoint and the ``export_games``
+command share these helpers. Under ASGI the endpoint streams
+``aiter_ndjson`` instead: Django would read a sync iterator whole into a
+list before sending it.
+"""
+import json
+from typing import AsyncIterator, Iterator, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q, QuerySet
+
+from game.lib import engine
+from game.lib.constants import GameConstants
+from game.models import Game
+
+FINISHED_STATUSES = (GameConstants.STATUS_FINISHED, GameConstants.STATUS_DRAW)
+
+EXPORT_FIELDS = (
+    "id",
+    "name",
+    "status",
+    "board_size",
+    "win_length",
+    "x_bits",
+    "o_bits",
+    "moves",
+    "player_x__username",
+    "player_o__username",
+    "winner__username",
+)
+
+
+def games_to_export(
+    status: Optional[str] = None,
+    user_id: Optional[int] = None,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+) -> QuerySet:
+    """
+    Games ordered by id, finished or drawn unless ``status`` is given.
+    """
+    games = Game.objects.order_by("id")
+    if status:
+        games = games.filter(status=status)
+    else:
+        games = games.filter(status__in=FINISHED_STATUSES)
+    if user_id is not None:
+        games = games.filter(Q(player_x_id=user_id) | Q(player_o_id=user_id))
+    if min_id is not None:
+        games = games.filter(id__gte=min_id)
+    if max_id is not None:
+        games = games.filter(id__lte=max_id)
+    return games.values(*EXPORT_FIELDS)
+
+
+def game_record(row: dict) -> dict:
+    size = row["board_size"]
+    moves = []
+    for move in bytes(row["moves"]):
+        cell, mark = engine.decode_move(move)
+        moves.append([*divmod(cell, size), mark])
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "status": row["status"],
+        "board_size": size,
+        "win_length": row["win_length"],
+        "board": engine.encode_board(row["x_bits"], row["o_bits"], size),
+        "moves": moves,
+        "player_x": row["player_x__username"],
+        "player_o": row["player_o__username"],
+        "winner": row["winner__username"],
+    }
+
+
+def iter_ndjson(games: QuerySet, chunk_size: Optional[int] = None) -> Iterator[str]:
+    chunk_size = chunk_size or settings.GAME_EXPORT_CHUNK_SIZE
+    for row in games.iterator(chunk_size=chunk_size):
+        yield json.dumps(game_record(row)) + "\n"
+
+
+def _ndjson_batch(games: QuerySet, after_id: int, chunk_size: int) -> Tuple[str, int, int]:
+    rows = list(games.filter(id__gt=after_id)[:chunk_size])
+    lines = "".join(json.dumps(game_record(row)) + "\n" for row in rows)
+    return lines, len(rows), rows[-1]["id"] if rows else after_id
+
+
+async def aiter_ndjson(
+    games: QuerySet, chunk_size: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Same lines as ``iter_ndjson``, read by id ranges of ``chunk_size``
+    games. Each range is its own query, so no cursor is kept open between
+    two sends.
+    """
+    chunk_size = chunk_size or settings.GAME_EXPORT_CHUNK_SIZE
+    after_id = 0
+    while True:
+        lines, count, after_id = await sync_to_async(_ndjson_batch)(
+            games, after_id, chunk_size
+        )
+        if lines:
+            yield lines
+        if count < chunk_size:
+            return
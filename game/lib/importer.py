@@ -0,0 +1,241 @@
+"""
+Bulk import of games, the inverse of ``export``.
+
+Records are read one at a time and inserted in batches with
+``bulk_create``. Usernames are resolved through an in-memory map that
+only queries, and creates, the users it has not seen yet, once per batch.
+User stats are recomputed from the games by a single UPDATE at the end
+instead of per game.
+"""
+import csv
+from itertools import islice
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from game.lib import engine
+from game.lib.constants import GameConstants
+from game.lib.export import FINISHED_STATUSES
+from game.models import Game, User, UserGame
+
+PLAYER_FIELDS = ("player_x", "player_o", "winner")
+
+
+class GameImportError(ValueError):
+    pass
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[dict]:
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Rows with the columns of the NDJSON records, ``moves`` and ``board``
+    written as JSON.
+    """
+    for row in csv.DictReader(lines):
+        row["moves"] = json.loads(row["moves"]) if row.get("moves") else []
+        yield row
+
+
+class UserMap:
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def __getitem__(self, username: Optional[str]) -> Optional[int]:
+        if not username:
+            return None
+        return self._ids[username]
+
+    def resolve(self, usernames: Iterable[Optional[str]]) -> None:
+        """
+        Load the ids of ``usernames`` not in the map yet, creating the users
+        that do not exist.
+        """
+        missing = {username for username in usernames if username} - self._ids.keys()
+        if not missing:
+            return
+        self._ids.update(
+            User.objects.filter(username__in=missing).values_list("username", "id")
+        )
+        new = missing - self._ids.keys()
+        if new:
+            created = User.objects.bulk_create(
+                [User(username=username) for username in new]
+            )
+            if all(user.pk is not None for user in created):
+                self._ids.update((user.username, user.pk) for user in created)
+            else:
+                # Backends without RETURNING on bulk inserts
+                self._ids.update(
+                    User.objects.filter(username__in=new).values_list("username", "id")
+                )
+
+
+def _encode_moves(moves: List[list], rules: engine.Rules) -> bytes:
+    encoded = bytearray()
+    for movement_x, movement_y, mark in moves:
+        if not rules.is_valid_position(movement_x, movement_y):
+            raise GameImportError(f"Not valid movement {movement_x}, {movement_y}.")
+        if mark not in (GameConstants.MARK_X, GameConstants.MARK_O):
+            raise GameImportError(f"Not valid mark {mark}.")
+        encoded.append(
+            engine.encode_move(rules.cell_index(movement_x, movement_y), mark)
+        )
+    return bytes(encoded)
+
+
+def _position(record: dict, rules: engine.Rules) -> Tuple[bytes, int, int]:
+    """
+    Encoded moves and board of ``record``, replayed from its moves when it
+    has them and read from its board otherwise.
+    """
+    moves = _encode_moves(record.get("moves") or [], rules)
+    if not moves:
+        return moves, *engine.decode_board(record.get("board") or "")
+
+    x_bits = o_bits = 0
+    for move in moves:
+        cell, mark = engine.decode_move(move)
+        if not engine.is_empty(x_bits, o_bits, cell):
+            raise GameImportError(f"Cell {cell} is played twice.")
+        if mark == GameConstants.MARK_X:
+            x_bits = engine.place(x_bits, cell)
+        else:
+            o_bits = engine.place(o_bits, cell)
+    return moves, x_bits, o_bits
+
+
+def build_game(record: dict, users: UserMap) -> Game:
+    board_size = int(record.get("board_size") or GameConstants.DEFAULT_BOARD_SIZE)
+    win_length = int(record.get("win_length") or GameConstants.DEFAULT_WIN_LENGTH)
+    if not (
+        GameConstants.MIN_BOARD_SIZE <= board_size <= GameConstants.MAX_BOARD_SIZE
+        and GameConstants.MIN_WIN_LENGTH <= win_length <= board_size
+    ):
+        raise GameImportError(f"Not valid board {board_size}x{board_size}.")
+    rules = engine.get_rules(board_size, win_length)
+
+    status = (record.get("status") or GameConstants.STATUS_FINISHED).upper()
+    if status not in dict(GameConstants.STATUS_CHOICES):
+        raise GameImportError(f"Not valid status {status}.")
+
+    moves, x_bits, o_bits = _position(record, rules)
+
+    player_x = users[record.get("player_x")]
+    player_o = users[record.get("player_o")]
+    winner = users[record.get("winner")]
+    if player_x is not None and player_x == player_o:
+        raise GameImportError("A user can not play both marks.")
+    if winner is not None and (
+        status != GameConstants.STATUS_FINISHED or winner not in (player_x, player_o)
+    ):
+        raise GameImportError("The winner must be a player of a finished game.")
+
+    if bin(x_bits).count("1") > bin(o_bits).count("1"):
+        actual_mark = GameConstants.MARK_O
+    else:
+        actual_mark = GameConstants.MARK_X
+    actual_player = None
+    if status == GameConstants.STATUS_IN_GAME:
+        actual_player = player_x if actual_mark == GameConstants.MARK_X else player_o
+
+    return Game(
+        name=record.get("name") or Game._meta.get_field("name").default,
+        status=status,
+        board_size=board_size,
+        win_length=win_length,
+        x_bits=x_bits,
+        o_bits=o_bits,
+        moves=moves,
+        player_x_id=player_x,
+        player_o_id=player_o,
+        winner_id=winner,
+        actual_mark=actual_mark,
+        actual_player_id=actual_player,
+        player_count=(player_x is not None) + (player_o is not None),
+        version=1,
+    )
+
+
+def recompute_user_stats() -> int:
+    """
+    Set ``points`` and ``number_of_games`` of every user from the games in
+    one UPDATE with correlated aggregates.
+    """
+    won = (
+        Game.objects.filter(winner=OuterRef("pk"), status=GameConstants.STATUS_FINISHED)
+        .order_by()
+        .values("winner")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    played = (
+        UserGame.objects.filter(user=OuterRef("pk"), game__status__in=FINISHED_STATUSES)
+        .order_by()
+        .values("user")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return User.objects.update(
+        points=Coalesce(Subquery(won), 0),
+        number_of_games=Coalesce(Subquery(played), 0),
+    )
+
+
+def insert_games(games: List[Game]) -> None:
+    """
+    Insert ``games`` and set their ids. Game names are not unique, so on
+    backends without RETURNING on bulk inserts the ids can not be looked up
+    afterwards and each game is inserted on its own.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        Game.objects.bulk_create(games)
+    else:
+        for game in games:
+            game.save(force_insert=True)
+
+
+def import_games(records: Iterable[dict], batch_size: int) -> int:
+    """
+    Insert the games of ``records`` and their players in batches of
+    ``batch_size``, all in one transaction. Returns the number of games.
+    """
+    users = UserMap()
+    records = iter(records)
+    total = 0
+    with transaction.atomic():
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            users.resolve(
+                record.get(field) for record in batch for field in PLAYER_FIELDS
+            )
+            games = []
+            for number, record in enumerate(batch, start=total + 1):
+                try:
+                    games.append(build_game(record, users))
+                except (AttributeError, TypeError, ValueError) as error:
+                    raise GameImportError(f"Record {number}: {error}")
+            insert_games(games)
+            UserGame.objects.bulk_create(
+                [
+                    UserGame(game_id=game.id, user_id=user_id, mark=mark)
+                    for game in games
+                    for mark, user_id in (
+                        (GameConstants.MARK_X, game.player_x_id),
+                        (GameConstants.MARK_O, game.player_o_id),
+                    )
+                    if user_id is not None
+                ]
+            )
+            total += len(games)
+        recompute_user_stats()
+    return total
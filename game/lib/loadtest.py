@@ -0,0 +1,181 @@
+"""
+End to end load benchmark of the create, join and play flow.
+
+Every simulated game creates a game, joins a second player and plays it
+until `X` wins, through the whole Django stack with the DRF test client.
+Workers run the games concurrently on their own threads, so each one uses
+its own database connection. Latency and the queries run are recorded per
+endpoint. Counting queries forces the debug cursor, which adds the same
+small cost to every request.
+"""
+from collections import Counter
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+# X completes the first row while O fills the second one
+MOVEMENTS = ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2))
+
+ENDPOINTS = ("games-list", "game-details", "play-game")
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Nearest rank percentile of the sorted ``values``.
+    """
+    if not values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def allowed_host() -> str:
+    """
+    A host accepted by ``ALLOWED_HOSTS``, ``localhost`` being accepted by
+    the development settings where it is empty.
+    """
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*":
+            return host.lstrip(".")
+    return "localhost"
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.queries: List[int] = []
+        self.status_codes = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, latency: float, queries: int, status_code: int) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.queries.append(queries)
+            self.status_codes[status_code] += 1
+
+    def summary(self, duration: float) -> dict:
+        latencies = sorted(self.latencies)
+        requests = len(latencies)
+        return {
+            "requests": requests,
+            "errors": sum(
+                count for code, count in self.status_codes.items() if code >= 400
+            ),
+            "status_codes": {str(code): count for code, count in self.status_codes.items()},
+            "requests_per_second": requests / duration if duration else 0.0,
+            "latency_ms": {
+                "mean": sum(latencies) / requests * 1000 if requests else 0.0,
+                "p50": percentile(latencies, 50) * 1000,
+                "p95": percentile(latencies, 95) * 1000,
+                "p99": percentile(latencies, 99) * 1000,
+                "max": latencies[-1] * 1000 if latencies else 0.0,
+            },
+            "queries_per_request": sum(self.queries) / requests if requests else 0.0,
+        }
+
+
+class LoadTest:
+    def __init__(self, games: int, concurrency: int, prefix: str):
+        self.games = games
+        self.concurrency = concurrency
+        self.prefix = prefix
+        self.stats: Dict[str, EndpointStats] = {
+            endpoint: EndpointStats() for endpoint in ENDPOINTS
+        }
+        self.failed_games = 0
+        self._next_game = 0
+        self._lock = threading.Lock()
+
+    def request(self, client: APIClient, endpoint: str, method: str, url: str, data):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, method)(url, data, format="json")
+            latency = time.perf_counter() - start
+        self.stats[endpoint].add(latency, len(queries), response.status_code)
+        return response.status_code < 400
+
+    def play_game(self, client: APIClient, index: int) -> bool:
+        name = f"{self.prefix}-{index}"
+        player_x = f"{self.prefix}-x{index}"
+        player_o = f"{self.prefix}-o{index}"
+        created = self.request(
+            client,
+            "games-list",
+            "post",
+            reverse("game:games-list"),
+            {"name": name, "username": player_x},
+        )
+        if not created:
+            return False
+        joined = self.request(
+            client,
+            "game-details",
+            "put",
+            reverse("game:game-details", kwargs={"name": name}),
+            {"username": player_o},
+        )
+        if not joined:
+            return False
+        url = reverse("game:play-game", kwargs={"name": name})
+        for turn, (movement_x, movement_y) in enumerate(MOVEMENTS):
+            data = {
+                "username": player_x if turn % 2 == 0 else player_o,
+                "movement_x": movement_x,
+                "movement_y": movement_y,
+            }
+            if not self.request(client, "play-game", "post", url, data):
+                return False
+        return True
+
+    def _take_game(self) -> Optional[int]:
+        with self._lock:
+            if self._next_game >= self.games:
+                return None
+            self._next_game += 1
+            return self._next_game
+
+    def _worker(self) -> None:
+        # Server errors are counted instead of raised
+        client = APIClient(raise_request_exception=False, HTTP_HOST=allowed_host())
+        try:
+            while True:
+                index = self._take_game()
+                if index is None:
+                    break
+                if not self.play_game(client, index):
+                    with self._lock:
+                        self.failed_games += 1
+        finally:
+            connection.close()
+
+    def run(self) -> dict:
+        workers = [
+            threading.Thread(target=self._worker) for _ in range(self.concurrency)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        duration = time.perf_counter() - start
+
+        requests = sum(len(stats.latencies) for stats in self.stats.values())
+        return {
+            "games": self.games,
+            "failed_games": self.failed_games,
+            "concurrency": self.concurrency,
+            "duration_seconds": duration,
+            "requests": requests,
+            "requests_per_second": requests / duration if duration else 0.0,
+            "endpoints": {
+                endpoint: stats.summary(duration)
+                for endpoint, stats in self.stats.items()
+            },
+        }
@@ -0,0 +1,95 @@
+"""
+Automatic matchmaking.
+
+Waiting game ids are kept in an in-process queue, oldest first, so pairing
+a player does not scan the lobby. The queue is refilled from the
+``(status, id)`` index only when it runs dry. Entries can go stale when a
+game is joined elsewhere, so every candidate is locked and checked again
+before joining.
+"""
+from collections import deque
+import threading
+from typing import Optional, Tuple
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+
+from game.lib.constants import GameConstants
+from game.lib import exceptions as game_exceptions
+from game.models import Game, User, UserGame
+
+
+class WaitingGamesQueue:
+    def __init__(self, refill_size: int):
+        self.refill_size = refill_size
+        self._ids = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def push(self, game_id: int) -> None:
+        with self._lock:
+            self._ids.append(game_id)
+
+    def push_front(self, game_id: int) -> None:
+        with self._lock:
+            self._ids.appendleft(game_id)
+
+    def pop(self) -> Optional[int]:
+        with self._lock:
+            if not self._ids:
+                self._ids.extend(
+                    Game.objects.filter(status=GameConstants.STATUS_WAITING)
+                    .order_by("id")
+                    .values_list("id", flat=True)[: self.refill_size]
+                )
+            if not self._ids:
+                return None
+            return self._ids.popleft()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+
+waiting_games = WaitingGamesQueue(settings.MATCHMAKING_REFILL_SIZE)
+
+
+def pair(user: User) -> Tuple[Game, bool]:
+    """
+    Join ``user`` to the oldest waiting game or create a new one. Returns
+    the game and whether it was created. Expected to run inside a
+    transaction.
+    """
+    if user.is_bot:
+        raise game_exceptions.BotPlayerException
+    while True:
+        game_id = waiting_games.pop()
+        if game_id is None:
+            break
+        game = (
+            Game.objects.select_related("player_x")
+            .filter(id=game_id, status=GameConstants.STATUS_WAITING)
+            .first()
+        )
+        if game is None:
+            continue
+        if game.player_x_id == user.pk:
+            waiting_games.push_front(game.id)
+            return game, False
+        try:
+            game.join(user)
+        except game_exceptions.FullGameStatusException:
+            continue
+        return game, False
+
+    game = Game.objects.create(
+        name=f"match-{uuid.uuid4().hex[:12]}",
+        player_x=user,
+        player_count=1,
+    )
+    UserGame.objects.create(user=user, game=game, mark=GameConstants.MARK_X)
+    transaction.on_commit(lambda: waiting_games.push(game.id))
+    return game, True
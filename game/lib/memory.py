@@ -0,0 +1,184 @@
+"""
+Memory allocations of a worker process, traced with ``tracemalloc``.
+
+Tracing is started on demand and a baseline snapshot is taken at the same
+time. Reports compare a new snapshot with the baseline and attribute every
+allocation to the innermost frame of its traceback in one of the
+``MODULE_GROUPS``, so memory allocated by ``json`` or ``copy`` on behalf
+of a serializer is counted for the serializer. Snapshots live in the
+memory of the process traced: with several workers each one is traced and
+reported on its own.
+"""
+from collections import defaultdict
+import importlib.util
+import os
+import threading
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+MODULE_GROUPS = (
+    "game.views",
+    "game.serializers",
+    "game.lib",
+    "game.models",
+    "rest_framework",
+    "django.db",
+    "django",
+)
+
+OTHER_GROUP = "other"
+
+# Allocations of tracemalloc itself and of the import machinery
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_baseline: Optional[tracemalloc.Snapshot] = None
+# view: [requests, allocated bytes, retained bytes]
+_requests: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+_prefixes: Optional[List[Tuple[str, str]]] = None
+
+
+def _group_prefixes() -> List[Tuple[str, str]]:
+    """
+    Source path prefixes of the groups, the most specific first.
+    """
+    prefixes = []
+    for group in MODULE_GROUPS:
+        spec = importlib.util.find_spec(group)
+        if spec.submodule_search_locations:
+            prefixes += [
+                (location + os.sep, group) for location in spec.submodule_search_locations
+            ]
+        else:
+            prefixes.append((spec.origin, group))
+    return sorted(prefixes, key=lambda item: len(item[0]), reverse=True)
+
+
+def group_of(filename: str) -> Optional[str]:
+    global _prefixes
+    if _prefixes is None:
+        _prefixes = _group_prefixes()
+    for prefix, group in _prefixes:
+        if filename.startswith(prefix):
+            return group
+    return None
+
+
+def site_of(traceback: tracemalloc.Traceback) -> Tuple[str, tracemalloc.Frame]:
+    """
+    Group and frame an allocation is attributed to: the innermost frame in
+    a group, or the innermost frame at all.
+    """
+    # Traceback frames are ordered from the oldest call to the most recent
+    for frame in reversed(traceback):
+        group = group_of(frame.filename)
+        if group is not None:
+            return group, frame
+    return OTHER_GROUP, traceback[-1]
+
+
+def is_tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def start(frames: int) -> None:
+    """
+    Start tracing, if it is not yet, and take the baseline snapshot.
+    """
+    global _baseline
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        _baseline = take_snapshot()
+
+
+def stop() -> None:
+    global _baseline
+    with _lock:
+        tracemalloc.stop()
+        _baseline = None
+        _requests.clear()
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+def _new_totals() -> Dict[str, int]:
+    return {"size": 0, "size_diff": 0, "count": 0, "count_diff": 0}
+
+
+def report(limit: int = 20) -> dict:
+    """
+    Memory allocated since the baseline snapshot, by module group and by
+    allocation site, the biggest growth first.
+    """
+    if not tracemalloc.is_tracing():
+        return {"pid": os.getpid(), "tracing": False}
+
+    with _lock:
+        baseline = _baseline
+    snapshot = take_snapshot()
+    if baseline is None:
+        # Tracing started outside of `start`, everything traced is new
+        baseline = tracemalloc.Snapshot((), snapshot.traceback_limit)
+
+    groups: Dict[str, Dict[str, int]] = {}
+    sites: Dict[Tuple[str, str, int], Dict[str, int]] = {}
+    for statistic in snapshot.compare_to(baseline, "traceback"):
+        group, frame = site_of(statistic.traceback)
+        for totals in (
+            groups.setdefault(group, _new_totals()),
+            sites.setdefault((group, frame.filename, frame.lineno), _new_totals()),
+        ):
+            totals["size"] += statistic.size
+            totals["size_diff"] += statistic.size_diff
+            totals["count"] += statistic.count
+            totals["count_diff"] += statistic.count_diff
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "pid": os.getpid(),
+        "tracing": tracemalloc.is_tracing(),
+        "traced_bytes": current,
+        "peak_traced_bytes": peak,
+        "groups": [
+            {"group": group, **totals}
+            for group, totals in sorted(
+                groups.items(), key=lambda item: item[1]["size_diff"], reverse=True
+            )
+        ],
+        "sites": [
+            {"group": group, "site": f"{filename}:{lineno}", **totals}
+            for (group, filename, lineno), totals in sorted(
+                sites.items(), key=lambda item: item[1]["size_diff"], reverse=True
+            )[:limit]
+        ],
+        "requests": request_allocations(),
+    }
+
+
+def record_request(view: str, allocated: int, retained: int) -> None:
+    with _lock:
+        counters = _requests[view]
+        counters[0] += 1
+        counters[1] += allocated
+        counters[2] += retained
+
+
+def request_allocations() -> List[dict]:
+    with _lock:
+        return [
+            {
+                "view": view,
+                "requests": count,
+                "allocated_bytes": allocated,
+                "retained_bytes": retained,
+            }
+            for view, (count, allocated, retained) in sorted(_requests.items())
+        ]
@@ -0,0 +1,238 @@
+"""
+Request metrics shared by every worker process.
+
+Each process keeps its own counters in memory, updated under a lock held
+only for a few additions, and periodically writes them to its own file in
+``GAME_METRICS_DIR``. Processes never write to the same file, so no lock
+is shared between them. The ``/metrics`` endpoint sums the files of every
+process and renders the Prometheus text format. Files of stopped
+processes are kept, so their requests stay in the totals.
+"""
+import atexit
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+
+# (view, method, status)
+Key = Tuple[str, str, str]
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERIES_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def _new_record() -> dict:
+    return {
+        "count": 0,
+        "duration_sum": 0.0,
+        "duration_buckets": [0] * len(DURATION_BUCKETS),
+        "queries_sum": 0,
+        "queries_buckets": [0] * len(QUERIES_BUCKETS),
+        "query_duration_sum": 0.0,
+    }
+
+
+def _observe(buckets: List[int], bounds: Tuple[float, ...], value: float) -> None:
+    # Buckets are stored per interval and made cumulative when rendered
+    for index, bound in enumerate(bounds):
+        if value <= bound:
+            buckets[index] += 1
+            return
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries of a request and their
+    time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class MetricsCollector:
+    def __init__(self):
+        self._records: Dict[Key, dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._last_flush = time.monotonic()
+
+    @property
+    def directory(self) -> Path:
+        return Path(
+            settings.GAME_METRICS_DIR
+            or Path(tempfile.gettempdir()) / "tic-tac-toe-metrics"
+        )
+
+    def observe(
+        self, key: Key, duration: float, queries: int, query_duration: float
+    ) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker, the counters belong to the parent
+                self._records = {}
+                self._pid = os.getpid()
+            record = self._records.get(key)
+            if record is None:
+                record = self._records[key] = _new_record()
+            record["count"] += 1
+            record["duration_sum"] += duration
+            _observe(record["duration_buckets"], DURATION_BUCKETS, duration)
+            record["queries_sum"] += queries
+            _observe(record["queries_buckets"], QUERIES_BUCKETS, queries)
+            record["query_duration_sum"] += query_duration
+
+        if time.monotonic() - self._last_flush >= settings.GAME_METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the counters of this process to its file, unless another
+        thread is doing it.
+        """
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            with self._lock:
+                records = {
+                    "|".join(key): {
+                        **record,
+                        "duration_buckets": list(record["duration_buckets"]),
+                        "queries_buckets": list(record["queries_buckets"]),
+                    }
+                    for key, record in self._records.items()
+                }
+            if not records:
+                return
+            directory = self.directory
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"metrics-{os.getpid()}.json"
+            temporary = path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(records))
+            os.replace(temporary, path)
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> Dict[Key, dict]:
+        """
+        Sum the counters written by every process, this one flushed first.
+        """
+        self.flush()
+        totals: Dict[Key, dict] = {}
+        for path in self.directory.glob("metrics-*.json"):
+            try:
+                records = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, record in records.items():
+                key = tuple(name.split("|"))
+                total = totals.setdefault(key, _new_record())
+                for field, value in record.items():
+                    if isinstance(value, list):
+                        total[field] = [a + b for a, b in zip(total[field], value)]
+                    else:
+                        total[field] += value
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records = {}
+
+
+collector = MetricsCollector()
+atexit.register(collector.flush)
+
+
+def _labels(view: str, method: str, status: str, **extra: str) -> str:
+    labels = {"view": view, "method": method, "status": status, **extra}
+    return ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+
+
+def _histogram(
+    lines: List[str],
+    name: str,
+    labels: Key,
+    bounds: Tuple[float, ...],
+    buckets: List[int],
+    total: float,
+    count: int,
+) -> None:
+    cumulative = 0
+    for bound, observed in zip(bounds, buckets):
+        cumulative += observed
+        lines.append(f"{name}_bucket{{{_labels(*labels, le=str(bound))}}} {cumulative}")
+    lines.append(f"{name}_bucket{{{_labels(*labels, le='+Inf')}}} {count}")
+    lines.append(f"{name}_sum{{{_labels(*labels)}}} {total}")
+    lines.append(f"{name}_count{{{_labels(*labels)}}} {count}")
+
+
+def render(records: Dict[Key, dict]) -> str:
+    keys = sorted(records)
+    lines = [
+        "# HELP game_http_requests_total Requests served by URL name, method and status.",
+        "# TYPE game_http_requests_total counter",
+    ]
+    for key in keys:
+        lines.append(f"game_http_requests_total{{{_labels(*key)}}} {records[key]['count']}")
+
+    lines += [
+        "# HELP game_http_request_duration_seconds Time to build the response.",
+        "# TYPE game_http_request_duration_seconds histogram",
+    ]
+    for key in keys:
+        record = records[key]
+        _histogram(
+            lines,
+            "game_http_request_duration_seconds",
+            key,
+            DURATION_BUCKETS,
+            record["duration_buckets"],
+            record["duration_sum"],
+            record["count"],
+        )
+
+    lines += [
+        "# HELP game_http_db_queries Database queries run per request.",
+        "# TYPE game_http_db_queries histogram",
+    ]
+    for key in keys:
+        record = records[key]
+        _histogram(
+            lines,
+            "game_http_db_queries",
+            key,
+            QUERIES_BUCKETS,
+            record["queries_buckets"],
+            record["queries_sum"],
+            record["count"],
+        )
+
+    lines += [
+        "# HELP game_http_db_query_duration_seconds_total Time spent running queries.",
+        "# TYPE game_http_db_query_duration_seconds_total counter",
+    ]
+    for key in keys:
+        lines.append(
+            f"game_http_db_query_duration_seconds_total{{{_labels(*key)}}} "
+            f"{records[key]['query_duration_sum']}"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,14 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class GameCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the game id, so each page is an indexed range
+    scan whatever its position in the list.
+    """
+
+    ordering = "id"
+    page_size = settings.GAMES_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,92 @@
+"""
+On-demand CPU profiles of single requests.
+
+A profiled request runs under ``cProfile`` and its stats are written in
+the ``pstats`` format, with a JSON file describing the request, to
+``GAME_PROFILING_DIR``. The directory is a ring of at most
+``GAME_PROFILING_MAX_FILES`` profiles: the oldest ones are deleted as new
+ones are written.
+"""
+import cProfile
+import io
+import json
+import os
+from pathlib import Path
+import pstats
+import re
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from django.conf import settings
+
+_PROFILE_ID = re.compile(r"^\d+-\d+$")
+
+# cProfile can not run twice at once, a request arriving while another one is
+# profiled is served without profiling
+profiling_lock = threading.Lock()
+
+
+def profiles_directory() -> Path:
+    return Path(
+        settings.GAME_PROFILING_DIR
+        or Path(tempfile.gettempdir()) / "tic-tac-toe-profiles"
+    )
+
+
+def is_valid_id(profile_id: str) -> bool:
+    return bool(_PROFILE_ID.match(profile_id))
+
+
+def save(profiler: cProfile.Profile, info: dict) -> str:
+    """
+    Write the stats of ``profiler`` and ``info`` about the request, then
+    trim the ring. Returns the id of the profile.
+    """
+    directory = profiles_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{time.time_ns()}-{os.getpid()}"
+    profiler.dump_stats(str(directory / f"{profile_id}.prof"))
+    (directory / f"{profile_id}.json").write_text(
+        json.dumps({"id": profile_id, **info})
+    )
+    trim(directory, settings.GAME_PROFILING_MAX_FILES)
+    return profile_id
+
+
+def trim(directory: Path, max_files: int) -> None:
+    profile_ids = sorted(path.stem for path in directory.glob("*.json"))
+    for profile_id in profile_ids[: max(len(profile_ids) - max_files, 0)]:
+        for suffix in (".json", ".prof"):
+            try:
+                (directory / f"{profile_id}{suffix}").unlink()
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[dict]:
+    """
+    Descriptions of the stored profiles, newest first.
+    """
+    profiles = []
+    for path in sorted(profiles_directory().glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def stats_path(profile_id: str) -> Optional[Path]:
+    if not is_valid_id(profile_id):
+        return None
+    path = profiles_directory() / f"{profile_id}.prof"
+    return path if path.exists() else None
+
+
+def stats_text(path: Path, sort: str = "cumulative", limit: int = 40) -> str:
+    output = io.StringIO()
+    stats = pstats.Stats(str(path), stream=output)
+    stats.sort_stats(sort).print_stats(limit)
+    return output.getvalue()
@@ -0,0 +1,125 @@
+"""
+Solved position table for the classic 3x3 game.
+
+Every board is indexed by its base-3 code (``0`` empty, ``1`` X, ``2`` O per
+cell) and stored in one byte: the game-theoretic value for the side to move
+in the high nibble and its best cell in the low nibble. Boards that can not
+be reached in a legal game hold ``NOT_LEGAL``.
+
+``build_table`` enumerates the positions and the ``build_solved_table``
+management command writes them to disk. ``GameConfig.ready`` memory maps
+the file so every worker shares the same pages.
+"""
+import mmap
+import os
+from typing import Optional, Tuple
+
+from game.lib import engine
+
+SIZE = 3
+CELLS = SIZE * SIZE
+TABLE_SIZE = 3**CELLS
+
+LOSS = 0
+DRAW = 1
+WIN = 2
+
+NO_MOVE = 0x0F
+NOT_LEGAL = 0xFF
+
+_TRITS = tuple(
+    sum(3**cell for cell in range(CELLS) if value & (1 << cell))
+    for value in range(1 << CELLS)
+)
+
+_table = None
+
+
+def board_code(x_bits: int, o_bits: int) -> int:
+    return _TRITS[x_bits] + 2 * _TRITS[o_bits]
+
+
+def build_table() -> bytearray:
+    rules = engine.get_rules(SIZE, SIZE)
+    order = sorted(range(CELLS), key=lambda cell: -len(rules.cell_masks[cell]))
+    table = bytearray([NOT_LEGAL]) * TABLE_SIZE
+
+    def solve(x_bits: int, o_bits: int) -> int:
+        code = board_code(x_bits, o_bits)
+        if table[code] != NOT_LEGAL:
+            return table[code] >> 4
+
+        x_to_move = bin(x_bits).count("1") == bin(o_bits).count("1")
+        if x_to_move:
+            me, opp = x_bits, o_bits
+        else:
+            me, opp = o_bits, x_bits
+
+        value, move = None, NO_MOVE
+        if rules.has_won(opp):
+            value = LOSS
+        elif rules.is_full(x_bits, o_bits):
+            value = DRAW
+        else:
+            best = None
+            for cell in order:
+                if not engine.is_empty(me, opp, cell):
+                    continue
+                child = engine.place(me, cell)
+                if x_to_move:
+                    child_value = WIN - solve(child, o_bits)
+                else:
+                    child_value = WIN - solve(x_bits, child)
+                # Prefer finishing the game right away over a later win
+                candidate = (child_value, rules.has_won(child, cell))
+                if best is None or candidate > best:
+                    best, value, move = candidate, child_value, cell
+
+        table[code] = (value << 4) | move
+        return value
+
+    solve(0, 0)
+    return table
+
+
+def load(path: str) -> bool:
+    """
+    Memory map the table at ``path``. Returns ``False`` when it does not
+    exist so callers fall back to searching.
+    """
+    global _table
+    if not os.path.isfile(path):
+        return False
+    with open(path, "rb") as table_file:
+        table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(table) != TABLE_SIZE:
+        table.close()
+        return False
+    _table = table
+    return True
+
+
+def unload() -> None:
+    global _table
+    _table = None
+
+
+def is_loaded() -> bool:
+    return _table is not None
+
+
+def lookup(me: int, opp: int) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    ``(value, best cell)`` for the side owning ``me`` to move, or ``None``
+    when the table is not loaded or the position is not legal.
+    """
+    if _table is None:
+        return None
+    if bin(me).count("1") == bin(opp).count("1"):
+        entry = _table[board_code(me, opp)]
+    else:
+        entry = _table[board_code(opp, me)]
+    if entry == NOT_LEGAL:
+        return None
+    move = entry & 0x0F
+    return entry >> 4, None if move == NO_MOVE else move
@@ -45,7 +45,33 @@ class UserDetail:
                         "number_of_games": "1",
                         "points": "1",
                     },
-                    "games": [
+                    "summary": {
+                        "total": 2,
+                        "waiting": 0,
+                        "in_game": 1,
+                        "finished": 1,
+                        "draw": 0,
+                        "won": 1,
+                    },
+                }
+            },
+        ),
+        "404": openapi.Response(
+            description="User not found",
+            examples={"application/json": {"detail": "User Not Found."}},
+        ),
+    }
+
+
+class UserGamesList:
+    response_schemas = {
+        "200": openapi.Response(
+            description="Games played by the user",
+            examples={
+                "application/json": {
+                    "next": None,
+                    "previous": None,
+                    "results": [
                         {
                             "name": "Lets play",
                             "status": GameConstants.STATUS_FINISHED,
@@ -63,50 +89,73 @@ class UserDetail:
                 }
             },
         ),
+        "400": openapi.Response(
+            description="Not valid status filter",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.SerializerException.default_detail
+                }
+            },
+        ),
         "404": openapi.Response(
             description="User not found",
             examples={"application/json": {"detail": "User Not Found."}},
         ),
     }
 
+    query_param = openapi.Parameter(
+        "status",
+        openapi.IN_QUERY,
+        description="Filter by status: waiting, in_game, finished or draw",
+        type=openapi.TYPE_STRING,
+    )
+
 
 class GameList:
     get_response_schemas = {
         "200": openapi.Response(
             description="Games list",
             examples={
-                "application/json": [
-                    {
-                        "name": "Lets play",
-                        "status": GameConstants.STATUS_IN_GAME,
-                        "players": [
-                            {"username": "Tom"},
-                            {"username": "Jerry"},
-                        ],
-                        "actual_player": {
-                            "username": "Tom",
-                        },
-                        "board": f"[[{GameConstants.MARK_X},{GameConstants.MARK_X},''],[Y,Y,''],['','','']]",
-                        "winner": {
-                            "username": "Tom",
-                        },
-                    }
-                ]
+                "application/json": {
+                    "next": "http://localhost:8000/games/?cursor=cD0x",
+                    "previous": None,
+                    "results": [
+                        {
+                            "name": "Lets play",
+                            "status": GameConstants.STATUS_IN_GAME,
+                            "players": [
+                                {"username": "Tom"},
+                                {"username": "Jerry"},
+                            ],
+                            "actual_player": {
+                                "username": "Tom",
+                            },
+                            "board": f"[[{GameConstants.MARK_X},{GameConstants.MARK_X},''],[Y,Y,''],['','','']]",
+                            "winner": {
+                                "username": "Tom",
+                            },
+                        }
+                    ],
+                }
             },
         ),
         "200 ": openapi.Response(
             description="Available Games",
             examples={
-                "application/json": [
-                    {
-                        "name": "Lets play",
-                        "status": GameConstants.STATUS_WAITING,
-                    },
-                    {
-                        "name": "A new game",
-                        "status": GameConstants.STATUS_WAITING,
-                    },
-                ]
+                "application/json": {
+                    "next": None,
+                    "previous": None,
+                    "results": [
+                        {
+                            "name": "Lets play",
+                            "status": GameConstants.STATUS_WAITING,
+                        },
+                        {
+                            "name": "A new game",
+                            "status": GameConstants.STATUS_WAITING,
+                        },
+                    ],
+                }
             },
         ),
     }
@@ -118,11 +167,43 @@ class GameList:
         type=openapi.TYPE_STRING,
     )
 
+    get_cursor_param = openapi.Parameter(
+        "cursor",
+        openapi.IN_QUERY,
+        description="Cursor of the page, taken from the next or previous links",
+        type=openapi.TYPE_STRING,
+    )
+
+    get_page_size_param = openapi.Parameter(
+        "page_size",
+        openapi.IN_QUERY,
+        description="Number of games per page",
+        type=openapi.TYPE_INTEGER,
+    )
+
     post_request_schemas = openapi.Schema(
         type=openapi.TYPE_OBJECT,
         properties={
             "name": openapi.Schema(type=openapi.TYPE_STRING, description="string"),
             "username": openapi.Schema(type=openapi.TYPE_STRING, description="string"),
+            "board_size": openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description=(
+                    f"integer between {GameConstants.MIN_BOARD_SIZE}"
+                    f" and {GameConstants.MAX_BOARD_SIZE}"
+                ),
+                default=GameConstants.DEFAULT_BOARD_SIZE,
+            ),
+            "win_length": openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description="integer, marks in a row needed to win",
+                default=GameConstants.DEFAULT_WIN_LENGTH,
+            ),
+            "against_bot": openapi.Schema(
+                type=openapi.TYPE_BOOLEAN,
+                description="boolean, play against the server bot",
+                default=False,
+            ),
         },
     )
 
@@ -225,6 +306,14 @@ class GameDetail:
                 }
             },
         ),
+        "400  ": openapi.Response(
+            description="The user is already in the game.",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.AlreadyInGameException.default_detail
+                }
+            },
+        ),
     }
 
 
@@ -310,6 +399,18 @@ class PlayGameDetail:
                 ]
             },
         ),
+        "200  ": openapi.Response(
+            description="Game finished as a draw, no line can be completed",
+            examples={
+                "application/json": [
+                    {
+                        "name": "Lets play",
+                        "status": GameConstants.STATUS_DRAW,
+                        "winner": None,
+                    }
+                ]
+            },
+        ),
         "400": openapi.Response(
             description="Serializer error",
             examples={
@@ -319,3 +420,348 @@ class PlayGameDetail:
             },
         ),
     }
+
+
+class HintGameDetail:
+    get_response_schemas = {
+        "200": openapi.Response(
+            description="Best movement for the actual player",
+            examples={
+                "application/json": {
+                    "movement_x": 1,
+                    "movement_y": 1,
+                    "actual_mark": GameConstants.MARK_X,
+                }
+            },
+        ),
+        "400": openapi.Response(
+            description="Game status error",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.NotValidGameStatusException.default_detail
+                }
+            },
+        ),
+        "404": openapi.Response(
+            description="Game not found",
+            examples={"application/json": {"detail": "Game Not Found."}},
+        ),
+    }
+
+
+class ReplayGameDetail:
+    get_query_param = openapi.Parameter(
+        "ply",
+        openapi.IN_QUERY,
+        description="Number of movements to replay, the last position by default",
+        type=openapi.TYPE_INTEGER,
+    )
+
+    get_response_schemas = {
+        "200": openapi.Response(
+            description="Position of the game after the movements requested",
+            examples={
+                "application/json": {
+                    "name": "Game 1",
+                    "ply": 2,
+                    "plies": 5,
+                    "board": f'[["{GameConstants.MARK_X}", "", ""], ["", "{GameConstants.MARK_O}", ""], ["", "", ""]]',
+                    "movement_x": 1,
+                    "movement_y": 1,
+                    "mark": GameConstants.MARK_O,
+                }
+            },
+        ),
+        "400": openapi.Response(
+            description="Ply error",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.NotValidPlyException.default_detail
+                }
+            },
+        ),
+        "404": openapi.Response(
+            description="Game not found",
+            examples={"application/json": {"detail": "Game Not Found."}},
+        ),
+    }
+
+
+class Matchmaking:
+    post_request_schemas = openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "username": openapi.Schema(type=openapi.TYPE_STRING, description="string"),
+        },
+    )
+
+    post_response_schemas = {
+        "200": openapi.Response(
+            description="Joined to a waiting game. The game starts",
+            examples={
+                "application/json": {
+                    "name": "match-3f2a9c1b7d4e",
+                    "status": GameConstants.STATUS_IN_GAME,
+                    "players": [
+                        {"username": "Tom"},
+                        {"username": "Jerry"},
+                    ],
+                    "actual_player": {
+                        "username": "Tom",
+                    },
+                    "actual_mark": GameConstants.MARK_X,
+                }
+            },
+        ),
+        "201": openapi.Response(
+            description="No waiting games. A new game is created for the user",
+            examples={
+                "application/json": {
+                    "name": "match-3f2a9c1b7d4e",
+                    "status": GameConstants.STATUS_WAITING,
+                    "players": [
+                        {"username": "Tom"},
+                    ],
+                }
+            },
+        ),
+        "400": openapi.Response(
+            description="Serializer error",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.SerializerException.default_detail
+                }
+            },
+        ),
+    }
+
+
+class ExportGamesList:
+    query_params = [
+        openapi.Parameter(
+            "status",
+            openapi.IN_QUERY,
+            description="Status of the games, finished and draw games by default",
+            type=openapi.TYPE_STRING,
+        ),
+        openapi.Parameter(
+            "username",
+            openapi.IN_QUERY,
+            description="Only the games played by this user",
+            type=openapi.TYPE_STRING,
+        ),
+        openapi.Parameter(
+            "min_id",
+            openapi.IN_QUERY,
+            description="Lowest game id exported",
+            type=openapi.TYPE_INTEGER,
+        ),
+        openapi.Parameter(
+            "max_id",
+            openapi.IN_QUERY,
+            description="Highest game id exported",
+            type=openapi.TYPE_INTEGER,
+        ),
+    ]
+
+    response_schemas = {
+        "200": openapi.Response(
+            description="NDJSON stream, one game per line ordered by id",
+            examples={
+                "application/x-ndjson": {
+                    "id": 1,
+                    "name": "Lets play",
+                    "status": GameConstants.STATUS_FINISHED,
+                    "board_size": 3,
+                    "win_length": 3,
+                    "board": (
+                        f'[["{GameConstants.MARK_X}", "{GameConstants.MARK_X}", '
+                        f'"{GameConstants.MARK_X}"], ["{GameConstants.MARK_O}", '
+                        f'"{GameConstants.MARK_O}", ""], ["", "", ""]]'
+                    ),
+                    "moves": [
+                        [0, 0, GameConstants.MARK_X],
+                        [1, 0, GameConstants.MARK_O],
+                        [0, 1, GameConstants.MARK_X],
+                        [1, 1, GameConstants.MARK_O],
+                        [0, 2, GameConstants.MARK_X],
+                    ],
+                    "player_x": "Tom",
+                    "player_o": "Jerry",
+                    "winner": "Tom",
+                }
+            },
+        ),
+        "400": openapi.Response(
+            description="Not valid filters",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.SerializerException.default_detail
+                }
+            },
+        ),
+        "404": openapi.Response(
+            description="User not found",
+            examples={"application/json": {"detail": "User Not Found."}},
+        ),
+    }
+
+
+class ProfilesList:
+    get_response_schemas = {
+        "200": openapi.Response(
+            description="Stored request profiles, newest first",
+            examples={
+                "application/json": [
+                    {
+                        "id": "1760745600000000000-4242",
+                        "created_at": 1760745600.0,
+                        "view": "play-game",
+                        "method": "POST",
+                        "path": "/api/v1/games/Game 1/play/",
+                        "status": 200,
+                        "duration_ms": 12.5,
+                    }
+                ]
+            },
+        ),
+        "403": openapi.Response(
+            description="Not a staff user",
+            examples={
+                "application/json": {
+                    "detail": "You do not have permission to perform this action."
+                }
+            },
+        ),
+    }
+
+
+class ProfileDetail:
+    get_query_param = openapi.Parameter(
+        "output",
+        openapi.IN_QUERY,
+        description="'text' for the pstats report, the binary pstats file by default",
+        type=openapi.TYPE_STRING,
+    )
+
+    get_response_schemas = {
+        "200": openapi.Response(
+            description="Stats of the profile, loadable with pstats or snakeviz",
+        ),
+        "403": openapi.Response(
+            description="Not a staff user",
+            examples={
+                "application/json": {
+                    "detail": "You do not have permission to perform this action."
+                }
+            },
+        ),
+        "404": openapi.Response(
+            description="Profile not found",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.ProfileNotFoundException.default_detail
+                }
+            },
+        ),
+    }
+
+
+class MemoryDetail:
+    get_query_param = openapi.Parameter(
+        "limit",
+        openapi.IN_QUERY,
+        description="Number of allocation sites reported, 20 by default",
+        type=openapi.TYPE_INTEGER,
+    )
+
+    get_response_schemas = {
+        "200": openapi.Response(
+            description="Memory allocated by this worker since the baseline snapshot",
+            examples={
+                "application/json": {
+                    "pid": 4242,
+                    "tracing": True,
+                    "traced_bytes": 1843200,
+                    "peak_traced_bytes": 2150400,
+                    "groups": [
+                        {
+                            "group": "django.db",
+                            "size": 524288,
+                            "size_diff": 409600,
+                            "count": 3100,
+                            "count_diff": 2500,
+                        }
+                    ],
+                    "sites": [
+                        {
+                            "group": "django.db",
+                            "site": "django/db/backends/utils.py:131",
+                            "size": 262144,
+                            "size_diff": 262144,
+                            "count": 1200,
+                            "count_diff": 1200,
+                        }
+                    ],
+                    "requests": [
+                        {
+                            "view": "play-game",
+                            "requests": 10,
+                            "allocated_bytes": 1048576,
+                            "retained_bytes": 20480,
+                        }
+                    ],
+                }
+            },
+        ),
+        "400": openapi.Response(
+            description="Serializer error",
+            examples={
+                "application/json": {
+                    "detail": game_exceptions.SerializerException.default_detail
+                }
+            },
+        ),
+        "403": openapi.Response(
+            description="Not a staff user",
+            examples={
+                "application/json": {
+                    "detail": "You do not have permission to perform this action."
+                }
+            },
+        ),
+    }
+
+    post_request_schemas = openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "frames": openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description="Frames stored per allocation, GAME_TRACEMALLOC_FRAMES by default",
+            ),
+        },
+    )
+
+    post_response_schemas = {
+        "201": openapi.Response(
+            description="Tracing started and baseline snapshot taken",
+            examples={
+                "application/json": {
+                    "pid": 4242,
+                    "tracing": True,
+                    "traced_bytes": 102400,
+                    "peak_traced_bytes": 102400,
+                    "groups": [],
+                    "sites": [],
+                    "requests": [],
+                }
+            },
+        ),
+        "400": get_response_schemas["400"],
+        "403": get_response_schemas["403"],
+    }
+
+    delete_response_schemas = {
+        "204": openapi.Response(description="Tracing stopped"),
+        "403": get_response_schemas["403"],
+    }
@@ -0,0 +1,61 @@
+"""
+Game versions for conditional requests.
+
+Every save of a game bumps its ``version``. The ETag of a game is built
+from its id and version and kept in the Django cache, so a poll carrying
+an up to date ``If-None-Match`` is answered without loading the game. The
+cache entries expire after ``GAME_VERSION_CACHE_TIMEOUT`` seconds. That
+bounds how stale a per-process cache can be when another worker saved the
+game.
+"""
+import hashlib
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from game.models import Game
+
+
+def cache_key(name: str) -> str:
+    # Game names are free text, hash them to get a valid key on any backend
+    return f"game-version:{hashlib.md5(name.encode()).hexdigest()}"
+
+
+def make_etag(game_id: int, version: int) -> str:
+    return f'"{game_id}.{version}"'
+
+
+def store(game: Game) -> str:
+    etag = make_etag(game.id, game.version)
+    cache.set(cache_key(game.name), etag, settings.GAME_VERSION_CACHE_TIMEOUT)
+    return etag
+
+
+def get_etag(name: str) -> Optional[str]:
+    """
+    Actual ETag of the game, or ``None`` when it does not exist. Only the id
+    and version columns are read on a cache miss.
+    """
+    etag = cache.get(cache_key(name))
+    if etag is None:
+        row = Game.objects.filter(name=name).values_list("id", "version").first()
+        if row is None:
+            return None
+        etag = make_etag(*row)
+        cache.set(cache_key(name), etag, settings.GAME_VERSION_CACHE_TIMEOUT)
+    return etag
+
+
+def wait_for_change(name: str, etag: str, timeout: float) -> Optional[str]:
+    """
+    Block until the ETag of the game differs from ``etag`` or ``timeout``
+    seconds pass, and return the last ETag seen.
+    """
+    deadline = time.monotonic() + min(timeout, settings.GAME_LONG_POLL_MAX_WAIT)
+    current = etag
+    while current == etag and time.monotonic() < deadline:
+        time.sleep(settings.GAME_LONG_POLL_INTERVAL)
+        current = get_etag(name)
+    return current
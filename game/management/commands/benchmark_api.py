@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+import json
+import subprocess
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from game.lib.loadtest import LoadTest
+from game.models import Game, User
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Play games concurrently through the create, join and play endpoints "
+        "and report throughput, latency and queries per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=100, help="Games played.")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="Games played at once, 8 by default and 1 on SQLite.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark_api.json",
+            help="File to write the JSON results to.",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the games and users created instead of deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        if connection.vendor == "sqlite":
+            # SQLite allows a single writer, concurrent games would only
+            # measure `database is locked` errors
+            if concurrency is not None and concurrency > 1:
+                raise CommandError(
+                    "SQLite allows a single writer, run with --concurrency 1 "
+                    "or against a server database."
+                )
+            concurrency = 1
+        elif concurrency is None:
+            concurrency = 8
+
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        load_test = LoadTest(options["games"], concurrency, prefix)
+        try:
+            results = load_test.run()
+        finally:
+            if not options["keep"]:
+                Game.objects.filter(name__startswith=prefix).delete()
+                User.objects.filter(username__startswith=prefix).delete()
+
+        results = {
+            "commit": current_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            **results,
+        }
+        with open(options["output"], "w") as output:
+            json.dump(results, output, indent=2)
+
+        self.stdout.write(
+            f"{results['requests']} requests in {results['duration_seconds']:.2f}s, "
+            f"{results['requests_per_second']:.1f} req/s, "
+            f"{results['failed_games']} failed games"
+        )
+        for endpoint, stats in results["endpoints"].items():
+            latency = stats["latency_ms"]
+            self.stdout.write(
+                f"{endpoint:<14} {stats['requests_per_second']:>8.1f} req/s "
+                f"p50 {latency['p50']:>7.2f}ms p95 {latency['p95']:>7.2f}ms "
+                f"p99 {latency['p99']:>7.2f}ms "
+                f"{stats['queries_per_request']:>5.1f} queries/req "
+                f"{stats['errors']} errors"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
@@ -0,0 +1,96 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from game.lib import enginebench
+
+
+def board(value):
+    size, win_length = value.split(":")
+    return int(size), int(win_length)
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the bitboard engine agrees with the reference nested loop "
+        "engine on every reachable 3x3 position and random larger boards, then "
+        "time each engine per operation. No database is used."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--boards",
+            nargs="+",
+            type=board,
+            default=[(3, 3), (4, 3), (5, 4), (7, 5)],
+            help="Boards as size:win_length. 3:3 uses every reachable position.",
+        )
+        parser.add_argument(
+            "--random-positions",
+            type=int,
+            default=2000,
+            help="Random positions per board other than 3:3.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--output", help="File to write the JSON results to.")
+
+    def handle(self, *args, **options):
+        results = []
+        for size, win_length in options["boards"]:
+            if (size, win_length) == (3, 3):
+                positions = enginebench.reachable_positions()
+            else:
+                positions = enginebench.random_positions(
+                    size, win_length, options["random_positions"], options["seed"]
+                )
+            reference, *candidates = [
+                engine_class(size, win_length) for engine_class in enginebench.ENGINES
+            ]
+
+            for candidate in candidates:
+                found = enginebench.differences(candidate, reference, positions)
+                if found:
+                    position, operation, expected, got = found[0]
+                    raise CommandError(
+                        f"{candidate.name} disagrees on {len(found)} checks of "
+                        f"{size}x{size} k{win_length}, first {operation} on "
+                        f"{position}: expected {expected}, got {got}"
+                    )
+
+            timings = {}
+            for current in (reference, *candidates):
+                timings[current.name] = enginebench.benchmark_engine(
+                    current, positions, options["warmup"], options["repeat"]
+                )
+            results.append(
+                {
+                    "size": size,
+                    "win_length": win_length,
+                    "positions": len(positions),
+                    "engines": timings,
+                }
+            )
+            self.write_board(results[-1], reference.name)
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f"Results written to {options['output']}")
+            )
+
+    def write_board(self, result, reference_name):
+        self.stdout.write(
+            f"{result['size']}x{result['size']} k{result['win_length']}, "
+            f"{result['positions']} positions, engines agree"
+        )
+        reference = result["engines"][reference_name]
+        for name, timings in result["engines"].items():
+            cells = []
+            for operation, stats in timings.items():
+                speedup = reference[operation]["median_ns"] / stats["median_ns"]
+                cells.append(f"{operation} {stats['median_ns']:>8.0f}ns x{speedup:<5.1f}")
+            self.stdout.write(f"  {name:<10} " + "  ".join(cells))
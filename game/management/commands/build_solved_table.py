@@ -0,0 +1,38 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from game.lib import solved
+
+
+class Command(BaseCommand):
+    help = "Enumerate every legal 3x3 position and write the solved table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=str(settings.GAME_SOLVED_TABLE_PATH),
+            help="File to write the table to.",
+        )
+
+    def handle(self, *args, **options):
+        table = solved.build_table()
+        # Running workers have the table memory mapped: truncating it in
+        # place would change their pages under them, so a new file replaces it
+        path = options["path"]
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as table_file:
+                table_file.write(table)
+                table_file.flush()
+                os.fsync(table_file.fileno())
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+        positions = sum(1 for entry in table if entry != solved.NOT_LEGAL)
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {positions} positions to {path}")
+        )
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from game.lib import export
+from game.lib.constants import GameConstants
+from game.models import User
+
+
+class Command(BaseCommand):
+    help = "Stream games as NDJSON, finished and draw games by default."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--status",
+            choices=[choice for choice, _ in GameConstants.STATUS_CHOICES],
+            help="Only the games with this status.",
+        )
+        parser.add_argument("--user", help="Only the games played by this username.")
+        parser.add_argument("--min-id", type=int, help="Lowest game id exported.")
+        parser.add_argument("--max-id", type=int, help="Highest game id exported.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows fetched per database round trip.",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write the games to, the standard output by default.",
+        )
+
+    def handle(self, *args, **options):
+        user_id = None
+        if options["user"]:
+            user_id = (
+                User.objects.filter(username=options["user"])
+                .values_list("id", flat=True)
+                .first()
+            )
+            if user_id is None:
+                raise CommandError(f"User {options['user']} does not exist.")
+
+        games = export.games_to_export(
+            status=options["status"],
+            user_id=user_id,
+            min_id=options["min_id"],
+            max_id=options["max_id"],
+        )
+        lines = export.iter_ndjson(games, options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,47 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from game.lib import importer
+
+
+class Command(BaseCommand):
+    help = (
+        "Import games from NDJSON, as written by export_games, or CSV with the "
+        "same columns, and recompute the stats of the users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read the games from, - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=["ndjson", "csv"],
+            help="Format of the file, guessed from its extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.GAME_IMPORT_BATCH_SIZE,
+            help="Games inserted per bulk_create.",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"]
+        if file_format is None:
+            file_format = "csv" if options["path"].endswith(".csv") else "ndjson"
+        read = importer.read_csv if file_format == "csv" else importer.read_ndjson
+
+        if options["path"] == "-":
+            total = self.import_games(read(sys.stdin), options["batch_size"])
+        else:
+            with open(options["path"], newline="") as games_file:
+                total = self.import_games(read(games_file), options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {total} games"))
+
+    def import_games(self, records, batch_size):
+        try:
+            return importer.import_games(records, batch_size)
+        except (importer.GameImportError, ValueError) as error:
+            raise CommandError(str(error))
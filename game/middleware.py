@@ -0,0 +1,119 @@
+import cProfile
+import random
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from game.lib import memory, metrics, profiling
+
+
+class MetricsMiddleware:
+    """
+    Record the latency and the database queries of every request, labelled
+    with the URL name of the view.
+    """
+
+    def __init__(self, get_response):
+        if not settings.GAME_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = metrics.QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else "unmatched"
+        metrics.collector.observe(
+            (view, request.method, str(response.status_code)),
+            duration,
+            queries.count,
+            queries.duration,
+        )
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Run the requests sending the `GAME_PROFILING_HEADER` header, or a
+    `GAME_PROFILING_SAMPLE_RATE` share of them, under cProfile. Not loaded
+    at all unless `GAME_PROFILING_ENABLED` is set.
+    """
+
+    def __init__(self, get_response):
+        if not settings.GAME_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def wants_profile(self, request) -> bool:
+        if request.headers.get(settings.GAME_PROFILING_HEADER):
+            return True
+        rate = settings.GAME_PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if not self.wants_profile(request) or not profiling.profiling_lock.acquire(
+            blocking=False
+        ):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            response = profiler.runcall(self.get_response, request)
+            duration = time.perf_counter() - start
+        finally:
+            profiling.profiling_lock.release()
+
+        match = request.resolver_match
+        profile_id = profiling.save(
+            profiler,
+            {
+                "created_at": time.time(),
+                "view": match.url_name if match is not None else None,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": duration * 1000,
+            },
+        )
+        response["X-Profile-Id"] = profile_id
+        return response
+
+
+class AllocationMiddleware:
+    """
+    Count the memory allocated by every request with tracemalloc, started
+    here if it is not tracing yet. Not loaded at all unless
+    `GAME_ALLOCATIONS_ENABLED` is set. The counters are global to the
+    process, so requests served at the same time by other threads are
+    counted too.
+    """
+
+    def __init__(self, get_response):
+        if not settings.GAME_ALLOCATIONS_ENABLED:
+            raise MiddlewareNotUsed
+        if not memory.is_tracing():
+            memory.start(settings.GAME_TRACEMALLOC_FRAMES)
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not memory.is_tracing():
+            return self.get_response(request)
+
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        response = self.get_response(request)
+        after, peak = tracemalloc.get_traced_memory()
+
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else "unmatched"
+        memory.record_request(view, peak - before, after - before)
+        response["X-Allocated-Bytes"] = str(peak - before)
+        return response
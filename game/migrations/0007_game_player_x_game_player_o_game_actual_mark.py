@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0006_game_board_size_game_win_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='actual_mark',
+            field=models.CharField(choices=[('X', 'X'), ('O', 'O')], default='X', max_length=1),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='player_o',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='player_o', to='game.user'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='player_x',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='player_x', to='game.user'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:05
+
+from django.db import migrations
+
+
+def populate_player_slots(apps, schema_editor):
+    Game = apps.get_model("game", "Game")
+    UserGame = apps.get_model("game", "UserGame")
+
+    games = {}
+    for user_game in UserGame.objects.all().iterator():
+        game = games.setdefault(user_game.game_id, {})
+        game[user_game.mark] = user_game.user_id
+
+    for game in Game.objects.filter(id__in=games.keys()).iterator():
+        marks = games[game.id]
+        game.player_x_id = marks.get("X")
+        game.player_o_id = marks.get("O")
+        if game.actual_player_id == game.player_o_id and game.player_o_id:
+            game.actual_mark = "O"
+        else:
+            game.actual_mark = "X"
+        game.save(update_fields=["player_x", "player_o", "actual_mark"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0007_game_player_x_game_player_o_game_actual_mark"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_player_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0008_populate_game_player_slots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='is_bot',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0011_game_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='player_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+MARKS = ("X", "O")
+MAX_PLAYERS = 2
+BATCH_SIZE = 500
+
+
+def normalize_memberships(apps, schema_editor):
+    """
+    Keep the first `X` and the first `O` membership of each game, drop the
+    others left by concurrent joins (a third player has an empty mark) and
+    store the players left as `player_count`.
+    """
+    Game = apps.get_model("game", "Game")
+    UserGame = apps.get_model("game", "UserGame")
+
+    kept = {}
+    extra = []
+    for user_game in UserGame.objects.order_by("id").iterator():
+        slots = kept.setdefault(user_game.game_id, set())
+        if user_game.mark in MARKS and user_game.mark not in slots:
+            slots.add(user_game.mark)
+        else:
+            extra.append(user_game.id)
+    for start in range(0, len(extra), BATCH_SIZE):
+        UserGame.objects.filter(id__in=extra[start:start + BATCH_SIZE]).delete()
+
+    for game_id, slots in kept.items():
+        Game.objects.filter(id=game_id).update(
+            player_count=min(len(slots), MAX_PLAYERS)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0012_game_player_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_memberships, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="game",
+            constraint=models.CheckConstraint(
+                check=models.Q(("player_count__lte", 2)),
+                name="game_player_count_lte_max",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="usergame",
+            constraint=models.UniqueConstraint(
+                fields=("game", "mark"), name="usergame_unique_slot"
+            ),
+        ),
+    ]
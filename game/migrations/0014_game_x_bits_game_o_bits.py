@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0013_populate_game_player_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='o_bits',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='x_bits',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:11
+
+import json
+
+from django.db import migrations
+
+
+def board_to_bits(apps, schema_editor):
+    Game = apps.get_model("game", "Game")
+
+    for game in Game.objects.only("id", "board").iterator():
+        x_bits = o_bits = 0
+        cells = [cell for row in json.loads(game.board) for cell in row]
+        for index, cell in enumerate(cells):
+            if cell == "X":
+                x_bits |= 1 << index
+            elif cell == "O":
+                o_bits |= 1 << index
+        if x_bits or o_bits:
+            Game.objects.filter(id=game.id).update(x_bits=x_bits, o_bits=o_bits)
+
+
+def bits_to_board(apps, schema_editor):
+    Game = apps.get_model("game", "Game")
+
+    fields = ("id", "x_bits", "o_bits", "board_size")
+    for game in Game.objects.only(*fields).iterator():
+        board = []
+        for row in range(game.board_size):
+            cells = []
+            for col in range(game.board_size):
+                bit = 1 << (row * game.board_size + col)
+                if game.x_bits & bit:
+                    cells.append("X")
+                elif game.o_bits & bit:
+                    cells.append("O")
+                else:
+                    cells.append("")
+            board.append(cells)
+        Game.objects.filter(id=game.id).update(board=json.dumps(board))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0014_game_x_bits_game_o_bits"),
+    ]
+
+    operations = [
+        migrations.RunPython(board_to_bits, bits_to_board),
+    ]
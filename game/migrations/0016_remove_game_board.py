@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0015_populate_game_board_bits'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='game',
+            name='board',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0016_remove_game_board'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='moves',
+            field=models.BinaryField(default=b''),
+        ),
+    ]
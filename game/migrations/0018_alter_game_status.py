@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0017_game_moves'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='game',
+            name='status',
+            field=models.CharField(choices=[('WAITING', 'Waiting'), ('IN_GAME', 'In Game'), ('FINISHED', 'Finished'), ('DRAW', 'Draw')], default='WAITING', max_length=20),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:08
+
+from django.db import migrations
+from django.db.models import F
+
+# The rules as they were when this migration was written, copied so later
+# changes to game.lib.engine do not change what it does.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def win_masks(size, length):
+    masks = []
+    for row in range(size):
+        for col in range(size):
+            for step_row, step_col in DIRECTIONS:
+                end_row = row + step_row * (length - 1)
+                end_col = col + step_col * (length - 1)
+                if not (0 <= end_row < size and 0 <= end_col < size):
+                    continue
+                masks.append(
+                    sum(
+                        1 << ((row + step_row * i) * size + col + step_col * i)
+                        for i in range(length)
+                    )
+                )
+    return masks
+
+
+def is_draw(masks, cells, x_bits, o_bits, x_to_move):
+    """
+    Neither mark can still complete a line: every line holds the opponent
+    mark or needs more cells than the movements left.
+    """
+    empty = cells - bin(x_bits | o_bits).count("1")
+    x_moves = (empty + 1) // 2 if x_to_move else empty // 2
+    o_moves = empty - x_moves
+    for mask in masks:
+        if not mask & o_bits and bin(mask & ~x_bits).count("1") <= x_moves:
+            return False
+        if not mask & x_bits and bin(mask & ~o_bits).count("1") <= o_moves:
+            return False
+    return True
+
+
+def retire_drawn_games(apps, schema_editor):
+    Game = apps.get_model("game", "Game")
+    User = apps.get_model("game", "User")
+
+    fields = (
+        "id",
+        "x_bits",
+        "o_bits",
+        "board_size",
+        "win_length",
+        "actual_mark",
+        "player_x",
+        "player_o",
+    )
+    masks = {}
+    games = Game.objects.filter(status="IN_GAME").only(*fields)
+    for game in games.iterator():
+        rules = (game.board_size, game.win_length)
+        if rules not in masks:
+            masks[rules] = win_masks(*rules)
+        cells = game.board_size * game.board_size
+        if not is_draw(
+            masks[rules], cells, game.x_bits, game.o_bits, game.actual_mark == "X"
+        ):
+            continue
+        Game.objects.filter(id=game.id).update(
+            status="DRAW", actual_player=None, version=F("version") + 1
+        )
+        User.objects.filter(pk__in=(game.player_x_id, game.player_o_id)).update(
+            number_of_games=F("number_of_games") + 1
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0018_alter_game_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(retire_drawn_games, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:20
+
+from django.db import migrations
+
+BOT_USERNAME = "TicTacToeBot"
+
+
+def create_bot_user(apps, schema_editor):
+    """
+    Create the flagged bot user. When a player already registered its
+    username, the bot takes a numbered one.
+    """
+    User = apps.get_model("game", "User")
+    if User.objects.filter(is_bot=True).exists():
+        return
+
+    username = BOT_USERNAME
+    number = 1
+    while User.objects.filter(username=username).exists():
+        username = f"{BOT_USERNAME}{number}"
+        number += 1
+    User.objects.create(username=username, is_bot=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0019_retire_drawn_games"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_bot_user, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
-import json
-from typing import Optional
-from django.db import models
+from typing import Optional, Tuple
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
 
+from game.lib import ai, engine
 from game.lib.constants import GameConstants
 from game.lib import exceptions as game_exceptions
 
@@ -10,10 +11,22 @@ class User(models.Model):
     username = models.CharField(unique=True, blank=False, max_length=100)
     number_of_games = models.IntegerField(default=0, blank=False)
     points = models.IntegerField(default=0)
+    is_bot = models.BooleanField(default=False)
 
     def __str__(self):
         return self.username
 
+    @classmethod
+    def get_bot(cls) -> "User":
+        """
+        The server bot, found by its flag: its username could have been
+        registered by a player before it was reserved.
+        """
+        bot = cls.objects.filter(is_bot=True).order_by("id").first()
+        if bot is None:
+            bot = cls.objects.create(username=GameConstants.BOT_USERNAME, is_bot=True)
+        return bot
+
 
 class Game(models.Model):
     name = models.CharField(
@@ -24,9 +37,16 @@ class Game(models.Model):
         default=GameConstants.STATUS_WAITING,
         max_length=20,
     )
-    board = models.TextField(
-        default='[["","",""],["","",""],["","",""]]',
-        blank=None,
+    # One bit per cell, ``row * board_size + col``, see ``engine``
+    x_bits = models.BigIntegerField(default=0)
+    o_bits = models.BigIntegerField(default=0)
+    # Append only log of the movements, one byte each, see ``engine.encode_move``
+    moves = models.BinaryField(default=b"")
+    board_size = models.PositiveSmallIntegerField(
+        default=GameConstants.DEFAULT_BOARD_SIZE
+    )
+    win_length = models.PositiveSmallIntegerField(
+        default=GameConstants.DEFAULT_WIN_LENGTH
     )
     players = models.ManyToManyField(
         User,
@@ -51,10 +71,54 @@ class Game(models.Model):
         on_delete=models.SET_NULL,
         related_name="winner",
     )
+    player_x = models.ForeignKey(
+        User,
+        default=None,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="player_x",
+    )
+    player_o = models.ForeignKey(
+        User,
+        default=None,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="player_o",
+    )
+    actual_mark = models.CharField(
+        max_length=1,
+        choices=GameConstants.MARK_CHOICES,
+        default=GameConstants.MARK_X,
+    )
+    player_count = models.PositiveSmallIntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"], name="game_status_id_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(player_count__lte=GameConstants.MAX_PLAYERS),
+                name="game_player_count_lte_max",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.version += 1
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+
+    @property
+    def rules(self) -> engine.Rules:
+        return engine.get_rules(self.board_size, self.win_length)
+
     @property
     def check_status(self) -> Optional[bool]:
         if self.status != GameConstants.STATUS_IN_GAME:
@@ -64,88 +128,151 @@ class Game(models.Model):
         if self.actual_player.username != username:
             raise game_exceptions.NotUserTurnException
 
-    def check_movement(self, movement_x: int, movement_y: int) -> Optional[bool]:
-        decoded_board = json.loads(self.board)
-        if (
-            movement_x in GameConstants.VALID_POSITIONS
-            and movement_y in GameConstants.VALID_POSITIONS
-            and decoded_board[movement_x][movement_y] == ""
-        ):
-            mark = UserGame.objects.get(user=self.actual_player, game=self).mark
-            decoded_board[movement_x][movement_y] = mark
-            self.board = json.dumps(decoded_board)
-            self.save()
+    def join(self, user: User) -> None:
+        """
+        Take the free `O` slot and start the game with a single conditional
+        UPDATE, so concurrent joins can not fill the game twice.
+        """
+        if user.is_bot:
+            raise game_exceptions.BotPlayerException
+        if user.pk == self.player_x_id:
+            raise game_exceptions.AlreadyInGameException
+
+        with transaction.atomic():
+            joined = Game.objects.filter(
+                pk=self.pk,
+                status=GameConstants.STATUS_WAITING,
+                player_count__lt=GameConstants.MAX_PLAYERS,
+            ).update(
+                player_o=user,
+                player_count=F("player_count") + 1,
+                status=GameConstants.STATUS_IN_GAME,
+                actual_mark=GameConstants.MARK_X,
+                actual_player=F("player_x"),
+                version=F("version") + 1,
+            )
+            if not joined:
+                raise game_exceptions.FullGameStatusException
+            UserGame.objects.create(user=user, game=self, mark=GameConstants.MARK_O)
+
+        self.player_o = user
+        self.player_count += 1
+        self.status = GameConstants.STATUS_IN_GAME
+        self.actual_mark = GameConstants.MARK_X
+        self.actual_player = self.player_x
+        self.version += 1
+
+    def player_of(self, mark: str) -> Optional[User]:
+        if mark == GameConstants.MARK_X:
+            return self.player_x
+        return self.player_o
+
+    def best_movement(self) -> Optional[Tuple[int, int]]:
+        """
+        Best movement for the actual player as ``(movement_x, movement_y)``.
+        """
+        if self.actual_mark == GameConstants.MARK_X:
+            cell = ai.best_move(self.rules, self.x_bits, self.o_bits)
         else:
+            cell = ai.best_move(self.rules, self.o_bits, self.x_bits)
+        if cell is None:
+            return None
+        return divmod(cell, self.board_size)
+
+    def check_movement(self, movement_x: int, movement_y: int) -> int:
+        rules = self.rules
+        if not rules.is_valid_position(movement_x, movement_y):
             raise game_exceptions.NotValidPositionException
 
+        cell = rules.cell_index(movement_x, movement_y)
+        if not engine.is_empty(self.x_bits, self.o_bits, cell):
+            raise game_exceptions.NotValidPositionException
+
+        if self.actual_mark == GameConstants.MARK_X:
+            self.x_bits = engine.place(self.x_bits, cell)
+        else:
+            self.o_bits = engine.place(self.o_bits, cell)
+        self.moves = bytes(self.moves) + bytes(
+            (engine.encode_move(cell, self.actual_mark),)
+        )
+        return cell
+
     @property
     def change_player(self):
-        self.actual_player = self.players.exclude(
-            username=self.actual_player.username
-        ).first()
-        self.save()
+        if self.actual_mark == GameConstants.MARK_X:
+            self.actual_mark = GameConstants.MARK_O
+        else:
+            self.actual_mark = GameConstants.MARK_X
+        self.actual_player = self.player_of(self.actual_mark)
 
-    @property
-    def check_winner(self) -> Optional[bool]:
-        decoded_board = json.loads(self.board)
-        actual_mark = UserGame.objects.get(user=self.actual_player, game=self).mark
-
-        # Check horizontal
-        for row in range(len(decoded_board)):
-            winner = True
-            for col in range(len(decoded_board)):
-                if decoded_board[row][col] != actual_mark:
-                    winner = False
-                    break
-            if winner:
-                self.status = GameConstants.STATUS_FINISHED
-                self.winner = self.actual_player
-                self.save()
-                return True
-
-        # Check vertical
-        for row in range(len(decoded_board)):
-            winner = True
-            for col in range(len(decoded_board)):
-                if decoded_board[col][row] != actual_mark:
-                    winner = False
-                    break
-            if winner:
-                self.status = GameConstants.STATUS_FINISHED
-                self.winner = self.actual_player
-                self.save()
-                return True
-
-        # Check diagonals
-        winner = True
-        for row in range(len(decoded_board)):
-            if decoded_board[row][row] != actual_mark:
-                winner = False
-                break
-        if winner:
-            self.status = GameConstants.STATUS_FINISHED
-            self.winner = self.actual_player
-            self.save()
-            return True
+    def check_winner(self, cell: Optional[int] = None) -> Optional[bool]:
+        if self.actual_mark == GameConstants.MARK_X:
+            bits = self.x_bits
+        else:
+            bits = self.o_bits
 
-        winner = True
-        for row in range(len(decoded_board)):
-            if decoded_board[row][len(decoded_board) - 1 - row] != actual_mark:
-                winner = False
-                break
-        if winner:
-            self.status = GameConstants.STATUS_FINISHED
-            self.winner = self.actual_player
-            self.winner.points += 1
-            self.actual_player = None
-            self.save()
-            for user in self.players.all():
-                user.number_of_games += 1
-                user.save()
+        if self.rules.has_won(bits, cell):
+            self.finish(winner=self.actual_player)
             return True
         else:
             self.change_player
 
+    def check_draw(self) -> bool:
+        """
+        Finish the game as a draw once no line can be completed. Expected to
+        run after the turn changed.
+        """
+        x_to_move = self.actual_mark == GameConstants.MARK_X
+        if not self.rules.is_draw(self.x_bits, self.o_bits, x_to_move):
+            return False
+
+        self.finish()
+        return True
+
+    def finish(self, winner: Optional[User] = None) -> None:
+        """
+        Finish the game, won by ``winner`` or drawn, and count it in the stats
+        of both players with a single UPDATE. The game row is written by the
+        caller, inside the same transaction.
+        """
+        self.status = (
+            GameConstants.STATUS_FINISHED
+            if winner is not None
+            else GameConstants.STATUS_DRAW
+        )
+        self.winner = winner
+        self.actual_player = None
+
+        stats = {"number_of_games": F("number_of_games") + 1}
+        if winner is not None:
+            stats["points"] = F("points") + Case(
+                When(pk=winner.pk, then=Value(1)), default=Value(0)
+            )
+        User.objects.filter(pk__in=(self.player_x_id, self.player_o_id)).update(
+            **stats
+        )
+
+    def play(self, movement_x: int, movement_y: int) -> Optional[bool]:
+        """
+        Apply a movement of the actual player in memory, answer it right away
+        when the opponent is the bot, and write the game row once. Returns
+        whether the game finished. Expected to run inside a transaction
+        holding the row lock.
+        """
+        cell = self.check_movement(movement_x, movement_y)
+        finished = self.check_winner(cell) or self.check_draw()
+        if (
+            not finished
+            and self.actual_player is not None
+            and self.actual_player.is_bot
+        ):
+            movement = self.best_movement()
+            if movement is not None:
+                cell = self.check_movement(*movement)
+                finished = self.check_winner(cell) or self.check_draw()
+        self.save()
+        return finished
+
 
 class UserGame(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -159,3 +286,8 @@ class UserGame(models.Model):
 
     class Meta:
         unique_together = ("user", "game")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "mark"], name="usergame_unique_slot"
+            ),
+        ]
@@ -1,18 +1,58 @@
+from typing import List, Optional
+
 from rest_framework import serializers
 
-from game.serializers.user import UserInputSerializer
+from game.lib import engine
+from game.lib.constants import GameConstants
+from game.serializers.user import UserInputSerializer, validate_not_bot_username
+
+
+class BoardField(serializers.Field):
+    """
+    Render the packed ``x_bits``/``o_bits`` columns of a game as the JSON
+    nested list board the API has always returned.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, game):
+        return engine.encode_board(game.x_bits, game.o_bits, game.board_size)
 
 
 class GameUpdateInputSerializer(serializers.Serializer):
-    username = serializers.CharField(max_length=100)
+    username = serializers.CharField(
+        max_length=100, validators=[validate_not_bot_username]
+    )
 
 
 class GameInputSerializer(GameUpdateInputSerializer):
     name = serializers.CharField(max_length=100)
+    board_size = serializers.IntegerField(
+        default=GameConstants.DEFAULT_BOARD_SIZE,
+        min_value=GameConstants.MIN_BOARD_SIZE,
+        max_value=GameConstants.MAX_BOARD_SIZE,
+    )
+    win_length = serializers.IntegerField(
+        default=GameConstants.DEFAULT_WIN_LENGTH,
+        min_value=GameConstants.MIN_WIN_LENGTH,
+    )
+    against_bot = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        if data["win_length"] > data["board_size"]:
+            raise serializers.ValidationError(
+                "win_length can not be greater than board_size."
+            )
+        return data
 
 
 class UserPlayGameInputSerializer(serializers.Serializer):
-    username = serializers.CharField(max_length=100)
+    username = serializers.CharField(
+        max_length=100, validators=[validate_not_bot_username]
+    )
     movement_x = serializers.IntegerField()
     movement_y = serializers.IntegerField()
 
@@ -31,9 +71,95 @@ class InitGameSerializer(GameCreatedSerializer):
 
 
 class GameSerializer(InitGameSerializer):
-    board = serializers.CharField(max_length=256, read_only=True)
+    board = BoardField()
+    board_size = serializers.IntegerField(read_only=True)
+    win_length = serializers.IntegerField(read_only=True)
     winner = UserInputSerializer(read_only=True)
 
 
 class GameFinishedSerializer(AvailableGameSerializer):
     winner = UserInputSerializer(read_only=True)
+
+
+# Plain dict versions of the serializers above for the game state hot path.
+# They give the same output as the DRF classes, which are kept as the
+# reference and checked against them in the tests.
+
+
+def _user_data(user) -> Optional[dict]:
+    return None if user is None else {"username": str(user.username)}
+
+
+def _players_data(game) -> List[dict]:
+    # `all()` uses the players prefetched by the list endpoints
+    return [{"username": str(player.username)} for player in game.players.all()]
+
+
+def game_created_data(game) -> dict:
+    """
+    Same output as `GameCreatedSerializer(game).data`.
+    """
+    return {
+        "name": str(game.name),
+        "status": str(game.status),
+        "players": _players_data(game),
+    }
+
+
+def init_game_data(game) -> dict:
+    """
+    Same output as `InitGameSerializer(game).data`.
+    """
+    data = game_created_data(game)
+    data["actual_player"] = _user_data(game.actual_player)
+    return data
+
+
+def game_data(game) -> dict:
+    """
+    Same output as `GameSerializer(game).data`.
+    """
+    data = init_game_data(game)
+    data["board"] = engine.encode_board(game.x_bits, game.o_bits, game.board_size)
+    data["board_size"] = int(game.board_size)
+    data["win_length"] = int(game.win_length)
+    data["winner"] = _user_data(game.winner)
+    return data
+
+
+def game_finished_data(game) -> dict:
+    """
+    Same output as `GameFinishedSerializer(game).data`.
+    """
+    return {
+        "name": str(game.name),
+        "status": str(game.status),
+        "winner": _user_data(game.winner),
+    }
+
+
+class HintSerializer(serializers.Serializer):
+    movement_x = serializers.IntegerField(read_only=True)
+    movement_y = serializers.IntegerField(read_only=True)
+    actual_mark = serializers.CharField(max_length=1, read_only=True)
+
+
+class ReplayInputSerializer(serializers.Serializer):
+    ply = serializers.IntegerField(min_value=0, required=False)
+
+
+class ReplaySerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100, read_only=True)
+    ply = serializers.IntegerField(read_only=True)
+    plies = serializers.IntegerField(read_only=True)
+    board = serializers.CharField(read_only=True)
+    movement_x = serializers.IntegerField(read_only=True, allow_null=True)
+    movement_y = serializers.IntegerField(read_only=True, allow_null=True)
+    mark = serializers.CharField(max_length=1, read_only=True, allow_null=True)
+
+
+class ExportInputSerializer(serializers.Serializer):
+    status = serializers.CharField(max_length=20, required=False)
+    username = serializers.CharField(max_length=100, required=False)
+    min_id = serializers.IntegerField(min_value=1, required=False)
+    max_id = serializers.IntegerField(min_value=1, required=False)
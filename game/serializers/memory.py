@@ -0,0 +1,6 @@
+from rest_framework import serializers
+
+
+class MemoryInputSerializer(serializers.Serializer):
+    frames = serializers.IntegerField(min_value=1, max_value=100, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=20)
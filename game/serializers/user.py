@@ -1,11 +1,41 @@
 from rest_framework import serializers
 
+from game.lib.constants import GameConstants
+from game.models import User
+
+
+def validate_not_bot_username(username: str) -> str:
+    """
+    Reject the username of the server bot. Until the bot exists its default
+    username is reserved.
+    """
+    bot_usernames = [
+        bot_username.casefold()
+        for bot_username in User.objects.filter(is_bot=True).values_list(
+            "username", flat=True
+        )
+    ] or [GameConstants.BOT_USERNAME.casefold()]
+    if username.casefold() in bot_usernames:
+        raise serializers.ValidationError("This username is reserved for the server bot.")
+    return username
+
 
 class UserInputSerializer(serializers.Serializer):
-    username = serializers.CharField(max_length=100, read_only=False)
+    username = serializers.CharField(
+        max_length=100, read_only=False, validators=[validate_not_bot_username]
+    )
 
 
 class UserSerializer(serializers.Serializer):
     username = serializers.CharField(max_length=100)
     number_of_games = serializers.IntegerField()
     points = serializers.IntegerField()
+
+
+class UserGamesSummarySerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    waiting = serializers.IntegerField()
+    in_game = serializers.IntegerField()
+    finished = serializers.IntegerField()
+    draw = serializers.IntegerField()
+    won = serializers.IntegerField()
@@ -1,9 +1,69 @@
 import json
+import os
+import traceback
+
 import pytest
+from django.core.cache import cache
+from django.db import connections
 from rest_framework.test import APIClient
 
+import game
+from game.lib import engine, matchmaking, memory, metrics, profiling
 from game.lib.constants import GameConstants
-from game.models import Game, User, UserGame
+from game.models import Game, User
+
+GAME_DIR = os.path.dirname(game.__file__) + os.sep
+TESTS_DIR = os.path.dirname(__file__) + os.sep
+
+
+class QueryBudget:
+    """
+    Fail the test when the block runs more than ``budget`` queries,
+    reporting every query with the frames of the app that ran it.
+    """
+
+    def __init__(self, budget, using="default"):
+        self.budget = budget
+        self.connection = connections[using]
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params, self.call_sites()))
+        return execute(sql, params, many, context)
+
+    @staticmethod
+    def call_sites():
+        return [
+            f"{frame.filename[len(GAME_DIR):]}:{frame.lineno} in {frame.name}"
+            for frame in traceback.extract_stack()
+            if frame.filename.startswith(GAME_DIR)
+            and not frame.filename.startswith(TESTS_DIR)
+        ]
+
+    def __enter__(self):
+        self.wrapper = self.connection.execute_wrapper(self)
+        self.wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.wrapper.__exit__(exc_type, exc_value, exc_traceback)
+        if exc_type is None and len(self.queries) > self.budget:
+            pytest.fail(self.report(), pytrace=False)
+
+    def report(self):
+        lines = [f"{len(self.queries)} queries run, the budget is {self.budget}:"]
+        for number, (sql, params, call_sites) in enumerate(self.queries, 1):
+            lines.append(f"{number}. {sql}")
+            if params:
+                lines.append(f"   params: {params}")
+            for call_site in reversed(call_sites):
+                lines.append(f"   at game/{call_site}")
+        return "\n".join(lines)
+
+
+@pytest.fixture
+def query_budget():
+    return QueryBudget
 
 
 @pytest.fixture
@@ -11,6 +71,39 @@ def client():
     return APIClient()
 
 
+@pytest.fixture(autouse=True)
+def waiting_games():
+    yield matchmaking.waiting_games
+    matchmaking.waiting_games.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def metrics_collector(settings, tmp_path):
+    settings.GAME_METRICS_DIR = tmp_path / "metrics"
+    yield metrics.collector
+    metrics.collector.reset()
+
+
+@pytest.fixture
+def profiling_enabled(settings, tmp_path):
+    settings.GAME_PROFILING_ENABLED = True
+    settings.GAME_PROFILING_DIR = tmp_path / "profiles"
+    return profiling.profiles_directory()
+
+
+@pytest.fixture
+def tracing(settings):
+    settings.GAME_TRACEMALLOC_FRAMES = 10
+    yield memory
+    memory.stop()
+
+
 @pytest.fixture
 @pytest.mark.django_db
 def user():
@@ -35,15 +128,13 @@ def game_with_one_player(user):
     game = Game.objects.create(
         name="Medium",
         status=GameConstants.STATUS_WAITING,
+        player_x=user,
+        player_count=1,
     )
     game.actual_player = user
-    game.players.add(user)
+    game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
     game.save()
 
-    user_game = UserGame.objects.get(user=user, game=game)
-    user_game.mark = GameConstants.MARK_X
-    user_game.save()
-
     return game
 
 
@@ -53,19 +144,15 @@ def game_with_two_players(user, user_master):
     game = Game.objects.create(
         name="Play",
         status=GameConstants.STATUS_IN_GAME,
+        player_x=user,
+        player_o=user_master,
+        player_count=2,
     )
-    game.players.add(user)
-    game.players.add(user_master)
+    game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
+    game.players.add(user_master, through_defaults={"mark": GameConstants.MARK_O})
     game.actual_player = user
     game.save()
 
-    user_game = UserGame.objects.get(user=user, game=game)
-    user_game.mark = GameConstants.MARK_X
-    user_game.save()
-    user_master_game = UserGame.objects.get(user=user_master, game=game)
-    user_master_game.mark = GameConstants.MARK_O
-    user_master_game.save()
-
     return game
 
 
@@ -75,26 +162,25 @@ def game_with_two_players_and_last_turn_to_win_horizontal(user, user_master):
     game = Game.objects.create(
         name="Play",
         status=GameConstants.STATUS_IN_GAME,
+        player_x=user,
+        player_o=user_master,
+        player_count=2,
     )
-    game.players.add(user)
-    game.players.add(user_master)
+    game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
+    game.players.add(user_master, through_defaults={"mark": GameConstants.MARK_O})
     game.actual_player = user_master
-    game.board = json.dumps(
-        [
-            [GameConstants.MARK_O, GameConstants.MARK_O, ""],
-            ["", "", ""],
-            [GameConstants.MARK_X, GameConstants.MARK_X, ""],
-        ]
+    game.actual_mark = GameConstants.MARK_O
+    game.x_bits, game.o_bits = engine.decode_board(
+        json.dumps(
+            [
+                [GameConstants.MARK_O, GameConstants.MARK_O, ""],
+                ["", "", ""],
+                [GameConstants.MARK_X, GameConstants.MARK_X, ""],
+            ]
+        )
     )
     game.save()
 
-    user_game = UserGame.objects.get(user=user, game=game)
-    user_game.mark = GameConstants.MARK_X
-    user_game.save()
-    user_master_game = UserGame.objects.get(user=user_master, game=game)
-    user_master_game.mark = GameConstants.MARK_O
-    user_master_game.save()
-
     return game
 
 
@@ -104,26 +190,25 @@ def game_with_two_players_and_last_turn_to_win_vertical(user, user_master):
     game = Game.objects.create(
         name="Play",
         status=GameConstants.STATUS_IN_GAME,
+        player_x=user,
+        player_o=user_master,
+        player_count=2,
     )
-    game.players.add(user)
-    game.players.add(user_master)
+    game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
+    game.players.add(user_master, through_defaults={"mark": GameConstants.MARK_O})
     game.actual_player = user_master
-    game.board = json.dumps(
-        [
-            [GameConstants.MARK_O, "", ""],
-            [GameConstants.MARK_O, "", ""],
-            ["", GameConstants.MARK_X, GameConstants.MARK_X],
-        ]
+    game.actual_mark = GameConstants.MARK_O
+    game.x_bits, game.o_bits = engine.decode_board(
+        json.dumps(
+            [
+                [GameConstants.MARK_O, "", ""],
+                [GameConstants.MARK_O, "", ""],
+                ["", GameConstants.MARK_X, GameConstants.MARK_X],
+            ]
+        )
     )
     game.save()
 
-    user_game = UserGame.objects.get(user=user, game=game)
-    user_game.mark = GameConstants.MARK_X
-    user_game.save()
-    user_master_game = UserGame.objects.get(user=user_master, game=game)
-    user_master_game.mark = GameConstants.MARK_O
-    user_master_game.save()
-
     return game
 
 
@@ -133,30 +218,29 @@ def game_with_two_players_and_last_turn_to_win_diagonal_1(user, user_master):
     game = Game.objects.create(
         name="Play",
         status=GameConstants.STATUS_IN_GAME,
+        player_x=user,
+        player_o=user_master,
+        player_count=2,
     )
-    game.players.add(user)
-    game.players.add(user_master)
+    game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
+    game.players.add(user_master, through_defaults={"mark": GameConstants.MARK_O})
     game.actual_player = user_master
-    game.board = json.dumps(
-        [
+    game.actual_mark = GameConstants.MARK_O
+    game.x_bits, game.o_bits = engine.decode_board(
+        json.dumps(
             [
-                GameConstants.MARK_O,
-                GameConstants.MARK_X,
-                GameConstants.MARK_X,
-            ],
-            ["", GameConstants.MARK_O, ""],
-            ["", "", ""],
-        ]
+                [
+                    GameConstants.MARK_O,
+                    GameConstants.MARK_X,
+                    GameConstants.MARK_X,
+                ],
+                ["", GameConstants.MARK_O, ""],
+                ["", "", ""],
+            ]
+        )
     )
     game.save()
 
-    user_game = UserGame.objects.get(user=user, game=game)
-    user_game.mark = GameConstants.MARK_X
-    user_game.save()
-    user_master_game = UserGame.objects.get(user=user_master, game=game)
-    user_master_game.mark = GameConstants.MARK_O
-    user_master_game.save()
-
     return game
 
 
@@ -166,28 +250,58 @@ def game_with_two_players_and_last_turn_to_win_diagonal_2(user, user_master):
     game = Game.objects.create(
         name="Play",
         status=GameConstants.STATUS_IN_GAME,
+        player_x=user,
+        player_o=user_master,
+        player_count=2,
     )
-    game.players.add(user)
-    game.players.add(user_master)
+    game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
+    game.players.add(user_master, through_defaults={"mark": GameConstants.MARK_O})
     game.actual_player = user_master
-    game.board = json.dumps(
-        [
+    game.actual_mark = GameConstants.MARK_O
+    game.x_bits, game.o_bits = engine.decode_board(
+        json.dumps(
             [
-                GameConstants.MARK_X,
-                GameConstants.MARK_X,
-                GameConstants.MARK_O,
-            ],
-            ["", GameConstants.MARK_O, ""],
-            ["", "", ""],
-        ]
+                [
+                    GameConstants.MARK_X,
+                    GameConstants.MARK_X,
+                    GameConstants.MARK_O,
+                ],
+                ["", GameConstants.MARK_O, ""],
+                ["", "", ""],
+            ]
+        )
     )
     game.save()
 
-    user_game = UserGame.objects.get(user=user, game=game)
-    user_game.mark = GameConstants.MARK_X
-    user_game.save()
-    user_master_game = UserGame.objects.get(user=user_master, game=game)
-    user_master_game.mark = GameConstants.MARK_O
-    user_master_game.save()
+    return game
+
+
+@pytest.fixture
+@pytest.mark.django_db
+def game_with_two_players_and_last_turn_to_draw(user, user_master):
+    game = Game.objects.create(
+        name="Play",
+        status=GameConstants.STATUS_IN_GAME,
+        player_x=user,
+        player_o=user_master,
+        player_count=2,
+    )
+    game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
+    game.players.add(user_master, through_defaults={"mark": GameConstants.MARK_O})
+    game.actual_player = user
+    game.x_bits, game.o_bits = engine.decode_board(
+        json.dumps(
+            [
+                [
+                    GameConstants.MARK_X,
+                    GameConstants.MARK_X,
+                    GameConstants.MARK_O,
+                ],
+                [GameConstants.MARK_O, "", GameConstants.MARK_X],
+                ["", "", GameConstants.MARK_O],
+            ]
+        )
+    )
+    game.save()
 
     return game
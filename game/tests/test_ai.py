@@ -0,0 +1,70 @@
+from game.lib import ai, engine
+
+
+def cells(*indexes):
+    bits = 0
+    for index in indexes:
+        bits |= 1 << index
+    return bits
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = ai.LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+class TestSearch:
+    def setup_method(self):
+        self.rules = engine.get_rules(3, 3)
+
+    def test_canonical_key_folds_symmetries(self):
+        corners = [0, 2, 6, 8]
+        keys = {
+            ai.canonical_key(self.rules, cells(corner), cells(4)) for corner in corners
+        }
+
+        assert len(keys) == 1
+
+    def test_best_move_wins(self):
+        me = cells(0, 1)
+        opp = cells(3, 4)
+
+        assert ai.best_move(self.rules, me, opp) == 2
+
+    def test_best_move_blocks(self):
+        me = cells(0)
+        opp = cells(3, 4)
+
+        assert ai.best_move(self.rules, me, opp) == 5
+
+    def test_best_move_full_board(self):
+        me = cells(0, 2, 3, 7, 8)
+        opp = cells(1, 4, 5, 6)
+
+        assert ai.best_move(self.rules, me, opp) is None
+
+    def test_perfect_play_is_a_draw(self):
+        me, opp = 0, 0
+        while True:
+            cell = ai.best_move(self.rules, me, opp)
+            if cell is None:
+                break
+            me = engine.place(me, cell)
+            assert not self.rules.has_won(me)
+            me, opp = opp, me
+
+    def test_larger_board_takes_the_win(self):
+        rules = engine.get_rules(5, 4)
+        me = cells(0, 1, 2)
+        opp = cells(5, 6, 7)
+
+        assert ai.best_move(rules, me, opp, max_depth=3, time_budget=1) == 3
@@ -0,0 +1,118 @@
+import json
+
+from game.lib import engine
+from game.lib.constants import GameConstants
+
+
+class TestEngine:
+    def test_decode_board(self):
+        board = json.dumps(
+            [
+                [GameConstants.MARK_X, "", ""],
+                ["", GameConstants.MARK_O, ""],
+                ["", "", GameConstants.MARK_X],
+            ]
+        )
+        x_bits, o_bits = engine.decode_board(board)
+
+        assert x_bits == (1 << 0) | (1 << 8)
+        assert o_bits == 1 << 4
+
+    def test_decode_empty_board(self):
+        assert engine.decode_board('[["","",""],["","",""],["","",""]]') == (0, 0)
+
+    def test_encode_board_matches_json(self):
+        x_bits = (1 << 0) | (1 << 5)
+        o_bits = 1 << 7
+        expected = json.dumps(
+            [
+                [GameConstants.MARK_X, "", ""],
+                ["", "", GameConstants.MARK_X],
+                ["", GameConstants.MARK_O, ""],
+            ]
+        )
+
+        assert engine.encode_board(x_bits, o_bits) == expected
+        assert engine.decode_board(expected) == (x_bits, o_bits)
+
+    def test_is_empty(self):
+        assert engine.is_empty(1, 2, 2) is True
+        assert engine.is_empty(1, 2, 0) is False
+        assert engine.is_empty(1, 2, 1) is False
+
+    def test_is_valid_position(self):
+        rules = engine.get_rules(3, 3)
+
+        assert rules.is_valid_position(0, 2)
+        assert not rules.is_valid_position(3, 0)
+        assert not rules.is_valid_position(0, -1)
+
+    def test_has_won(self):
+        rules = engine.get_rules(3, 3)
+
+        assert len(rules.win_masks) == 8
+        for mask in rules.win_masks:
+            assert rules.has_won(mask)
+        assert not rules.has_won((1 << 0) | (1 << 1) | (1 << 5))
+
+    def test_has_won_through_cell(self):
+        rules = engine.get_rules(3, 3)
+        bits = (1 << 2) | (1 << 4) | (1 << 6)
+
+        assert rules.has_won(bits, cell=4)
+        assert not rules.has_won(bits, cell=0)
+
+    def test_is_draw_on_full_board(self):
+        rules = engine.get_rules(3, 3)
+        # X O X / X O O / O X X
+        x_bits = (1 << 0) | (1 << 2) | (1 << 3) | (1 << 7) | (1 << 8)
+        o_bits = (1 << 1) | (1 << 4) | (1 << 5) | (1 << 6)
+
+        assert rules.is_draw(x_bits, o_bits, x_to_move=False)
+
+    def test_is_draw_before_full_board(self):
+        rules = engine.get_rules(3, 3)
+        # X X O / O _ X / _ _ O, X can still complete the middle column
+        x_bits = (1 << 0) | (1 << 1) | (1 << 5)
+        o_bits = (1 << 2) | (1 << 3) | (1 << 8)
+
+        assert not rules.is_draw(x_bits, o_bits, x_to_move=True)
+        # X X O / O _ X / X _ O, the middle column needs two X movements
+        assert rules.is_draw(x_bits | (1 << 6), o_bits, x_to_move=False)
+
+    def test_is_not_draw_with_open_lines(self):
+        assert not engine.get_rules(3, 3).is_draw(1 << 4, 1 << 0, x_to_move=True)
+
+    def test_rules_are_cached(self):
+        assert engine.get_rules(4, 3) is engine.get_rules(4, 3)
+
+    def test_larger_board_lines(self):
+        rules = engine.get_rules(4, 3)
+        # 2 per row, 2 per column and 4 per diagonal direction
+        assert len(rules.win_masks) == 8 + 8 + 4 + 4
+        assert rules.has_won((1 << 5) | (1 << 10) | (1 << 15))
+        assert not rules.has_won((1 << 0) | (1 << 1) | (1 << 3))
+
+    def test_empty_board(self):
+        board = engine.get_rules(4, 4).empty_board()
+
+        assert json.loads(board) == [["", "", "", ""] for _ in range(4)]
+
+    def test_encode_move(self):
+        assert engine.encode_move(4, GameConstants.MARK_X) == 4
+        assert engine.encode_move(4, GameConstants.MARK_O) == 0x84
+        assert engine.decode_move(0x84) == (4, GameConstants.MARK_O)
+        assert engine.decode_move(48) == (48, GameConstants.MARK_X)
+
+    def test_replay(self):
+        moves = bytes(
+            (
+                engine.encode_move(4, GameConstants.MARK_X),
+                engine.encode_move(0, GameConstants.MARK_O),
+                engine.encode_move(8, GameConstants.MARK_X),
+            )
+        )
+
+        assert engine.replay(b"") == (0, 0)
+        assert engine.replay(moves[:2]) == (1 << 4, 1 << 0)
+        assert engine.replay(moves) == ((1 << 4) | (1 << 8), 1 << 0)
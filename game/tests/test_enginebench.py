@@ -0,0 +1,95 @@
+import json
+
+from django.core.management import call_command
+
+from game.lib import enginebench
+
+
+class BrokenEngine(enginebench.BitboardEngine):
+    name = "broken"
+
+    def has_won(self, position, mark):
+        return False
+
+
+class CountingDrawEngine(enginebench.BitboardEngine):
+    name = "counting"
+
+    def is_draw(self, position, x_to_move):
+        # Ignores whose turn it is, giving both marks every movement left
+        empty = self.rules.cells - bin(position[0] | position[1]).count("1")
+        for mask in self.rules.win_masks:
+            for own, opponent in ((position[0], position[1]), (position[1], position[0])):
+                if not mask & opponent and bin(mask & ~own).count("1") <= empty:
+                    return False
+        return True
+
+
+class TestEngineBench:
+    def test_reachable_positions(self):
+        assert len(enginebench.reachable_positions()) == 5478
+
+    def test_bitboard_agrees_on_reachable_positions(self):
+        positions = enginebench.reachable_positions()
+        reference = enginebench.ReferenceEngine(3, 3)
+        candidate = enginebench.BitboardEngine(3, 3)
+
+        assert enginebench.differences(candidate, reference, positions) == []
+
+    def test_bitboard_agrees_on_random_positions(self):
+        for size, win_length in ((4, 3), (7, 5)):
+            positions = enginebench.random_positions(size, win_length, 200, seed=1)
+            reference = enginebench.ReferenceEngine(size, win_length)
+            candidate = enginebench.BitboardEngine(size, win_length)
+
+            assert enginebench.differences(candidate, reference, positions) == []
+
+    def test_differences_are_found(self):
+        positions = enginebench.reachable_positions()
+        found = enginebench.differences(
+            BrokenEngine(3, 3), enginebench.ReferenceEngine(3, 3), positions
+        )
+
+        assert found
+        assert {operation for _, operation, _, _ in found} <= {"has_won X", "has_won O"}
+
+    def test_draw_rule_errors_are_found(self):
+        found = enginebench.differences(
+            CountingDrawEngine(3, 3),
+            enginebench.ReferenceEngine(3, 3),
+            enginebench.reachable_positions(),
+        )
+
+        assert found
+        assert {operation for _, operation, _, _ in found} == {"is_draw"}
+
+    def test_draws_are_not_searched_on_big_boards(self):
+        [position] = enginebench.random_positions(7, 5, 1)
+        operations = dict(enginebench.operations(enginebench.ReferenceEngine(7, 5), position))
+
+        assert "is_draw" not in operations
+        assert "has_won X" in operations
+
+    def test_benchmark_engine(self):
+        positions = enginebench.random_positions(4, 3, 10)
+        timings = enginebench.benchmark_engine(
+            enginebench.BitboardEngine(4, 3), positions, warmup=0, repeat=2
+        )
+
+        assert set(timings) == {"prepare", "is_valid", "has_won", "is_draw"}
+        assert timings["is_valid"]["calls"] == 10 * 16
+        assert timings["has_won"]["min_ns"] > 0
+
+    def test_command(self, tmp_path):
+        path = tmp_path / "engine.json"
+        call_command(
+            "benchmark_engine",
+            boards=[(4, 3)],
+            random_positions=20,
+            repeat=2,
+            output=str(path),
+        )
+
+        results = json.loads(path.read_text())
+        assert results[0]["positions"] == 20
+        assert set(results[0]["engines"]) == {"reference", "bitboard"}
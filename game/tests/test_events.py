@@ -0,0 +1,126 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+
+from game.lib import exceptions as game_exceptions
+from game.lib.broadcast import GameBroadcaster, broadcaster
+from game.lib.constants import GameConstants
+from game.views.events import GameEvents
+
+
+class TestGameBroadcaster:
+    def test_publish_from_other_thread(self):
+        game_broadcaster = GameBroadcaster(queue_size=2)
+
+        async def listen():
+            queue = game_broadcaster.subscribe("Play")
+            thread = threading.Thread(
+                target=game_broadcaster.publish, args=("Play", "state")
+            )
+            thread.start()
+            thread.join()
+            payload = await asyncio.wait_for(queue.get(), timeout=1)
+            game_broadcaster.unsubscribe("Play", queue)
+            return payload
+
+        assert asyncio.run(listen()) == "state"
+        assert not game_broadcaster.has_subscribers("Play")
+
+    def test_publish_without_subscribers(self):
+        assert GameBroadcaster(queue_size=2).publish("Play", "state") == 0
+
+    def test_slow_subscriber_keeps_latest_states(self):
+        game_broadcaster = GameBroadcaster(queue_size=2)
+
+        async def listen():
+            queue = game_broadcaster.subscribe("Play")
+            for payload in ("first", "second", "third"):
+                game_broadcaster.publish("Play", payload)
+            await asyncio.sleep(0)
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        assert asyncio.run(listen()) == ["second", "third"]
+
+
+@pytest.mark.django_db
+class TestGameEvents:
+    def get_response(self, name):
+        url = reverse("game:game-events", kwargs={"name": name})
+        request = AsyncRequestFactory().get(url)
+        return async_to_sync(GameEvents.as_view())(request, name=name)
+
+    def test_events_raise_game_not_found(self):
+        response = self.get_response("false game")
+
+        assert response.status_code == 404
+        assert (
+            json.loads(response.content)["detail"]
+            == game_exceptions.GameNotFoundException.default_detail
+        )
+
+    def test_events_refused_under_wsgi(self, client, game_with_two_players):
+        url = reverse("game:game-events", kwargs={"name": game_with_two_players.name})
+        response = client.get(url)
+
+        assert response.status_code == 501
+        assert (
+            response.json()["detail"]
+            == game_exceptions.ASGIRequiredException.default_detail
+        )
+        assert not broadcaster.has_subscribers(game_with_two_players.name)
+
+    def test_events_stream(self, game_with_two_players):
+        response = self.get_response(game_with_two_players.name)
+
+        async def read():
+            events = response.streaming_content.__aiter__()
+            first = await events.__anext__()
+            broadcaster.publish(game_with_two_players.name, '{"status": "FINISHED"}')
+            second = await events.__anext__()
+            await events.aclose()
+            return first, second
+
+        first, second = async_to_sync(read)()
+
+        assert response["Content-Type"] == "text/event-stream"
+        assert first.startswith(b"event: game\ndata: ")
+        state = json.loads(first.decode().split("data: ", 1)[1])
+        assert state["name"] == game_with_two_players.name
+        assert state["actual_mark"] == GameConstants.MARK_X
+        assert second == b'event: game\ndata: {"status": "FINISHED"}\n\n'
+        assert not broadcaster.has_subscribers(game_with_two_players.name)
+
+
+@pytest.mark.django_db
+class TestPublishGameState:
+    def test_movement_is_published(
+        self,
+        client,
+        game_with_two_players,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+    ):
+        published = []
+        monkeypatch.setattr(broadcaster, "has_subscribers", lambda name: True)
+        monkeypatch.setattr(
+            broadcaster, "publish", lambda name, payload: published.append(payload)
+        )
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        data = {
+            "username": game_with_two_players.actual_player.username,
+            "movement_x": 0,
+            "movement_y": 0,
+        }
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(url, data)
+
+        assert response.status_code == 200
+        assert len(published) == 1
+        state = json.loads(published[0])
+        assert state["board"] == response.data["board"]
+        assert state["actual_mark"] == GameConstants.MARK_O
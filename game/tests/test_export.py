@@ -0,0 +1,163 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+
+from game.lib import engine, export
+from game.lib import exceptions as game_exceptions
+from game.lib.constants import GameConstants
+from game.models import Game
+from game.views.export import ExportGamesList
+
+
+@pytest.fixture
+def finished_games(user, user_master, game_with_two_players):
+    moves = bytes(
+        (
+            engine.encode_move(0, GameConstants.MARK_X),
+            engine.encode_move(3, GameConstants.MARK_O),
+            engine.encode_move(1, GameConstants.MARK_X),
+            engine.encode_move(4, GameConstants.MARK_O),
+            engine.encode_move(2, GameConstants.MARK_X),
+        )
+    )
+    won = Game.objects.create(
+        name="Won",
+        status=GameConstants.STATUS_FINISHED,
+        player_x=user,
+        player_o=user_master,
+        winner=user,
+        x_bits=engine.replay(moves)[0],
+        o_bits=engine.replay(moves)[1],
+        moves=moves,
+    )
+    drawn = Game.objects.create(
+        name="Drawn",
+        status=GameConstants.STATUS_DRAW,
+        player_x=user_master,
+        player_o=user,
+    )
+    return won, drawn
+
+
+def read_lines(response):
+    content = b"".join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db
+class TestExportGames:
+    def setup_method(self):
+        self.url = reverse("game:export-games")
+
+    def test_export_finished_games(self, client, finished_games):
+        won, drawn = finished_games
+        response = client.get(self.url)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        games = read_lines(response)
+        assert [game["id"] for game in games] == [won.id, drawn.id]
+        assert games[0] == {
+            "id": won.id,
+            "name": won.name,
+            "status": GameConstants.STATUS_FINISHED,
+            "board_size": 3,
+            "win_length": 3,
+            "board": engine.encode_board(won.x_bits, won.o_bits),
+            "moves": [
+                [0, 0, GameConstants.MARK_X],
+                [1, 0, GameConstants.MARK_O],
+                [0, 1, GameConstants.MARK_X],
+                [1, 1, GameConstants.MARK_O],
+                [0, 2, GameConstants.MARK_X],
+            ],
+            "player_x": won.player_x.username,
+            "player_o": won.player_o.username,
+            "winner": won.winner.username,
+        }
+        assert games[1]["winner"] is None
+
+    def test_export_filters(self, client, finished_games, user_master):
+        won, drawn = finished_games
+
+        response = client.get(self.url, {"status": "draw"})
+        assert [game["id"] for game in read_lines(response)] == [drawn.id]
+
+        response = client.get(self.url, {"min_id": drawn.id})
+        assert [game["id"] for game in read_lines(response)] == [drawn.id]
+
+        response = client.get(self.url, {"max_id": won.id})
+        assert [game["id"] for game in read_lines(response)] == [won.id]
+
+        response = client.get(
+            self.url, {"status": "in_game", "username": user_master.username}
+        )
+        assert [game["name"] for game in read_lines(response)] == ["Play"]
+
+    def test_export_raise_user_not_found(self, client):
+        response = client.get(self.url, {"username": "false user"})
+
+        assert response.status_code == 404
+        assert (
+            response.data["detail"]
+            == game_exceptions.UserNotFoundException.default_detail
+        )
+
+    def test_export_raise_serializer_exception(self, client):
+        response = client.get(self.url, {"status": "lost"})
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.SerializerException.default_detail
+        )
+
+    def test_export_is_one_query(self, finished_games, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            lines = list(export.iter_ndjson(export.games_to_export(), chunk_size=1))
+
+        assert len(lines) == 2
+
+    def test_export_under_asgi_is_async(self, client, finished_games):
+        request = AsyncRequestFactory().get(self.url)
+        response = ExportGamesList.as_view()(request)
+
+        async def read():
+            return [chunk async for chunk in response.streaming_content]
+
+        assert response.is_async
+        content = b"".join(async_to_sync(read)())
+        assert content == b"".join(client.get(self.url).streaming_content)
+
+    def test_async_export_reads_by_chunks(self, finished_games, django_assert_num_queries):
+        async def read():
+            games = export.games_to_export()
+            return [lines async for lines in export.aiter_ndjson(games, chunk_size=1)]
+
+        with django_assert_num_queries(3):
+            chunks = async_to_sync(read)()
+
+        assert chunks == list(export.iter_ndjson(export.games_to_export()))
+
+
+@pytest.mark.django_db
+class TestExportGamesCommand:
+    def test_export_to_file(self, client, finished_games, tmp_path):
+        path = tmp_path / "games.ndjson"
+        call_command("export_games", output=str(path))
+        response = client.get(reverse("game:export-games"))
+
+        assert path.read_text() == b"".join(response.streaming_content).decode()
+
+    def test_export_user_games(self, finished_games, user, capsys):
+        won, drawn = finished_games
+        call_command(
+            "export_games", user=user.username, status=GameConstants.STATUS_FINISHED
+        )
+
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [won.id]
@@ -2,8 +2,10 @@ import json
 import pytest
 from django.urls import reverse
 
+from game.lib import engine, matchmaking, versions
 from game.lib import exceptions as game_exceptions
 from game.lib.constants import GameConstants
+from game.models import Game, User
 
 
 @pytest.mark.django_db
@@ -15,8 +17,8 @@ class TestGameList:
         response = client.get(self.games_list_url)
 
         assert response.status_code == 200
-        assert len(response.data) == 1
-        assert response.data[0]["name"] == game_with_one_player.name
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["name"] == game_with_one_player.name
 
     def test_get_available_games_list(
         self, client, game_with_one_player, game_with_two_players
@@ -24,10 +26,48 @@ class TestGameList:
         response = client.get(self.games_list_url, **{"QUERY_STRING": "status=waiting"})
 
         assert response.status_code == 200
-        assert len(response.data) == 1
-        for game in response.data:
+        assert len(response.data["results"]) == 1
+        for game in response.data["results"]:
             assert game["name"] == game_with_one_player.name
 
+    def test_get_games_list_paginated(
+        self, client, game_with_one_player, game_with_two_players
+    ):
+        response = client.get(self.games_list_url, {"page_size": 1})
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["name"] == game_with_one_player.name
+        assert response.data["next"]
+
+        response = client.get(response.data["next"])
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["name"] == game_with_two_players.name
+        assert response.data["next"] is None
+
+    def test_get_games_list_queries(
+        self, client, user, user_master, django_assert_num_queries
+    ):
+        for index in range(10):
+            game = Game.objects.create(
+                name=f"Game {index}",
+                player_x=user,
+                player_o=user_master,
+                actual_player=user,
+            )
+            game.players.add(user, through_defaults={"mark": GameConstants.MARK_X})
+            game.players.add(
+                user_master, through_defaults={"mark": GameConstants.MARK_O}
+            )
+
+        # games page and prefetched players
+        with django_assert_num_queries(2):
+            response = client.get(self.games_list_url)
+
+        assert len(response.data["results"]) == 10
+
     def test_create_game(self, client, user):
         data = {
             "name": "Test a new game",
@@ -52,6 +92,38 @@ class TestGameList:
         assert len(response.data["players"]) == 1
         assert response.data["players"][0]["username"] == data["username"]
 
+    def test_create_game_with_board_size(self, client, user):
+        data = {
+            "name": "Big board",
+            "username": user.username,
+            "board_size": 5,
+            "win_length": 4,
+        }
+        response = client.post(self.games_list_url, data)
+
+        assert response.status_code == 201
+        game = Game.objects.get(name=data["name"])
+        assert game.board_size == 5
+        assert game.win_length == 4
+        assert (game.x_bits, game.o_bits) == (0, 0)
+
+    def test_create_game_raise_serializer_exception_with_long_win_length(
+        self, client, user
+    ):
+        data = {
+            "name": "Wrong board",
+            "username": user.username,
+            "board_size": 3,
+            "win_length": 4,
+        }
+        response = client.post(self.games_list_url, data)
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.SerializerException.default_detail
+        )
+
     def test_create_game_raise_serializer_exception(self, client):
         data = {"name": "Test a new game again"}
         response = client.post(self.games_list_url, data)
@@ -101,6 +173,9 @@ class TestGameDetail:
         assert response.data["status"] == GameConstants.STATUS_IN_GAME
         assert "actual_mark" in response.data
         assert response.data["actual_mark"] == GameConstants.MARK_X
+        game_with_one_player.refresh_from_db()
+        assert game_with_one_player.player_o == user_master
+        assert game_with_one_player.actual_player == game_with_one_player.player_x
 
     def test_update_game_raise_full_game_exception(self, client, game_with_two_players):
         url = reverse("game:game-details", kwargs={"name": game_with_two_players.name})
@@ -116,6 +191,22 @@ class TestGameDetail:
             == game_exceptions.FullGameStatusException.default_detail
         )
 
+    def test_update_game_raise_already_in_game_exception(
+        self, client, game_with_one_player, user
+    ):
+        url = reverse("game:game-details", kwargs={"name": game_with_one_player.name})
+        data = {
+            "name": game_with_one_player.name,
+            "username": user.username,
+        }
+        response = client.put(url, data)
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.AlreadyInGameException.default_detail
+        )
+
     def test_update_game_raise_serializer_exception(self, client, game_with_one_player):
         url = reverse("game:game-details", kwargs={"name": game_with_one_player.name})
         data = {"name": game_with_one_player.name}
@@ -140,6 +231,22 @@ class TestPlayGame:
         assert "actual_mark" in response.data
         assert response.data["actual_mark"] == GameConstants.MARK_X
 
+    def test_get_game_board(
+        self, client, game_with_two_players_and_last_turn_to_win_horizontal
+    ):
+        game = game_with_two_players_and_last_turn_to_win_horizontal
+        url = reverse("game:play-game", kwargs={"name": game.name})
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.data["board"] == json.dumps(
+            [
+                [GameConstants.MARK_O, GameConstants.MARK_O, ""],
+                ["", "", ""],
+                [GameConstants.MARK_X, GameConstants.MARK_X, ""],
+            ]
+        )
+
     def test_get_game_details_raise_game_not_found(self, client):
         url = reverse("game:play-game", kwargs={"name": "false game"})
         response = client.get(url)
@@ -348,3 +455,453 @@ class TestPlayGame:
             response.data["winner"]["username"]
             == game_with_two_players_and_last_turn_to_win_diagonal_2.actual_player.username
         )
+
+    def test_play_game_and_draws(
+        self, client, game_with_two_players_and_last_turn_to_draw, user, user_master
+    ):
+        game = game_with_two_players_and_last_turn_to_draw
+        url = reverse("game:play-game", kwargs={"name": game.name})
+        data = {
+            "username": user.username,
+            "movement_x": 2,
+            "movement_y": 0,
+        }
+        response = client.post(url, data)
+
+        assert response.status_code == 200
+        assert response.data["status"] == GameConstants.STATUS_DRAW
+        assert response.data["winner"] is None
+        game.refresh_from_db()
+        assert game.actual_player is None
+        for player in (user, user_master):
+            number_of_games, points = player.number_of_games, player.points
+            player.refresh_from_db()
+            assert player.number_of_games == number_of_games + 1
+            assert player.points == points
+
+    def test_play_game_and_wins_updates_stats(
+        self,
+        client,
+        game_with_two_players_and_last_turn_to_win_horizontal,
+        user,
+        user_master,
+        django_assert_max_num_queries,
+    ):
+        game = game_with_two_players_and_last_turn_to_win_horizontal
+        url = reverse("game:play-game", kwargs={"name": game.name})
+        data = {
+            "username": user_master.username,
+            "movement_x": 0,
+            "movement_y": 2,
+        }
+        stats = {
+            player.pk: (player.number_of_games, player.points)
+            for player in (user, user_master)
+        }
+        # bot usernames, savepoint, locked game with its players, players stats,
+        # game, release
+        with django_assert_max_num_queries(6):
+            response = client.post(url, data)
+
+        assert response.status_code == 200
+        assert response.data["status"] == GameConstants.STATUS_FINISHED
+        user.refresh_from_db()
+        user_master.refresh_from_db()
+        assert (user.number_of_games, user.points) == (
+            stats[user.pk][0] + 1,
+            stats[user.pk][1],
+        )
+        assert (user_master.number_of_games, user_master.points) == (
+            stats[user_master.pk][0] + 1,
+            stats[user_master.pk][1] + 1,
+        )
+
+    def test_play_game_queries(
+        self, client, game_with_two_players, django_assert_max_num_queries
+    ):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        data = {
+            "name": game_with_two_players.name,
+            "username": game_with_two_players.actual_player.username,
+            "movement_x": 1,
+            "movement_y": 1,
+        }
+        # bot usernames, savepoint, locked game with its players, update,
+        # release, players
+        with django_assert_max_num_queries(6):
+            response = client.post(url, data)
+
+        assert response.status_code == 200
+        assert response.data["actual_mark"] == GameConstants.MARK_O
+
+
+@pytest.mark.django_db
+class TestHintGame:
+    def test_get_hint(self, client, game_with_two_players_and_last_turn_to_win_horizontal):
+        url = reverse(
+            "game:hint-game",
+            kwargs={"name": game_with_two_players_and_last_turn_to_win_horizontal.name},
+        )
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.data["movement_x"] == 0
+        assert response.data["movement_y"] == 2
+        assert response.data["actual_mark"] == GameConstants.MARK_O
+
+    def test_get_hint_raise_not_valid_status_exception(
+        self, client, game_with_one_player
+    ):
+        url = reverse("game:hint-game", kwargs={"name": game_with_one_player.name})
+        response = client.get(url)
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.NotValidGameStatusException.default_detail
+        )
+
+
+@pytest.mark.django_db
+class TestReplayGame:
+    def play(self, client, game, *movements):
+        url = reverse("game:play-game", kwargs={"name": game.name})
+        for username, movement_x, movement_y in movements:
+            data = {
+                "username": username,
+                "movement_x": movement_x,
+                "movement_y": movement_y,
+            }
+            assert client.post(url, data).status_code == 200
+
+    def test_movements_are_logged(
+        self, client, game_with_two_players, user, user_master
+    ):
+        self.play(
+            client, game_with_two_players, (user.username, 1, 1), (user_master.username, 0, 0)
+        )
+        game_with_two_players.refresh_from_db()
+
+        assert bytes(game_with_two_players.moves) == bytes(
+            (
+                engine.encode_move(4, GameConstants.MARK_X),
+                engine.encode_move(0, GameConstants.MARK_O),
+            )
+        )
+
+    def test_replay_game(self, client, game_with_two_players, user, user_master):
+        self.play(
+            client, game_with_two_players, (user.username, 1, 1), (user_master.username, 0, 0)
+        )
+        url = reverse("game:replay-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url, {"ply": 1})
+
+        assert response.status_code == 200
+        assert response.data["ply"] == 1
+        assert response.data["plies"] == 2
+        assert json.loads(response.data["board"])[1][1] == GameConstants.MARK_X
+        assert json.loads(response.data["board"])[0][0] == ""
+        assert response.data["movement_x"] == 1
+        assert response.data["movement_y"] == 1
+        assert response.data["mark"] == GameConstants.MARK_X
+
+    def test_replay_game_last_position(
+        self, client, game_with_two_players, user, user_master
+    ):
+        self.play(
+            client, game_with_two_players, (user.username, 1, 1), (user_master.username, 0, 0)
+        )
+        url = reverse("game:replay-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url)
+        play_response = client.get(
+            reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        )
+
+        assert response.status_code == 200
+        assert response.data["ply"] == 2
+        assert response.data["board"] == play_response.data["board"]
+        assert response.data["mark"] == GameConstants.MARK_O
+
+    def test_replay_game_start(self, client, game_with_two_players):
+        url = reverse("game:replay-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url, {"ply": 0})
+
+        assert response.status_code == 200
+        assert response.data["board"] == engine.encode_board(0, 0)
+        assert response.data["mark"] is None
+
+    def test_replay_game_raise_not_valid_ply_exception(
+        self, client, game_with_two_players
+    ):
+        url = reverse("game:replay-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url, {"ply": 1})
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.NotValidPlyException.default_detail
+        )
+
+    def test_replay_game_raise_serializer_exception(
+        self, client, game_with_two_players
+    ):
+        url = reverse("game:replay-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url, {"ply": -1})
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.SerializerException.default_detail
+        )
+
+    def test_replay_game_raise_game_not_found(self, client):
+        url = reverse("game:replay-game", kwargs={"name": "false game"})
+        response = client.get(url)
+
+        assert response.status_code == 404
+        assert (
+            response.data["detail"]
+            == game_exceptions.GameNotFoundException.default_detail
+        )
+
+
+@pytest.mark.django_db
+class TestBotGame:
+    def test_create_game_against_bot(self, client, user):
+        data = {
+            "name": "Against bot",
+            "username": user.username,
+            "against_bot": True,
+        }
+        response = client.post(reverse("game:games-list"), data)
+
+        assert response.status_code == 201
+        assert response.data["status"] == GameConstants.STATUS_IN_GAME
+        assert [player["username"] for player in response.data["players"]] == [
+            user.username,
+            GameConstants.BOT_USERNAME,
+        ]
+
+    def test_bot_answers_movement(self, client, user):
+        data = {
+            "name": "Against bot",
+            "username": user.username,
+            "against_bot": True,
+        }
+        client.post(reverse("game:games-list"), data)
+
+        url = reverse("game:play-game", kwargs={"name": data["name"]})
+        data = {"username": user.username, "movement_x": 0, "movement_y": 0}
+        response = client.post(url, data)
+
+        assert response.status_code == 200
+        assert response.data["status"] == GameConstants.STATUS_IN_GAME
+        assert response.data["actual_player"]["username"] == user.username
+        assert response.data["actual_mark"] == GameConstants.MARK_X
+        board = json.loads(response.data["board"])
+        assert board[0][0] == GameConstants.MARK_X
+        # the only answer that does not lose to a corner opening is the center
+        assert board[1][1] == GameConstants.MARK_O
+
+    def test_bot_is_found_by_its_flag(self, client, user):
+        User.objects.filter(is_bot=True).delete()
+        # Registered before the username was reserved
+        User.objects.create(username=GameConstants.BOT_USERNAME)
+        bot = User.objects.create(username="Bot", is_bot=True)
+        data = {"name": "Against bot", "username": user.username, "against_bot": True}
+        client.post(reverse("game:games-list"), data)
+
+        url = reverse("game:play-game", kwargs={"name": data["name"]})
+        data = {"username": user.username, "movement_x": 0, "movement_y": 0}
+        response = client.post(url, data)
+
+        game = Game.objects.get(name="Against bot")
+        assert game.player_o == bot
+        assert response.data["actual_player"]["username"] == user.username
+        assert json.loads(response.data["board"])[1][1] == GameConstants.MARK_O
+
+    @pytest.mark.parametrize("username", [GameConstants.BOT_USERNAME, "tictactoebot"])
+    def test_bot_username_is_reserved(self, client, username):
+        data = {"name": "Against bot", "username": username, "against_bot": True}
+        response = client.post(reverse("game:games-list"), data)
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.SerializerException.default_detail
+        )
+        response = client.post(reverse("game:user-list"), {"username": username})
+        assert response.status_code == 400
+        response = client.post(reverse("game:matchmaking"), {"username": username})
+        assert response.status_code == 400
+
+    def test_renamed_bot_username_is_reserved(self, client, game_with_two_players):
+        # The bot got a numbered username, a player registered its default one
+        User.objects.filter(is_bot=True).update(username="TicTacToeBot1")
+        User.objects.create(username=GameConstants.BOT_USERNAME)
+
+        data = {"name": "Against bot", "username": GameConstants.BOT_USERNAME}
+        response = client.post(reverse("game:games-list"), data)
+        assert response.status_code == 201
+
+        for url, data in (
+            (reverse("game:games-list"), {"name": "Bot game", "username": "TicTacToeBot1"}),
+            (reverse("game:matchmaking"), {"username": "TicTacToeBot1"}),
+            (
+                reverse("game:play-game", kwargs={"name": game_with_two_players.name}),
+                {"username": "tictactoebot1", "movement_x": 0, "movement_y": 0},
+            ),
+        ):
+            response = client.post(url, data)
+            assert response.status_code == 400
+        assert not Game.objects.filter(name="Bot game").exists()
+
+    def test_bot_can_not_join_game(self, game_with_one_player):
+        with pytest.raises(game_exceptions.BotPlayerException):
+            game_with_one_player.join(User.get_bot())
+
+        game_with_one_player.refresh_from_db()
+        assert game_with_one_player.status == GameConstants.STATUS_WAITING
+        assert game_with_one_player.player_o is None
+
+    def test_bot_can_not_be_paired(self, game_with_one_player):
+        with pytest.raises(game_exceptions.BotPlayerException):
+            matchmaking.pair(User.get_bot())
+
+        assert Game.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestMatchmaking:
+    def setup_method(self):
+        self.matchmaking_url = reverse("game:matchmaking")
+
+    def test_matchmaking_creates_game(self, client, user):
+        response = client.post(self.matchmaking_url, {"username": user.username})
+
+        assert response.status_code == 201
+        assert response.data["status"] == GameConstants.STATUS_WAITING
+        assert response.data["players"][0]["username"] == user.username
+
+    def test_matchmaking_pairs_players(self, client, user, user_master):
+        created = client.post(self.matchmaking_url, {"username": user.username})
+        response = client.post(
+            self.matchmaking_url, {"username": user_master.username}
+        )
+
+        assert response.status_code == 200
+        assert response.data["name"] == created.data["name"]
+        assert response.data["status"] == GameConstants.STATUS_IN_GAME
+        assert response.data["actual_player"]["username"] == user.username
+        assert response.data["actual_mark"] == GameConstants.MARK_X
+
+    def test_matchmaking_joins_oldest_waiting_game(
+        self, client, game_with_one_player, user_master
+    ):
+        newer = Game.objects.create(name="Newer", player_x=user_master)
+        response = client.post(self.matchmaking_url, {"username": "Spike"})
+
+        assert response.status_code == 200
+        assert response.data["name"] == game_with_one_player.name
+        newer.refresh_from_db()
+        assert newer.status == GameConstants.STATUS_WAITING
+
+    def test_matchmaking_skips_stale_games(
+        self, client, waiting_games, game_with_two_players, user_master
+    ):
+        waiting_games.push(game_with_two_players.id)
+        response = client.post(
+            self.matchmaking_url, {"username": user_master.username}
+        )
+
+        assert response.status_code == 201
+        assert response.data["name"] != game_with_two_players.name
+
+    def test_matchmaking_keeps_user_waiting_game(
+        self, client, waiting_games, game_with_one_player, user
+    ):
+        response = client.post(self.matchmaking_url, {"username": user.username})
+
+        assert response.status_code == 200
+        assert response.data["name"] == game_with_one_player.name
+        assert response.data["status"] == GameConstants.STATUS_WAITING
+        assert len(waiting_games) == 1
+
+    def test_matchmaking_raise_serializer_exception(self, client):
+        response = client.post(self.matchmaking_url, {})
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.SerializerException.default_detail
+        )
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_get_game_details_etag(self, client, game_with_two_players):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response["ETag"] == versions.make_etag(
+            game_with_two_players.id, game_with_two_players.version
+        )
+
+    def test_get_game_details_not_modified(
+        self, client, game_with_two_players, django_assert_num_queries
+    ):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        etag = client.get(url)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_get_game_details_modified_after_movement(
+        self, client, game_with_two_players, django_capture_on_commit_callbacks
+    ):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        etag = client.get(url)["ETag"]
+        data = {
+            "username": game_with_two_players.actual_player.username,
+            "movement_x": 0,
+            "movement_y": 0,
+        }
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(url, data)
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert json.loads(response.data["board"])[0][0] == GameConstants.MARK_X
+
+    def test_get_game_details_long_poll_times_out(
+        self, client, game_with_one_player, settings
+    ):
+        settings.GAME_LONG_POLL_INTERVAL = 0.01
+        url = reverse("game:game-details", kwargs={"name": game_with_one_player.name})
+        etag = client.get(url)["ETag"]
+
+        response = client.get(url, {"wait": 0.05}, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_get_game_details_long_poll_raise_serializer_exception(
+        self, client, game_with_one_player
+    ):
+        url = reverse("game:game-details", kwargs={"name": game_with_one_player.name})
+        etag = client.get(url)["ETag"]
+
+        response = client.get(url, {"wait": "soon"}, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 400
+
+    def test_get_game_details_etag_raise_game_not_found(self, client):
+        url = reverse("game:game-details", kwargs={"name": "false game"})
+        response = client.get(url, HTTP_IF_NONE_MATCH='"1.1"')
+
+        assert response.status_code == 404
@@ -0,0 +1,166 @@
+import csv
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from game.lib import engine, export, importer
+from game.lib.constants import GameConstants
+from game.models import Game, User, UserGame
+
+
+def game_record(name, player_x, player_o, winner=None, moves=None, **fields):
+    return {
+        "name": name,
+        "status": GameConstants.STATUS_FINISHED,
+        "board_size": 3,
+        "win_length": 3,
+        "moves": moves or [],
+        "player_x": player_x,
+        "player_o": player_o,
+        "winner": winner,
+        **fields,
+    }
+
+
+WON_MOVES = [
+    [0, 0, GameConstants.MARK_X],
+    [1, 0, GameConstants.MARK_O],
+    [0, 1, GameConstants.MARK_X],
+    [1, 1, GameConstants.MARK_O],
+    [0, 2, GameConstants.MARK_X],
+]
+
+
+@pytest.fixture
+def games_file(tmp_path, user):
+    records = [
+        game_record("Won", user.username, "Ann", winner=user.username, moves=WON_MOVES),
+        game_record("Drawn", "Ann", "Bob", status=GameConstants.STATUS_DRAW),
+        game_record(
+            "Playing", "Bob", user.username, status="in_game", moves=WON_MOVES[:1]
+        ),
+    ]
+    path = tmp_path / "games.ndjson"
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+@pytest.mark.django_db
+class TestImportGames:
+    def test_import_games(self, games_file, user):
+        call_command("import_games", str(games_file), batch_size=2)
+
+        won = Game.objects.get(name="Won")
+        assert won.status == GameConstants.STATUS_FINISHED
+        assert won.winner == user
+        assert won.player_count == 2
+        assert engine.encode_board(won.x_bits, won.o_bits) == json.dumps(
+            [
+                [GameConstants.MARK_X] * 3,
+                [GameConstants.MARK_O, GameConstants.MARK_O, ""],
+                ["", "", ""],
+            ]
+        )
+        playing = Game.objects.get(name="Playing")
+        assert playing.actual_mark == GameConstants.MARK_O
+        assert playing.actual_player == user
+        o_slot = UserGame.objects.get(game=won, mark=GameConstants.MARK_O)
+        assert o_slot.user.username == "Ann"
+
+    def test_import_recomputes_stats(self, games_file, user):
+        call_command("import_games", str(games_file))
+
+        user.refresh_from_db()
+        ann = User.objects.get(username="Ann")
+        bob = User.objects.get(username="Bob")
+        assert (user.number_of_games, user.points) == (1, 1)
+        assert (ann.number_of_games, ann.points) == (2, 0)
+        assert (bob.number_of_games, bob.points) == (1, 0)
+
+    def test_import_exported_games(self, games_file, tmp_path):
+        call_command("import_games", str(games_file))
+        exported = tmp_path / "exported.ndjson"
+        call_command("export_games", output=str(exported))
+        Game.objects.all().delete()
+
+        call_command("import_games", str(exported))
+
+        lines = exported.read_text().splitlines()
+        records = [export.game_record(row) for row in export.games_to_export()]
+        assert [{**record, "id": None} for record in records] == [
+            {**json.loads(line), "id": None} for line in lines
+        ]
+
+    def test_import_csv(self, tmp_path):
+        path = tmp_path / "games.csv"
+        with open(path, "w", newline="") as games_file:
+            writer = csv.DictWriter(
+                games_file,
+                fieldnames=["name", "status", "player_x", "player_o", "winner", "moves"],
+            )
+            writer.writeheader()
+            writer.writerow(
+                {
+                    "name": "Csv",
+                    "status": "finished",
+                    "player_x": "Ann",
+                    "player_o": "Bob",
+                    "winner": "Ann",
+                    "moves": json.dumps(WON_MOVES),
+                }
+            )
+
+        call_command("import_games", str(path))
+
+        game = Game.objects.get(name="Csv")
+        assert game.winner.username == "Ann"
+        assert bytes(game.moves)[0] == engine.encode_move(0, GameConstants.MARK_X)
+
+    def test_import_queries_do_not_grow_with_games(
+        self, django_assert_max_num_queries
+    ):
+        records = [
+            game_record(f"Game {index}", "Ann", "Bob", winner="Ann", moves=WON_MOVES)
+            for index in range(100)
+        ]
+        # savepoint, users lookup and creation, games split in as many inserts
+        # as the backend limit of parameters needs, players, stats, release
+        with django_assert_max_num_queries(8):
+            assert importer.import_games(records, batch_size=100) == 100
+
+    def test_import_without_bulk_insert_ids(self, monkeypatch):
+        # Backends that do not return the ids of bulk inserted rows
+        monkeypatch.setattr(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        )
+        records = [
+            game_record("Same", "Ann", "Bob", winner="Ann", moves=WON_MOVES),
+            game_record("Same", "Bob", "Ann", status=GameConstants.STATUS_DRAW),
+        ]
+
+        assert importer.import_games(records, batch_size=2) == 2
+        assert sorted(
+            UserGame.objects.filter(game__name="Same").values_list(
+                "game__player_x__username", "user__username", "mark"
+            )
+        ) == [
+            ("Ann", "Ann", GameConstants.MARK_X),
+            ("Ann", "Bob", GameConstants.MARK_O),
+            ("Bob", "Ann", GameConstants.MARK_O),
+            ("Bob", "Bob", GameConstants.MARK_X),
+        ]
+
+    def test_import_raise_error(self, tmp_path):
+        path = tmp_path / "games.ndjson"
+        path.write_text(
+            json.dumps(game_record("Good", "Ann", "Bob"))
+            + "\n"
+            + json.dumps(game_record("Bad", "Ann", "Ann"))
+            + "\n"
+        )
+
+        with pytest.raises(CommandError, match="Record 2"):
+            call_command("import_games", str(path))
+        assert not Game.objects.exists()
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from game.lib.loadtest import LoadTest, percentile
+from game.models import Game, User
+
+
+class TestPercentile:
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+
+    def test_percentile_of_few_values(self):
+        assert percentile([], 99) == 0.0
+        assert percentile([0.5], 1) == 0.5
+        assert percentile([0.1, 0.2], 99) == 0.2
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadTest:
+    def test_run(self):
+        results = LoadTest(games=2, concurrency=1, prefix="bench").run()
+
+        assert results["failed_games"] == 0
+        assert results["requests"] == 2 * 7
+        play = results["endpoints"]["play-game"]
+        assert play["requests"] == 10
+        assert play["errors"] == 0
+        assert play["status_codes"] == {"200": 10}
+        assert play["queries_per_request"] > 0
+        assert play["latency_ms"]["p50"] <= play["latency_ms"]["p99"]
+        assert Game.objects.filter(name__startswith="bench", status="FINISHED").count() == 2
+
+    def test_command_writes_results(self, tmp_path):
+        path = tmp_path / "results.json"
+        call_command("benchmark_api", games=1, concurrency=1, output=str(path))
+
+        results = json.loads(path.read_text())
+        assert results["games"] == 1
+        assert results["database"] == "sqlite"
+        assert set(results["endpoints"]) == {"games-list", "game-details", "play-game"}
+        assert not Game.objects.exists()
+        assert not User.objects.exists()
+
+    def test_command_plays_one_game_at_once_on_sqlite(self, tmp_path):
+        path = tmp_path / "results.json"
+        call_command("benchmark_api", games=2, output=str(path))
+
+        results = json.loads(path.read_text())
+        assert results["concurrency"] == 1
+        assert results["failed_games"] == 0
+
+        with pytest.raises(CommandError):
+            call_command("benchmark_api", games=2, concurrency=8, output=str(path))
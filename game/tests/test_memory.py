@@ -0,0 +1,97 @@
+import json
+import tracemalloc
+
+import django.db.models.query
+import pytest
+import rest_framework.serializers
+from django.urls import reverse
+
+import game.models
+import game.views.game
+from game.lib import memory
+
+
+class TestGroups:
+    def test_group_of_module_files(self):
+        assert memory.group_of(game.views.game.__file__) == "game.views"
+        assert memory.group_of(game.models.__file__) == "game.models"
+        assert memory.group_of(rest_framework.serializers.__file__) == "rest_framework"
+        assert memory.group_of(django.db.models.query.__file__) == "django.db"
+        assert memory.group_of(tracemalloc.__file__) is None
+
+    def test_site_is_innermost_frame_in_a_group(self):
+        traceback = tracemalloc.Traceback(
+            (
+                (json.__file__, 10),
+                (game.views.game.__file__, 20),
+                (tracemalloc.__file__, 30),
+            )
+        )
+
+        group, frame = memory.site_of(traceback)
+        assert group == "game.views"
+        assert frame.lineno == 20
+
+
+@pytest.mark.django_db
+class TestMemoryEndpoint:
+    def test_staff_only(self, client):
+        url = reverse("game:memory")
+        assert client.get(url).status_code == 403
+        assert client.post(url).status_code == 403
+        assert client.delete(url).status_code == 403
+
+    def test_not_tracing(self, admin_client):
+        response = admin_client.get(reverse("game:memory"))
+
+        assert response.status_code == 200
+        assert response.json()["tracing"] is False
+
+    def test_start_report_and_stop(self, admin_client, tracing, game_with_two_players):
+        url = reverse("game:memory")
+        response = admin_client.post(url, {"frames": 10})
+        assert response.status_code == 201
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traceback_limit() == 10
+
+        play_url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        for _ in range(5):
+            admin_client.get(play_url)
+
+        report = admin_client.get(url, {"limit": 5}).json()
+        assert report["tracing"] is True
+        assert len(report["sites"]) <= 5
+        groups = {group["group"] for group in report["groups"]}
+        assert groups & {"game.views", "game.serializers", "rest_framework", "django.db"}
+        assert sum(group["size_diff"] for group in report["groups"]) > 0
+
+        assert admin_client.delete(url).status_code == 204
+        assert not tracemalloc.is_tracing()
+
+    def test_not_valid_input(self, admin_client):
+        response = admin_client.get(reverse("game:memory"), {"limit": 0})
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestAllocationMiddleware:
+    def test_requests_are_counted(self, client, settings, tracing, game_with_two_players):
+        settings.GAME_ALLOCATIONS_ENABLED = True
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+
+        response = client.get(url)
+        client.get(url)
+
+        assert tracemalloc.is_tracing()
+        assert int(response["X-Allocated-Bytes"]) > 0
+        [counters] = memory.request_allocations()
+        assert counters["view"] == "play-game"
+        assert counters["requests"] == 2
+        assert counters["allocated_bytes"] > 0
+
+    def test_disabled_by_default(self, client, game_with_two_players):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+
+        assert "X-Allocated-Bytes" not in client.get(url)
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from game.lib import metrics
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    def test_requests_are_recorded(self, client, game_with_two_players, metrics_collector):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        client.get(url)
+        client.get(url)
+        client.get(reverse("game:play-game", kwargs={"name": "false game"}))
+
+        records = metrics_collector.collect()
+        record = records[("play-game", "GET", "200")]
+        assert record["count"] == 2
+        assert record["queries_sum"] > 0
+        assert record["query_duration_sum"] > 0
+        assert sum(record["duration_buckets"]) == 2
+        assert records[("play-game", "GET", "404")]["count"] == 1
+
+    def test_metrics_endpoint(self, client, game_with_two_players):
+        client.get(reverse("game:games-list"))
+        response = client.get(reverse("game:metrics"))
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        content = response.content.decode()
+        assert (
+            'game_http_requests_total{view="games-list",method="GET",status="200"} 1'
+            in content
+        )
+        assert (
+            'game_http_request_duration_seconds_bucket{view="games-list",'
+            'method="GET",status="200",le="+Inf"} 1' in content
+        )
+        assert "# TYPE game_http_db_queries histogram" in content
+
+    def test_collect_sums_processes(self, settings, metrics_collector):
+        other = {
+            "play-game|POST|200": {
+                **metrics._new_record(),
+                "count": 3,
+                "duration_sum": 0.3,
+                "duration_buckets": [0, 0, 0, 0, 3] + [0] * 6,
+            }
+        }
+        settings.GAME_METRICS_DIR.mkdir(parents=True)
+        (settings.GAME_METRICS_DIR / "metrics-1.json").write_text(json.dumps(other))
+        metrics_collector.observe(("play-game", "POST", "200"), 0.2, 4, 0.01)
+
+        record = metrics_collector.collect()[("play-game", "POST", "200")]
+        assert record["count"] == 4
+        assert record["duration_sum"] == pytest.approx(0.5)
+        assert record["duration_buckets"][4] == 3
+        assert record["duration_buckets"][5] == 1
+        assert record["queries_sum"] == 4
+
+
+class TestRender:
+    def test_histogram_buckets_are_cumulative(self):
+        record = metrics._new_record()
+        record.update(count=2, duration_sum=0.03)
+        record["duration_buckets"][0] = 1
+        record["duration_buckets"][2] = 1
+
+        content = metrics.render({("games-list", "GET", "200"): record})
+
+        labels = 'view="games-list",method="GET",status="200"'
+        assert f'game_http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in content
+        assert f'game_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 1' in content
+        assert f'game_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 2' in content
+        assert f"game_http_request_duration_seconds_count{{{labels}}} 2" in content
@@ -1,4 +1,10 @@
 import pytest
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+from game.lib import exceptions as game_exceptions
+from game.lib.constants import GameConstants
+from game.models import Game, User, UserGame
 
 
 @pytest.mark.django_db
@@ -11,3 +17,133 @@ class TestGame:
 class TestUser:
     def test_user_str(self, user):
         assert str(user) == user.username
+
+
+@pytest.mark.django_db
+class TestGameJoin:
+    def test_join_starts_game(self, game_with_one_player, user_master):
+        game_with_one_player.join(user_master)
+        game = Game.objects.get(pk=game_with_one_player.pk)
+
+        assert game.status == GameConstants.STATUS_IN_GAME
+        assert game.player_count == 2
+        assert game.player_o == user_master
+        assert game.actual_player == game.player_x
+        assert game.version == game_with_one_player.version
+        assert UserGame.objects.get(game=game, user=user_master).mark == (
+            GameConstants.MARK_O
+        )
+
+    def test_join_stale_game_raise_full_game_exception(
+        self, game_with_one_player, user_master
+    ):
+        stale_game = Game.objects.get(pk=game_with_one_player.pk)
+        game_with_one_player.join(user_master)
+
+        with pytest.raises(game_exceptions.FullGameStatusException):
+            stale_game.join(User.objects.create(username="Spike"))
+        assert game_with_one_player.players.count() == 2
+
+    def test_unique_slot(self, game_with_two_players):
+        with pytest.raises(IntegrityError), transaction.atomic():
+            UserGame.objects.create(
+                user=User.objects.create(username="Spike"),
+                game=game_with_two_players,
+                mark=GameConstants.MARK_O,
+            )
+
+
+def migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate(targets)
+    return executor.loader.project_state(targets).apps
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPlayerCountMigration:
+    before = [("game", "0011_game_version")]
+    after = [("game", "0013_populate_game_player_count")]
+
+    def test_extra_memberships_are_dropped(self):
+        apps = migrate(self.before)
+        OldUser = apps.get_model("game", "User")
+        OldGame = apps.get_model("game", "Game")
+        OldUserGame = apps.get_model("game", "UserGame")
+        jerry, tom, sara = (
+            OldUser.objects.create(username=username) for username in ("Jerry", "Tom", "Sara")
+        )
+        raced = OldGame.objects.create(name="Raced", player_x=jerry)
+        for player, mark in ((jerry, "X"), (tom, ""), (sara, "")):
+            OldUserGame.objects.create(user=player, game=raced, mark=mark)
+        full = OldGame.objects.create(name="Full", player_x=jerry, player_o=tom)
+        for player, mark in ((jerry, "X"), (tom, "O"), (sara, "")):
+            OldUserGame.objects.create(user=player, game=full, mark=mark)
+
+        try:
+            apps = migrate(self.after)
+            NewGame = apps.get_model("game", "Game")
+            NewUserGame = apps.get_model("game", "UserGame")
+
+            assert NewGame.objects.get(pk=raced.pk).player_count == 1
+            assert list(
+                NewUserGame.objects.filter(game=raced.pk).values_list("user", "mark")
+            ) == [(jerry.pk, "X")]
+            assert NewGame.objects.get(pk=full.pk).player_count == 2
+            assert list(
+                NewUserGame.objects.filter(game=full.pk)
+                .order_by("id")
+                .values_list("user", "mark")
+            ) == [(jerry.pk, "X"), (tom.pk, "O")]
+        finally:
+            migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRetireDrawnGamesMigration:
+    before = [("game", "0018_alter_game_status")]
+    after = [("game", "0019_retire_drawn_games")]
+
+    def test_drawn_games_are_finished(self):
+        apps = migrate(self.before)
+        OldUser = apps.get_model("game", "User")
+        OldGame = apps.get_model("game", "Game")
+        jerry, tom = (
+            OldUser.objects.create(username=username) for username in ("Jerry", "Tom")
+        )
+        # X O X / X O O / O X _ with X to move: no line can be completed
+        drawn = OldGame.objects.create(
+            name="Drawn",
+            player_x=jerry,
+            player_o=tom,
+            status="IN_GAME",
+            actual_player=jerry,
+            actual_mark="X",
+            x_bits=0b010001101,
+            o_bits=0b001110010,
+        )
+        playing = OldGame.objects.create(
+            name="Playing",
+            player_x=jerry,
+            player_o=tom,
+            status="IN_GAME",
+            actual_player=jerry,
+            actual_mark="X",
+            x_bits=0b000000001,
+            o_bits=0b000010000,
+        )
+
+        try:
+            apps = migrate(self.after)
+            NewGame = apps.get_model("game", "Game")
+            NewUser = apps.get_model("game", "User")
+
+            assert NewGame.objects.get(pk=drawn.pk).status == "DRAW"
+            assert NewGame.objects.get(pk=drawn.pk).actual_player is None
+            assert NewGame.objects.get(pk=playing.pk).status == "IN_GAME"
+            assert [
+                NewUser.objects.get(pk=player.pk).number_of_games
+                for player in (jerry, tom)
+            ] == [1, 1]
+        finally:
+            migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
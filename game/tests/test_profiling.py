@@ -0,0 +1,84 @@
+import pstats
+
+import pytest
+from django.urls import reverse
+
+from game.lib import profiling
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    def test_disabled_by_default(self, client, settings, tmp_path, game_with_two_players):
+        settings.GAME_PROFILING_DIR = tmp_path / "profiles"
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url, HTTP_X_PROFILE="1")
+
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response
+        assert not (tmp_path / "profiles").exists()
+
+    def test_header_profiles_request(self, client, profiling_enabled, game_with_two_players):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        assert "X-Profile-Id" not in client.get(url)
+
+        response = client.get(url, HTTP_X_PROFILE="1")
+        profile_id = response["X-Profile-Id"]
+
+        stats = pstats.Stats(str(profiling_enabled / f"{profile_id}.prof"))
+        assert stats.total_calls > 0
+        [info] = profiling.list_profiles()
+        assert info["id"] == profile_id
+        assert info["view"] == "play-game"
+        assert info["method"] == "GET"
+        assert info["status"] == 200
+
+    def test_sample_rate(self, client, settings, profiling_enabled):
+        settings.GAME_PROFILING_SAMPLE_RATE = 1
+        response = client.get(reverse("game:games-list"))
+
+        assert response["X-Profile-Id"]
+
+    def test_ring_is_bounded(self, client, settings, profiling_enabled):
+        settings.GAME_PROFILING_MAX_FILES = 2
+        ids = [
+            client.get(reverse("game:games-list"), HTTP_X_PROFILE="1")["X-Profile-Id"]
+            for _ in range(4)
+        ]
+
+        assert [info["id"] for info in profiling.list_profiles()] == ids[:1:-1]
+        assert len(list(profiling_enabled.glob("*.prof"))) == 2
+
+
+@pytest.mark.django_db
+class TestProfilesEndpoints:
+    def test_staff_only(self, client, profiling_enabled):
+        assert client.get(reverse("game:profiles-list")).status_code == 403
+        url = reverse("game:profile-details", kwargs={"profile_id": "1-1"})
+        assert client.get(url).status_code == 403
+
+    def test_list_and_download(self, admin_client, profiling_enabled):
+        profile_id = admin_client.get(
+            reverse("game:games-list"), HTTP_X_PROFILE="1"
+        )["X-Profile-Id"]
+
+        response = admin_client.get(reverse("game:profiles-list"))
+        assert response.status_code == 200
+        assert [info["id"] for info in response.json()] == [profile_id]
+
+        url = reverse("game:profile-details", kwargs={"profile_id": profile_id})
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == (
+            profiling_enabled / f"{profile_id}.prof"
+        ).read_bytes()
+
+        response = admin_client.get(url, {"output": "text"})
+        assert response.status_code == 200
+        assert "function calls" in response.content.decode()
+
+    def test_profile_not_found(self, admin_client, profiling_enabled):
+        for profile_id in ("1-1", "..prof"):
+            url = reverse("game:profile-details", kwargs={"profile_id": profile_id})
+            response = admin_client.get(url)
+            assert response.status_code == 404
+            assert response.json()["detail"] == "Profile Not Found."
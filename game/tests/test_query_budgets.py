@@ -0,0 +1,183 @@
+import pytest
+from django.urls import reverse
+
+from game.lib.constants import GameConstants
+from game.models import Game, UserGame
+
+ROWS = [1, 10, 100]
+
+
+@pytest.fixture
+@pytest.mark.django_db
+def played_games(user, user_master):
+    """
+    Build ``rows`` games between Jerry and Tom, the even ones finished.
+    """
+
+    def build(rows):
+        games = Game.objects.bulk_create(
+            Game(
+                name=f"Budget {number}",
+                status=(
+                    GameConstants.STATUS_FINISHED
+                    if number % 2 == 0
+                    else GameConstants.STATUS_IN_GAME
+                ),
+                player_x=user,
+                player_o=user_master,
+                player_count=2,
+                actual_player=user,
+                winner=user_master if number % 2 == 0 else None,
+            )
+            for number in range(rows)
+        )
+        UserGame.objects.bulk_create(
+            UserGame(user=player, game=game, mark=mark)
+            for game in games
+            for player, mark in (
+                (user, GameConstants.MARK_X),
+                (user_master, GameConstants.MARK_O),
+            )
+        )
+        return games
+
+    return build
+
+
+@pytest.mark.django_db
+class TestListBudgets:
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_games_list(self, client, played_games, query_budget, rows):
+        played_games(rows)
+        with query_budget(2):
+            response = client.get(reverse("game:games-list"), {"page_size": 100})
+        assert len(response.json()["results"]) == rows
+
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_waiting_games_list(self, client, user, query_budget, rows):
+        Game.objects.bulk_create(
+            Game(name=f"Waiting {number}", player_x=user) for number in range(rows)
+        )
+        with query_budget(1):
+            response = client.get(
+                reverse("game:games-list"), {"status": "waiting", "page_size": 100}
+            )
+        assert len(response.json()["results"]) == rows
+
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_user_games_list(self, client, user, played_games, query_budget, rows):
+        played_games(rows)
+        url = reverse("game:user-games-list", kwargs={"username": user.username})
+        with query_budget(3):
+            response = client.get(url, {"page_size": 100})
+        assert len(response.json()["results"]) == rows
+
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_user_detail(self, client, user, played_games, query_budget, rows):
+        played_games(rows)
+        url = reverse("game:user-details", kwargs={"username": user.username})
+        with query_budget(2):
+            response = client.get(url)
+        assert response.json()["summary"]["total"] == rows
+
+
+@pytest.mark.django_db
+class TestDetailBudgets:
+    def test_create_game(self, client, query_budget):
+        with query_budget(8):
+            response = client.post(
+                reverse("game:games-list"), {"name": "Budget", "username": "Jerry"}
+            )
+        assert response.status_code == 201
+
+    def test_create_game_against_bot(self, client, query_budget):
+        with query_budget(11):
+            response = client.post(
+                reverse("game:games-list"),
+                {"name": "Budget", "username": "Jerry", "against_bot": True},
+            )
+        assert response.status_code == 201
+
+    def test_game_detail(self, client, game_with_two_players, query_budget):
+        url = reverse("game:game-details", kwargs={"name": game_with_two_players.name})
+        with query_budget(2):
+            response = client.get(url)
+        assert response.status_code == 200
+
+    def test_join_game(self, client, game_with_one_player, query_budget):
+        url = reverse("game:game-details", kwargs={"name": game_with_one_player.name})
+        with query_budget(13):
+            response = client.put(url, {"username": "Tom"})
+        assert response.status_code == 200
+
+    def test_play_game_detail(self, client, game_with_two_players, query_budget):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        with query_budget(2):
+            response = client.get(url)
+        assert response.status_code == 200
+
+    def test_play_movement(self, client, user, game_with_two_players, query_budget):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        with query_budget(6):
+            response = client.post(
+                url, {"username": user.username, "movement_x": 0, "movement_y": 0}
+            )
+        assert response.status_code == 200
+
+    def test_play_winning_movement(
+        self,
+        client,
+        user_master,
+        game_with_two_players_and_last_turn_to_win_horizontal,
+        query_budget,
+    ):
+        game = game_with_two_players_and_last_turn_to_win_horizontal
+        url = reverse("game:play-game", kwargs={"name": game.name})
+        with query_budget(6):
+            response = client.post(
+                url, {"username": user_master.username, "movement_x": 0, "movement_y": 2}
+            )
+        assert response.json()["status"] == GameConstants.STATUS_FINISHED
+
+    def test_hint(self, client, game_with_two_players, query_budget):
+        url = reverse("game:hint-game", kwargs={"name": game_with_two_players.name})
+        with query_budget(1):
+            response = client.get(url)
+        assert response.status_code == 200
+
+    def test_replay(self, client, game_with_two_players, query_budget):
+        url = reverse("game:replay-game", kwargs={"name": game_with_two_players.name})
+        with query_budget(1):
+            response = client.get(url)
+        assert response.status_code == 200
+
+    def test_matchmaking_creates_game(self, client, query_budget):
+        with query_budget(11):
+            response = client.post(reverse("game:matchmaking"), {"username": "Jerry"})
+        assert response.status_code == 201
+
+    def test_matchmaking_joins_game(self, client, game_with_one_player, query_budget):
+        with query_budget(14):
+            response = client.post(reverse("game:matchmaking"), {"username": "Tom"})
+        assert response.status_code == 200
+
+    def test_create_user(self, client, query_budget):
+        with query_budget(2):
+            response = client.post(reverse("game:user-list"), {"username": "Sara"})
+        assert response.status_code == 201
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+    def test_reports_queries_and_call_sites(self, client, game_with_two_players, query_budget):
+        url = reverse("game:replay-game", kwargs={"name": game_with_two_players.name})
+        with pytest.raises(pytest.fail.Exception) as failure:
+            with query_budget(0):
+                client.get(url)
+
+        report = str(failure.value)
+        assert "1 queries run, the budget is 0:" in report
+        assert 'FROM "game_game" WHERE "game_game"."name" = %s' in report
+        assert "params: ('Play',)" in report
+        assert "at game/views/game.py:" in report
+        assert "in get_object" in report
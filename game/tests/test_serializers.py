@@ -0,0 +1,100 @@
+import pytest
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from game.models import Game
+from game.serializers import game as game_serializers
+
+PARITY = [
+    (game_serializers.GameSerializer, game_serializers.game_data),
+    (game_serializers.InitGameSerializer, game_serializers.init_game_data),
+    (game_serializers.GameCreatedSerializer, game_serializers.game_created_data),
+    (game_serializers.GameFinishedSerializer, game_serializers.game_finished_data),
+]
+
+GAMES = [
+    "game_with_one_player",
+    "game_with_two_players",
+    "game_with_two_players_and_last_turn_to_win_diagonal_1",
+    "game_with_two_players_and_last_turn_to_draw",
+]
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestSerializersParity:
+    @pytest.mark.parametrize("serializer_class, build", PARITY)
+    @pytest.mark.parametrize("fixture", GAMES)
+    def test_same_output(self, request, serializer_class, build, fixture):
+        game = Game.objects.get(pk=request.getfixturevalue(fixture).pk)
+
+        expected = serializer_class(game).data
+        data = build(game)
+
+        assert list(data) == list(expected)
+        assert render(data) == render(expected)
+
+    @pytest.mark.parametrize("serializer_class, build", PARITY)
+    def test_same_output_after_playing(
+        self, client, user, user_master, game_with_two_players, serializer_class, build
+    ):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        for username, movement_x, movement_y in (
+            (user.username, 0, 0),
+            (user_master.username, 1, 0),
+            (user.username, 0, 1),
+            (user_master.username, 1, 1),
+            (user.username, 0, 2),
+        ):
+            client.post(
+                url,
+                {"username": username, "movement_x": movement_x, "movement_y": movement_y},
+            )
+        game = Game.objects.get(pk=game_with_two_players.pk)
+        assert game.winner == user
+
+        assert render(build(game)) == render(serializer_class(game).data)
+
+    def test_bigger_board_against_bot(self, client):
+        client.post(
+            reverse("game:games-list"),
+            {
+                "name": "Bot",
+                "username": "Jerry",
+                "against_bot": True,
+                "board_size": 5,
+                "win_length": 4,
+            },
+        )
+        client.post(
+            reverse("game:play-game", kwargs={"name": "Bot"}),
+            {"username": "Jerry", "movement_x": 2, "movement_y": 2},
+        )
+        game = Game.objects.get(name="Bot")
+
+        assert render(game_serializers.game_data(game)) == render(
+            game_serializers.GameSerializer(game).data
+        )
+
+    def test_list_uses_prefetched_players(self, game_with_two_players, django_assert_num_queries):
+        games = list(
+            Game.objects.select_related("actual_player", "winner").prefetch_related("players")
+        )
+        with django_assert_num_queries(0):
+            data = [game_serializers.game_data(game) for game in games]
+
+        assert render(data) == render(game_serializers.GameSerializer(games, many=True).data)
+
+    def test_play_response(self, client, game_with_two_players):
+        url = reverse("game:play-game", kwargs={"name": game_with_two_players.name})
+        response = client.get(url)
+
+        game = Game.objects.get(pk=game_with_two_players.pk)
+        expected = {
+            **game_serializers.GameSerializer(game).data,
+            "actual_mark": game.actual_mark,
+        }
+        assert response.content == render(expected)
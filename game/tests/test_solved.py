@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from django.core.management import call_command
+
+from game.lib import ai, engine, solved
+
+
+@pytest.fixture(scope="module")
+def table():
+    return solved.build_table()
+
+
+@pytest.fixture
+def loaded_table(tmp_path):
+    path = tmp_path / "solved.bin"
+    call_command("build_solved_table", path=str(path))
+    assert solved.load(str(path))
+    yield
+    solved.unload()
+
+
+class TestSolvedTable:
+    def test_legal_positions(self, table):
+        assert len(table) == solved.TABLE_SIZE
+        assert sum(1 for entry in table if entry != solved.NOT_LEGAL) == 5478
+
+    def test_empty_board_is_a_draw(self, table):
+        assert table[solved.board_code(0, 0)] >> 4 == solved.DRAW
+
+    def test_load_missing_file(self, tmp_path):
+        assert not solved.load(str(tmp_path / "missing.bin"))
+        assert not solved.is_loaded()
+
+    def test_lookup_without_table(self):
+        assert solved.lookup(0, 0) is None
+
+    def test_lookup(self, loaded_table):
+        # X to move with two in a row wins on the spot
+        x_bits = (1 << 0) | (1 << 1)
+        o_bits = (1 << 3) | (1 << 4)
+
+        assert solved.lookup(x_bits, o_bits) == (solved.WIN, 2)
+        # O to move completes the middle row before blocking
+        assert solved.lookup(o_bits, x_bits | (1 << 8)) == (solved.WIN, 5)
+
+    def test_lookup_not_legal(self, loaded_table):
+        assert solved.lookup((1 << 0) | (1 << 1) | (1 << 2), 0) is None
+
+    def test_rebuild_keeps_mapped_table(self, tmp_path, loaded_table):
+        path = tmp_path / "solved.bin"
+        before = os.stat(path).st_ino
+        call_command("build_solved_table", path=str(path))
+
+        assert os.stat(path).st_ino != before
+        assert list(tmp_path.iterdir()) == [path]
+        x_bits = (1 << 0) | (1 << 1)
+        o_bits = (1 << 3) | (1 << 4)
+        assert solved.lookup(x_bits, o_bits) == (solved.WIN, 2)
+
+    def test_best_move_agrees_with_search(self, loaded_table):
+        rules = engine.get_rules(3, 3)
+        me = 1 << 0
+        opp = (1 << 3) | (1 << 4)
+
+        assert ai.best_move(rules, me, opp) == 5
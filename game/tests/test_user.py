@@ -11,20 +11,87 @@ class TestUserDetail:
         response = client.get(url)
 
         assert response.status_code == 200
-        assert "games" in response.data
+        assert "summary" in response.data
         assert "user" in response.data
-        assert len(response.data["games"]) == 0
+        assert response.data["summary"]["total"] == 0
         assert response.data["user"]["username"] == user.username
 
+    def test_get_user_details_summary(
+        self, client, user, game_with_one_player, game_with_two_players
+    ):
+        url = reverse("game:user-details", kwargs={"username": user.username})
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.data["summary"] == {
+            "total": 2,
+            "waiting": 1,
+            "in_game": 1,
+            "finished": 0,
+            "draw": 0,
+            "won": 0,
+        }
+
     def test_get_user_details_raise_user_not_found(self, client):
         url = reverse("game:user-details", kwargs={"username": "false user"})
         response = client.get(url)
 
         assert response.status_code == 404
-        assert "games" not in response.data
+        assert "summary" not in response.data
         assert "user" not in response.data
 
 
+@pytest.mark.django_db
+class TestUserGamesList:
+    def test_get_user_games(
+        self, client, user, game_with_one_player, game_with_two_players
+    ):
+        url = reverse("game:user-games-list", kwargs={"username": user.username})
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert [game["name"] for game in response.data["results"]] == [
+            game_with_one_player.name,
+            game_with_two_players.name,
+        ]
+
+    def test_get_user_games_filtered_by_status(
+        self, client, user, game_with_one_player, game_with_two_players
+    ):
+        url = reverse("game:user-games-list", kwargs={"username": user.username})
+        response = client.get(url, {"status": "in_game"})
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["name"] == game_with_two_players.name
+
+    def test_get_user_games_paginated(
+        self, client, user, game_with_one_player, game_with_two_players
+    ):
+        url = reverse("game:user-games-list", kwargs={"username": user.username})
+        response = client.get(url, {"page_size": 1})
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 1
+        assert response.data["next"]
+
+    def test_get_user_games_raise_serializer_exception(self, client, user):
+        url = reverse("game:user-games-list", kwargs={"username": user.username})
+        response = client.get(url, {"status": "lost"})
+
+        assert response.status_code == 400
+        assert (
+            response.data["detail"]
+            == game_exceptions.SerializerException.default_detail
+        )
+
+    def test_get_user_games_raise_user_not_found(self, client):
+        url = reverse("game:user-games-list", kwargs={"username": "false user"})
+        response = client.get(url)
+
+        assert response.status_code == 404
+
+
 @pytest.mark.django_db
 class TestUserList:
     def setup_method(self):
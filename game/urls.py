@@ -1,6 +1,6 @@
 from django.urls import path
 
-from game.views import game, user
+from game.views import events, export, game, memory, metrics, profiles, user
 
 app_name = "game"
 
@@ -8,6 +8,28 @@ urlpatterns = [
     path("games/", game.GamesList.as_view(), name="games-list"),
     path("games/<str:name>/", game.GameDetail.as_view(), name="game-details"),
     path("games/<str:name>/play/", game.PlayGameDetail.as_view(), name="play-game"),
+    path("games/<str:name>/hint/", game.HintGameDetail.as_view(), name="hint-game"),
+    path(
+        "games/<str:name>/replay/",
+        game.ReplayGameDetail.as_view(),
+        name="replay-game",
+    ),
+    path("games/<str:name>/events/", events.GameEvents.as_view(), name="game-events"),
+    path("matchmaking/", game.Matchmaking.as_view(), name="matchmaking"),
+    path("export/games/", export.ExportGamesList.as_view(), name="export-games"),
+    path("metrics", metrics.Metrics.as_view(), name="metrics"),
+    path("memory/", memory.MemoryDetail.as_view(), name="memory"),
+    path("profiles/", profiles.ProfilesList.as_view(), name="profiles-list"),
+    path(
+        "profiles/<str:profile_id>/",
+        profiles.ProfileDetail.as_view(),
+        name="profile-details",
+    ),
     path("users/", user.UserList.as_view(), name="user-list"),
     path("users/<str:username>/", user.UserDetail.as_view(), name="user-details"),
+    path(
+        "users/<str:username>/games/",
+        user.UserGamesList.as_view(),
+        name="user-games-list",
+    ),
 ]
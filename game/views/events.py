@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+
+from game.lib import exceptions as game_exceptions
+from game.lib.asgi import is_asgi
+from game.lib.broadcast import broadcaster
+from game.models import Game
+from game.views.game import game_state
+
+
+def format_event(payload: str) -> str:
+    return f"event: game\ndata: {payload}\n\n"
+
+
+class GameEvents(View):
+    """
+    Server-Sent Events stream of a game. The current state is sent on
+    connection and every accepted movement is pushed afterwards. Needs the
+    ASGI application in `app/asgi.py`.
+    """
+
+    def get_state(self, name):
+        game = Game.objects.select_related(
+            "actual_player", "winner"
+        ).prefetch_related("players").get(name=name)
+        return json.dumps(game_state(game))
+
+    async def get(self, request, name):
+        if not is_asgi(request):
+            # Under WSGI the stream would be read whole before sending anything,
+            # which never ends
+            return JsonResponse(
+                {"detail": game_exceptions.ASGIRequiredException.default_detail},
+                status=game_exceptions.ASGIRequiredException.status_code,
+            )
+        exists = await Game.objects.filter(name=name).aexists()
+        if not exists:
+            return JsonResponse(
+                {"detail": game_exceptions.GameNotFoundException.default_detail},
+                status=404,
+            )
+        response = StreamingHttpResponse(
+            self.stream(name), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, name):
+        queue = broadcaster.subscribe(name)
+        try:
+            yield format_event(await sync_to_async(self.get_state)(name))
+            while True:
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), timeout=settings.GAME_EVENTS_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(payload)
+        finally:
+            broadcaster.unsubscribe(name, queue)
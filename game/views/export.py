@@ -0,0 +1,52 @@
+from django.http import StreamingHttpResponse
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.views import APIView
+
+from game.lib import export
+from game.lib.asgi import is_asgi
+from game.lib.constants import GameConstants
+from game.lib import exceptions as game_exceptions
+from game.lib import swagger as game_swagger
+from game.models import User
+from game.serializers.game import ExportInputSerializer
+
+
+class ExportGamesList(APIView):
+    @swagger_auto_schema(
+        responses=game_swagger.ExportGamesList.response_schemas,
+        manual_parameters=game_swagger.ExportGamesList.query_params,
+    )
+    def get(self, request, format=None):
+        """
+        Stream the finished games as NDJSON, one game per line.
+        """
+        serializer = ExportInputSerializer(data=request.GET)
+        if not serializer.is_valid():
+            raise game_exceptions.SerializerException
+        filters = serializer.validated_data
+
+        game_status = filters.get("status", "").upper()
+        if game_status and game_status not in dict(GameConstants.STATUS_CHOICES):
+            raise game_exceptions.SerializerException
+
+        user_id = None
+        if filters.get("username"):
+            user_id = (
+                User.objects.filter(username=filters["username"])
+                .values_list("id", flat=True)
+                .first()
+            )
+            if user_id is None:
+                raise game_exceptions.UserNotFoundException
+
+        games = export.games_to_export(
+            status=game_status,
+            user_id=user_id,
+            min_id=filters.get("min_id"),
+            max_id=filters.get("max_id"),
+        )
+        if is_asgi(request):
+            lines = export.aiter_ndjson(games)
+        else:
+            lines = export.iter_ndjson(games)
+        return StreamingHttpResponse(lines, content_type="application/x-ndjson")
@@ -1,31 +1,94 @@
+import json
+from typing import Optional
+
+from django.db import transaction
+from django.utils.http import parse_etags
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from game.lib import engine, matchmaking, versions
+from game.lib.broadcast import broadcaster
 from game.lib.constants import GameConstants
 from game.lib import exceptions as game_exceptions
 from game.lib import swagger as game_swagger
+from game.lib.pagination import GameCursorPagination
 from game.models import Game, User, UserGame
 from game.serializers import game as game_serializers
 
 
+def game_state(game: Game) -> dict:
+    """
+    Game details with the mark of the player that has the turn.
+    """
+    data = game_serializers.game_data(game)
+    if game.status == GameConstants.STATUS_IN_GAME:
+        data["actual_mark"] = game.actual_mark
+    return data
+
+
+def game_changed(game: Game) -> None:
+    """
+    Refresh the cached version of the game and push its new state to the
+    events subscribers.
+    """
+    versions.store(game)
+    if broadcaster.has_subscribers(game.name):
+        broadcaster.publish(game.name, json.dumps(game_state(game)))
+
+
+def not_modified_response(request, name: str) -> Optional[Response]:
+    """
+    `304 Not Modified` when `If-None-Match` matches the game ETag. With the
+    `wait` query param it first waits up to that many seconds for a change.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return None
+
+    etags = parse_etags(if_none_match)
+    etag = versions.get_etag(name)
+    if etag is None:
+        raise game_exceptions.GameNotFoundException
+    if etag in etags and request.GET.get("wait"):
+        try:
+            wait = float(request.GET["wait"])
+        except ValueError:
+            raise game_exceptions.SerializerException
+        etag = versions.wait_for_change(name, etag, wait)
+    if etag not in etags:
+        return None
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
 class GamesList(APIView):
     @swagger_auto_schema(
         responses=game_swagger.GameList.get_response_schemas,
-        manual_parameters=[game_swagger.GameList.get_query_param],
+        manual_parameters=[
+            game_swagger.GameList.get_query_param,
+            game_swagger.GameList.get_cursor_param,
+            game_swagger.GameList.get_page_size_param,
+        ],
     )
     def get(self, request, format=None):
         """
         List all games and optional filter by available games
         """
+        paginator = GameCursorPagination()
         if request.GET.get("status") == "waiting":
-            games = Game.objects.filter(status=GameConstants.STATUS_WAITING)
-            serializer = game_serializers.AvailableGameSerializer(games, many=True)
+            games = Game.objects.filter(status=GameConstants.STATUS_WAITING).only(
+                "id", "name", "status"
+            )
+            page = paginator.paginate_queryset(games, request, view=self)
+            data = game_serializers.AvailableGameSerializer(page, many=True).data
         else:
-            games = Game.objects.all()
-            serializer = game_serializers.GameSerializer(games, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+            games = Game.objects.select_related(
+                "actual_player", "winner"
+            ).prefetch_related("players")
+            page = paginator.paginate_queryset(games, request, view=self)
+            data = [game_serializers.game_data(game) for game in page]
+        return paginator.get_paginated_response(data)
 
     @swagger_auto_schema(
         responses=game_swagger.GameList.post_response_schemas,
@@ -37,21 +100,46 @@ class GamesList(APIView):
         """
         serializer = game_serializers.GameInputSerializer(data=request.data)
         if serializer.is_valid():
-            game = Game.objects.create(
-                name=serializer.data["name"],
+            rules = engine.get_rules(
+                serializer.data["board_size"], serializer.data["win_length"]
             )
             user, _ = User.objects.get_or_create(
                 username=serializer.data["username"],
             )
-            game.players.add(user)
-            game.save()
-
-            user_game = UserGame.objects.get(user=user, game=game)
-            user_game.mark = GameConstants.MARK_X
-            user_game.save()
+            if user.is_bot:
+                raise game_exceptions.BotPlayerException
+            if serializer.data["against_bot"]:
+                bot = User.get_bot()
+                game = Game.objects.create(
+                    name=serializer.data["name"],
+                    board_size=rules.size,
+                    win_length=rules.win_length,
+                    player_x=user,
+                    player_o=bot,
+                    player_count=2,
+                    status=GameConstants.STATUS_IN_GAME,
+                    actual_player=user,
+                )
+                UserGame.objects.bulk_create(
+                    [
+                        UserGame(user=user, game=game, mark=GameConstants.MARK_X),
+                        UserGame(user=bot, game=game, mark=GameConstants.MARK_O),
+                    ]
+                )
+            else:
+                game = Game.objects.create(
+                    name=serializer.data["name"],
+                    board_size=rules.size,
+                    win_length=rules.win_length,
+                    player_x=user,
+                    player_count=1,
+                )
+                UserGame.objects.create(user=user, game=game, mark=GameConstants.MARK_X)
+                transaction.on_commit(lambda: matchmaking.waiting_games.push(game.id))
 
-            serializer = game_serializers.GameCreatedSerializer(game)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(
+                game_serializers.game_created_data(game), status=status.HTTP_201_CREATED
+            )
         else:
             raise game_exceptions.SerializerException
 
@@ -59,7 +147,7 @@ class GamesList(APIView):
 class GameDetail(APIView):
     def get_object(self, name):
         try:
-            return Game.objects.get(name=name)
+            return Game.objects.select_related("actual_player", "winner").get(name=name)
         except Game.DoesNotExist:
             raise game_exceptions.GameNotFoundException
 
@@ -70,9 +158,16 @@ class GameDetail(APIView):
         """
         Retrieve a game instance
         """
+        not_modified = not_modified_response(request, name)
+        if not_modified:
+            return not_modified
+
         game = self.get_object(name)
-        serializer = game_serializers.GameSerializer(game)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(
+            game_serializers.game_data(game),
+            status=status.HTTP_200_OK,
+            headers={"ETag": versions.store(game)},
+        )
 
     @swagger_auto_schema(
         responses=game_swagger.GameDetail.put_response_schemas,
@@ -84,37 +179,23 @@ class GameDetail(APIView):
         """
         serializer = game_serializers.GameUpdateInputSerializer(data=request.data)
         if serializer.is_valid():
-            game = self.get_object(name)
-            if game.players.count() >= 2:
+            try:
+                game = Game.objects.select_related("player_x").get(name=name)
+            except Game.DoesNotExist:
+                raise game_exceptions.GameNotFoundException
+            if game.player_count >= GameConstants.MAX_PLAYERS:
                 raise game_exceptions.FullGameStatusException
 
-            user, _ = User.objects.get_or_create(
-                username=serializer.data["username"],
-            )
-            game.players.add(user)
-
-            if game.players.all().count() == 2:
-                user_game = UserGame.objects.get(user=user, game=game)
-                user_game.mark = GameConstants.MARK_O
-                user_game.save()
-
-                game.status = GameConstants.STATUS_IN_GAME
-                game.actual_player = game.players.all().first()
-                game.save()
+            with transaction.atomic():
+                user, _ = User.objects.get_or_create(
+                    username=serializer.data["username"],
+                )
+                game.join(user)
+                transaction.on_commit(lambda: game_changed(game))
 
-                serializer = game_serializers.InitGameSerializer(game)
-
-                if game.status == GameConstants.STATUS_IN_GAME:
-                    actual_mark = {
-                        "actual_mark": UserGame.objects.get(
-                            user=game.actual_player, game=game
-                        ).mark
-                    }
-                else:
-                    actual_mark = {}
-
-                response = {**serializer.data, **actual_mark}
-                return Response(response, status=status.HTTP_200_OK)
+            response = game_serializers.init_game_data(game)
+            response["actual_mark"] = game.actual_mark
+            return Response(response, status=status.HTTP_200_OK)
         else:
             raise game_exceptions.SerializerException
 
@@ -122,7 +203,17 @@ class GameDetail(APIView):
 class PlayGameDetail(APIView):
     def get_object(self, name):
         try:
-            return Game.objects.get(name=name)
+            return Game.objects.select_related("actual_player", "winner").get(name=name)
+        except Game.DoesNotExist:
+            raise game_exceptions.GameNotFoundException
+
+    def get_object_for_update(self, name):
+        try:
+            return (
+                Game.objects.select_for_update()
+                .select_related("actual_player", "player_x", "player_o")
+                .get(name=name)
+            )
         except Game.DoesNotExist:
             raise game_exceptions.GameNotFoundException
 
@@ -133,20 +224,16 @@ class PlayGameDetail(APIView):
         """
         Get the actual game details.
         """
-        game = self.get_object(name)
-        serializer = game_serializers.GameSerializer(game)
-
-        if game.status == GameConstants.STATUS_IN_GAME:
-            actual_mark = {
-                "actual_mark": UserGame.objects.get(
-                    user=game.actual_player, game=game
-                ).mark
-            }
-        else:
-            actual_mark = {}
+        not_modified = not_modified_response(request, name)
+        if not_modified:
+            return not_modified
 
-        response = {**serializer.data, **actual_mark}
-        return Response(response, status=status.HTTP_200_OK)
+        game = self.get_object(name)
+        return Response(
+            game_state(game),
+            status=status.HTTP_200_OK,
+            headers={"ETag": versions.store(game)},
+        )
 
     @swagger_auto_schema(
         responses=game_swagger.PlayGameDetail.post_response_schemas,
@@ -158,30 +245,127 @@ class PlayGameDetail(APIView):
         """
         serializer = game_serializers.UserPlayGameInputSerializer(data=request.data)
         if serializer.is_valid():
-            game = self.get_object(name)
-            game.check_status
-            game.check_actual_player(serializer.data["username"])
-            game.check_movement(
-                movement_x=serializer.data["movement_x"],
-                movement_y=serializer.data["movement_y"],
-            )
-            winner = game.check_winner
-            if winner:
-                serializer = game_serializers.GameFinishedSerializer(game)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+            with transaction.atomic():
+                game = self.get_object_for_update(name)
+                game.check_status
+                game.check_actual_player(serializer.data["username"])
+                finished = game.play(
+                    movement_x=serializer.data["movement_x"],
+                    movement_y=serializer.data["movement_y"],
+                )
+                transaction.on_commit(lambda: game_changed(game))
+            if finished:
+                return Response(
+                    game_serializers.game_finished_data(game), status=status.HTTP_200_OK
+                )
             else:
-                serializer = game_serializers.GameSerializer(game)
-
-                if game.status == GameConstants.STATUS_IN_GAME:
-                    actual_mark = {
-                        "actual_mark": UserGame.objects.get(
-                            user=game.actual_player, game=game
-                        ).mark
-                    }
-                else:
-                    actual_mark = {}
-
-                response = {**serializer.data, **actual_mark}
+                return Response(game_state(game), status=status.HTTP_200_OK)
+        else:
+            raise game_exceptions.SerializerException
+
+
+class HintGameDetail(APIView):
+    def get_object(self, name):
+        try:
+            return Game.objects.get(name=name)
+        except Game.DoesNotExist:
+            raise game_exceptions.GameNotFoundException
+
+    @swagger_auto_schema(
+        responses=game_swagger.HintGameDetail.get_response_schemas,
+    )
+    def get(self, request, name, format=None):
+        """
+        Get the best movement for the player that has the turn.
+        """
+        game = self.get_object(name)
+        game.check_status
+        movement = game.best_movement()
+        if movement is None:
+            raise game_exceptions.NotValidGameStatusException
+
+        movement_x, movement_y = movement
+        serializer = game_serializers.HintSerializer(
+            {
+                "movement_x": movement_x,
+                "movement_y": movement_y,
+                "actual_mark": game.actual_mark,
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ReplayGameDetail(APIView):
+    def get_object(self, name):
+        try:
+            return Game.objects.only("name", "board_size", "moves").get(name=name)
+        except Game.DoesNotExist:
+            raise game_exceptions.GameNotFoundException
+
+    @swagger_auto_schema(
+        responses=game_swagger.ReplayGameDetail.get_response_schemas,
+        manual_parameters=[game_swagger.ReplayGameDetail.get_query_param],
+    )
+    def get(self, request, name, format=None):
+        """
+        Rebuild the position of the game after `ply` movements from its log.
+        """
+        serializer = game_serializers.ReplayInputSerializer(data=request.GET)
+        if not serializer.is_valid():
+            raise game_exceptions.SerializerException
+
+        game = self.get_object(name)
+        moves = bytes(game.moves)
+        ply = serializer.validated_data.get("ply", len(moves))
+        if ply > len(moves):
+            raise game_exceptions.NotValidPlyException
+
+        x_bits, o_bits = engine.replay(moves[:ply])
+        movement_x = movement_y = mark = None
+        if ply:
+            cell, mark = engine.decode_move(moves[ply - 1])
+            movement_x, movement_y = divmod(cell, game.board_size)
+        serializer = game_serializers.ReplaySerializer(
+            {
+                "name": game.name,
+                "ply": ply,
+                "plies": len(moves),
+                "board": engine.encode_board(x_bits, o_bits, game.board_size),
+                "movement_x": movement_x,
+                "movement_y": movement_y,
+                "mark": mark,
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class Matchmaking(APIView):
+    @swagger_auto_schema(
+        responses=game_swagger.Matchmaking.post_response_schemas,
+        request_body=game_swagger.Matchmaking.post_request_schemas,
+    )
+    def post(self, request, format=None):
+        """
+        Join the oldest waiting game, or create a new one when there is none.
+        """
+        serializer = game_serializers.GameUpdateInputSerializer(data=request.data)
+        if serializer.is_valid():
+            user, _ = User.objects.get_or_create(
+                username=serializer.data["username"],
+            )
+            with transaction.atomic():
+                game, created = matchmaking.pair(user)
+                if not created:
+                    transaction.on_commit(lambda: game_changed(game))
+
+            if game.status == GameConstants.STATUS_IN_GAME:
+                response = game_serializers.init_game_data(game)
+                response["actual_mark"] = game.actual_mark
                 return Response(response, status=status.HTTP_200_OK)
+
+            response = game_serializers.game_created_data(game)
+            if created:
+                return Response(response, status=status.HTTP_201_CREATED)
+            return Response(response, status=status.HTTP_200_OK)
         else:
             raise game_exceptions.SerializerException
@@ -0,0 +1,56 @@
+from django.conf import settings
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from game.lib import exceptions as game_exceptions
+from game.lib import memory
+from game.lib import swagger as game_swagger
+from game.serializers.memory import MemoryInputSerializer
+
+
+class MemoryDetail(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        responses=game_swagger.MemoryDetail.get_response_schemas,
+        manual_parameters=[game_swagger.MemoryDetail.get_query_param],
+    )
+    def get(self, request, format=None):
+        """
+        Take a snapshot and report the memory allocated since the baseline
+        by module group and allocation site, with the allocations counted
+        per view. Staff only.
+        """
+        serializer = MemoryInputSerializer(data=request.GET)
+        if not serializer.is_valid():
+            raise game_exceptions.SerializerException
+        return Response(memory.report(serializer.validated_data["limit"]))
+
+    @swagger_auto_schema(
+        request_body=game_swagger.MemoryDetail.post_request_schemas,
+        responses=game_swagger.MemoryDetail.post_response_schemas,
+    )
+    def post(self, request, format=None):
+        """
+        Start tracing the allocations of this worker and take the baseline
+        snapshot. When tracing already, only the baseline is taken again.
+        Staff only.
+        """
+        serializer = MemoryInputSerializer(data=request.data)
+        if not serializer.is_valid():
+            raise game_exceptions.SerializerException
+        memory.start(
+            serializer.validated_data.get("frames", settings.GAME_TRACEMALLOC_FRAMES)
+        )
+        return Response(memory.report(0), status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(responses=game_swagger.MemoryDetail.delete_response_schemas)
+    def delete(self, request, format=None):
+        """
+        Stop tracing and drop the snapshots. Staff only.
+        """
+        memory.stop()
+        return Response(status=status.HTTP_204_NO_CONTENT)
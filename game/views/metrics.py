@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from django.views import View
+
+from game.lib import metrics
+
+
+class Metrics(View):
+    def get(self, request):
+        """
+        Request metrics of every worker in the Prometheus text format.
+        """
+        return HttpResponse(
+            metrics.render(metrics.collector.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
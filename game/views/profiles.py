@@ -0,0 +1,47 @@
+from django.http import FileResponse, HttpResponse
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from game.lib import exceptions as game_exceptions
+from game.lib import profiling
+from game.lib import swagger as game_swagger
+
+
+class ProfilesList(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(responses=game_swagger.ProfilesList.get_response_schemas)
+    def get(self, request, format=None):
+        """
+        List the stored request profiles, newest first. Staff only.
+        """
+        return Response(profiling.list_profiles())
+
+
+class ProfileDetail(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        responses=game_swagger.ProfileDetail.get_response_schemas,
+        manual_parameters=[game_swagger.ProfileDetail.get_query_param],
+    )
+    def get(self, request, profile_id, format=None):
+        """
+        Download the pstats file of a profile, or its report with
+        `?output=text`. Staff only.
+        """
+        path = profiling.stats_path(profile_id)
+        if path is None:
+            raise game_exceptions.ProfileNotFoundException
+        if request.GET.get("output") == "text":
+            return HttpResponse(
+                profiling.stats_text(path), content_type="text/plain; charset=utf-8"
+            )
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=path.name,
+            content_type="application/octet-stream",
+        )
@@ -1,13 +1,20 @@
+from django.db.models import Count, Q
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from game.lib.constants import GameConstants
 from game.lib import exceptions as game_exceptions
 from game.lib import swagger as game_swagger
+from game.lib.pagination import GameCursorPagination
 from game.models import Game, User
-from game.serializers.game import GameSerializer
-from game.serializers.user import UserInputSerializer, UserSerializer
+from game.serializers.game import game_data
+from game.serializers.user import (
+    UserGamesSummarySerializer,
+    UserInputSerializer,
+    UserSerializer,
+)
 
 
 class UserList(APIView):
@@ -40,14 +47,57 @@ class UserDetail(APIView):
     @swagger_auto_schema(responses=game_swagger.UserDetail.response_schemas)
     def get(self, request, username, format=None):
         """
-        Login User and get user data with the games played.
+        Login User and get user data with a summary of the games played.
         """
         user = self.get_object(username)
-        games = Game.objects.filter(players__id=user.id)
+        summary = Game.objects.filter(players=user).aggregate(
+            total=Count("id"),
+            waiting=Count("id", filter=Q(status=GameConstants.STATUS_WAITING)),
+            in_game=Count("id", filter=Q(status=GameConstants.STATUS_IN_GAME)),
+            finished=Count("id", filter=Q(status=GameConstants.STATUS_FINISHED)),
+            draw=Count("id", filter=Q(status=GameConstants.STATUS_DRAW)),
+            won=Count("id", filter=Q(winner=user)),
+        )
         serializer_user = UserSerializer(user)
-        serializer_games = GameSerializer(games, many=True)
+        serializer_summary = UserGamesSummarySerializer(summary)
         data = {
             "user": serializer_user.data,
-            "games": serializer_games.data,
+            "summary": serializer_summary.data,
         }
         return Response(data, status=status.HTTP_200_OK)
+
+
+class UserGamesList(APIView):
+    def get_object(self, username):
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise game_exceptions.UserNotFoundException
+
+    @swagger_auto_schema(
+        responses=game_swagger.UserGamesList.response_schemas,
+        manual_parameters=[
+            game_swagger.UserGamesList.query_param,
+            game_swagger.GameList.get_cursor_param,
+            game_swagger.GameList.get_page_size_param,
+        ],
+    )
+    def get(self, request, username, format=None):
+        """
+        List the games played by the user, optionally filtered by status.
+        """
+        user = self.get_object(username)
+        games = (
+            Game.objects.filter(players=user)
+            .select_related("actual_player", "winner")
+            .prefetch_related("players")
+        )
+        game_status = request.GET.get("status", "").upper()
+        if game_status:
+            if game_status not in dict(GameConstants.STATUS_CHOICES):
+                raise game_exceptions.SerializerException
+            games = games.filter(status=game_status)
+
+        paginator = GameCursorPagination()
+        page = paginator.paginate_queryset(games, request, view=self)
+        return paginator.get_paginated_response([game_data(game) for game in page])